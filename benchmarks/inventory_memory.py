@@ -0,0 +1,145 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+"""Inventory memory benchmark: bytes held per workspace for a synthetic org.
+
+Usage: python benchmarks/inventory_memory.py [--workspaces N] [--budget BYTES]
+
+Builds N workspaces with one device each, shaped like the Webex list API
+items, and reports the memory per workspace of the raw items and of the
+compact Inventory, plus the time per lookup. Exits with status 1 when the
+Inventory exceeds the budget of bytes per workspace.
+"""
+
+import argparse
+import base64
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from libraries.inventory import Inventory
+
+DEFAULT_BUDGET = 1024
+PAGE_SIZE = 1000
+LOCATIONS = 200
+
+def webex_id(kind, number):
+    return base64.b64encode(f"ciscospark://us/{kind}/{number:08d}-5e1a-4c7b-9f3e-2d6b8a0c4f71".encode()).decode()
+
+def workspace_item(number):
+    location_id = webex_id("LOCATION", number % LOCATIONS)
+    return {
+        'id': webex_id("PLACE", number),
+        'orgId': webex_id("ORGANIZATION", 1),
+        'locationId': location_id,
+        'workspaceLocationId': location_id,
+        'displayName': f"Site {number % LOCATIONS:03d} Workspace {number}",
+        'capacity': 1,
+        'type': 'notSet',
+        'sipAddress': f"ws{number}@example.calls.webex.com",
+        'calling': {'type': 'webexCalling',
+                    'webexCalling': {'extension': str(10000 + number % 90000), 'locationId': location_id}},
+        'calendar': {'type': 'none'},
+        'hotdeskingStatus': 'off',
+        'supportedDevices': 'phones',
+        'devicePlatform': 'cisco',
+        'created': '2026-01-15T12:00:00.000Z'
+    }
+
+def device_item(number):
+    return {
+        'id': webex_id("DEVICE", number),
+        'displayName': f"Site {number % LOCATIONS:03d} Workspace {number}",
+        'workspaceId': webex_id("PLACE", number),
+        'orgId': webex_id("ORGANIZATION", 1),
+        'capabilities': ['xapi'],
+        'permissions': ['xapi:readonly', 'xapi:all'],
+        'product': 'Cisco 8841',
+        'type': 'roomdesk',
+        'mac': f"AA:BB:{number >> 24 & 255:02X}:{number >> 16 & 255:02X}:{number >> 8 & 255:02X}:{number & 255:02X}",
+        'serial': f"FCH{number:08d}",
+        'connectionStatus': 'connected',
+        'created': '2026-01-15T12:00:00.000Z'
+    }
+
+def pages(make_item, count):
+    for start in range(0, count, PAGE_SIZE):
+        yield [make_item(number) for number in range(start, min(start + PAGE_SIZE, count))]
+
+def measure(build):
+    """(bytes still allocated by what build returns, result)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+def build_raw(count):
+    return [item for page in pages(workspace_item, count) for item in page], \
+           [item for page in pages(device_item, count) for item in page]
+
+def build_inventory(count):
+    inventory = Inventory()
+    for page in pages(workspace_item, count):
+        inventory.add_workspaces(page)
+    for page in pages(device_item, count):
+        inventory.add_devices(page)
+    return inventory
+
+def time_lookups(inventory, count):
+    """Microseconds per lookup by ID, name, extension and MAC"""
+    numbers = range(0, count, max(1, count // 1000))
+    workspaces = [workspace_item(number) for number in numbers]
+    probes = {
+        'id': (inventory.workspace_by_id, [(ws['id'],) for ws in workspaces]),
+        'name': (inventory.workspace_by_name, [(ws['displayName'],) for ws in workspaces]),
+        'extension': (inventory.workspace_by_extension,
+                      [(ws['locationId'], ws['calling']['webexCalling']['extension']) for ws in workspaces]),
+        'mac': (inventory.device_by_mac, [(device_item(number)['mac'],) for number in numbers])
+    }
+    timings = {}
+    for name, (lookup, keys) in probes.items():
+        start = time.perf_counter()
+        for key in keys:
+            if lookup(*key) is None:
+                raise RuntimeError(f"Lookup by {name} missed {key}")
+        timings[name] = (time.perf_counter() - start) / len(keys) * 1e6
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure inventory memory per workspace")
+    parser.add_argument('--workspaces', type=int, default=100000,
+                        help="Number of workspaces, each with one device (default: 100000)")
+    parser.add_argument('--budget', type=int,
+                        default=int(os.environ.get('WEBEX_INVENTORY_BUDGET', DEFAULT_BUDGET)),
+                        help=f"Maximum Inventory bytes per workspace (default: {DEFAULT_BUDGET})")
+    args = parser.parse_args()
+    count = args.workspaces
+
+    raw_size, raw = measure(lambda: build_raw(count))
+    del raw
+    inventory_size, inventory = measure(lambda: build_inventory(count))
+    per_workspace = inventory_size / count
+
+    print(f"Inventory memory ({count} workspaces with one device each)")
+    print(f"  Raw API items: {raw_size / count:,.0f} bytes per workspace ({raw_size / 2**20:,.1f} MiB)")
+    print(f"  Inventory:     {per_workspace:,.0f} bytes per workspace ({inventory_size / 2**20:,.1f} MiB)")
+    timings = time_lookups(inventory, count)
+    print("  Lookup: " + "  ".join(f"{name} {micros:.2f}us" for name, micros in timings.items()))
+    print(f"  Budget: {args.budget:,} bytes per workspace")
+
+    if per_workspace > args.budget:
+        print(f"  FAILED - Inventory exceeds budget by {per_workspace - args.budget:,.0f} bytes per workspace")
+        return 1
+    print("  PASS")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
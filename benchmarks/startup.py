@@ -0,0 +1,101 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+"""Cold start benchmark: time from launching webex.py to the first menu.
+
+Usage: python benchmarks/startup.py [--budget SECONDS] [--runs N]
+
+Exits with status 1 when the median cold start exceeds the budget or when
+a heavy dependency is imported before the first menu is shown.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = 0.5
+LAZY_MODULES = ['requests', 'openpyxl', 'xlrd', 'libraries.aso_bulk_import',
+                'libraries.bulk_create_workspaces', 'libraries.aso_validation']
+# The reference cache's background fetches would add network time to the measurement
+WEBEX_ARGS = ['--no-prefetch']
+
+# Runs webex.py and, at its first prompt (the main menu), prints the heavy modules already loaded
+FIRST_MENU_PROBE = """
+import builtins, runpy, sys
+sys.path.insert(0, %r)
+sys.argv = [%r] + %r
+
+def first_prompt(prompt=''):
+    print('LOADED:' + ','.join(m for m in %r if m in sys.modules))
+    raise SystemExit(0)
+
+builtins.input = first_prompt
+runpy.run_path(sys.argv[0], run_name='__main__')
+"""
+
+def time_cold_start(workdir):
+    """Launch webex.py, wait for the main menu prompt and exit immediately"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, 'webex.py')] + WEBEX_ARGS,
+        input="3\n", capture_output=True, text=True, cwd=workdir
+    )
+    elapsed = time.perf_counter() - start
+    if "Main Menu" not in proc.stdout:
+        raise RuntimeError(f"Main menu not reached:\n{proc.stdout}\n{proc.stderr}")
+    return elapsed
+
+def check_lazy_imports(workdir):
+    """Return heavy modules that are loaded when webex.py shows its first menu"""
+    code = FIRST_MENU_PROBE % (REPO_ROOT, os.path.join(REPO_ROOT, 'webex.py'), WEBEX_ARGS, LAZY_MODULES)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=workdir)
+    if "Main Menu" not in proc.stdout:
+        raise RuntimeError(f"Main menu not reached:\n{proc.stdout}\n{proc.stderr}")
+    loaded = proc.stdout.rsplit('LOADED:', 1)[1].strip()
+    return loaded.split(',') if loaded else []
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure webex.py cold start time")
+    parser.add_argument('--budget', type=float,
+                        default=float(os.environ.get('WEBEX_STARTUP_BUDGET', DEFAULT_BUDGET)),
+                        help=f"Maximum median cold start in seconds (default: {DEFAULT_BUDGET})")
+    parser.add_argument('--runs', type=int, default=5, help="Number of cold starts to measure")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='webex_bench_')
+    try:
+        # Credentials with an org ID avoid any network call before the menu
+        with open(os.path.join(workdir, 'credentials.priv'), 'w') as f:
+            f.write("token=benchmark\norgid=benchmark\n")
+
+        timings = [time_cold_start(workdir) for _ in range(args.runs)]
+        eager = check_lazy_imports(workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    median = statistics.median(timings)
+    print(f"Cold start to first menu ({args.runs} runs)")
+    print(f"  Min: {min(timings):.3f}s  Median: {median:.3f}s  Max: {max(timings):.3f}s")
+    print(f"  Budget: {args.budget:.3f}s")
+
+    failed = False
+    if eager:
+        print(f"  FAILED - Loaded before first menu: {', '.join(eager)}")
+        failed = True
+
+    if median > args.budget:
+        print(f"  FAILED - Median cold start exceeds budget by {median - args.budget:.3f}s")
+        failed = True
+
+    if not failed:
+        print("  PASS")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import threading
+import time
+from collections import deque
+
+from libraries.priority import PRIORITY_WEIGHTS
+
+# Endpoint families limited independently; anything else shares 'other'
+FAMILIES = ['telephony/config', 'workspaces', 'devices']
+
+def endpoint_family(path):
+    """Family of an endpoint path or full API URL"""
+    path = path.split('/v1/', 1)[-1].split('?', 1)[0]
+    for family in FAMILIES:
+        if path == family or path.startswith(family + '/'):
+            return family
+    return 'other'
+
+class AIMDLimit:
+    """In-flight request limit for one endpoint family
+
+    The limit grows by one per limit-many healthy responses while saturated
+    and halves on 429/503, request exceptions, or a response much slower
+    than usual. Halving happens at most once per typical response time so a
+    burst of throttled responses from one window counts as a single signal.
+
+    Free slots go to waiting priority classes by stride scheduling: each
+    grant advances the class's pass by 1/weight and the waiting class with
+    the lowest pass goes next, so under contention classes share slots in
+    proportion to PRIORITY_WEIGHTS. FIFO within a class.
+    """
+
+    def __init__(self, family, initial=4, minimum=1, maximum=32, spike_factor=3.0):
+        self.family = family
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.spike_factor = spike_factor
+        self.in_flight = 0
+        self.baseline = None
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.started = time.monotonic()
+        self.history = [(0.0, int(self.limit))]
+        self.waiting = {name: deque() for name in PRIORITY_WEIGHTS}
+        self.passes = {name: 0.0 for name in PRIORITY_WEIGHTS}
+        self.virtual_time = 0.0
+        self.condition = threading.Condition()
+
+    def _next_class(self):
+        active = [name for name, queue in self.waiting.items() if queue]
+        return min(active, key=lambda name: (max(self.passes[name], self.virtual_time), -PRIORITY_WEIGHTS[name]))
+
+    def acquire(self, priority='interactive'):
+        """Wait for a slot, returning the seconds spent waiting"""
+        started = time.monotonic()
+        ticket = object()
+        with self.condition:
+            queue = self.waiting[priority]
+            queue.append(ticket)
+            while (self.in_flight >= int(self.limit) or queue[0] is not ticket
+                   or self._next_class() != priority):
+                self.condition.wait()
+            queue.popleft()
+
+            # A class returning from idle starts at the current virtual time rather than banking credit
+            start = max(self.passes[priority], self.virtual_time)
+            self.virtual_time = start
+            self.passes[priority] = start + 1 / PRIORITY_WEIGHTS[priority]
+            self.in_flight += 1
+            self.condition.notify_all()
+        return time.monotonic() - started
+
+    def release(self, status_code, latency):
+        """Record one finished request; status_code is None when the request raised"""
+        with self.condition:
+            self.in_flight -= 1
+            self.requests += 1
+            before = int(self.limit)
+
+            throttled = status_code in [429, 503]
+            spike = self.baseline is not None and latency > max(self.baseline * self.spike_factor, 1.0)
+            if throttled:
+                self.throttled += 1
+
+            if throttled or spike or status_code is None:
+                now = time.monotonic()
+                if now - self.last_decrease >= (self.baseline or latency):
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.last_decrease = now
+            else:
+                # Grow only while the limit is actually the bottleneck
+                if self.in_flight + 1 >= int(self.limit):
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                # Only healthy responses move the latency baseline
+                self.baseline = latency if self.baseline is None else 0.8 * self.baseline + 0.2 * latency
+
+            if int(self.limit) != before:
+                self.history.append((time.monotonic() - self.started, int(self.limit)))
+            self.condition.notify_all()
+            return before, int(self.limit)
+
+class AdaptiveLimiter:
+    """AIMD concurrency limits per endpoint family, shared by every request a WebexAPI sends"""
+
+    def __init__(self, logger=None, **limit_options):
+        self.logger = logger
+        self.limit_options = limit_options
+        self.limits = {}
+        # priority: [requests, total wait, max wait]
+        self.waits = {}
+        self.lock = threading.Lock()
+
+    def limit_for(self, url):
+        family = endpoint_family(url)
+        with self.lock:
+            if family not in self.limits:
+                self.limits[family] = AIMDLimit(family, **self.limit_options)
+            return self.limits[family]
+
+    def acquire(self, limit, priority):
+        waited = limit.acquire(priority)
+        with self.lock:
+            stats = self.waits.setdefault(priority, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+
+    def release(self, limit, status_code, latency):
+        before, after = limit.release(status_code, latency)
+        if before != after and self.logger:
+            self.logger.info(f"Concurrency {limit.family}: {before} -> {after}")
+
+    def print_metrics(self):
+        """Print requests, throttling and the concurrency chosen over time per family"""
+        with self.lock:
+            limits = list(self.limits.values())
+        if not limits:
+            return
+
+        print("\nAdaptive concurrency (this session):")
+        print(f"  {'Family':<18} {'Requests':<10} {'429/503':<9} {'Limit':<7} {'Range':<9} Changes (seconds:limit)")
+        for limit in limits:
+            values = [value for _, value in limit.history]
+            value_range = f"{min(values)}-{max(values)}"
+            changes = ' '.join(f"{at:.1f}:{value}" for at, value in limit.history[-8:])
+            print(f"  {limit.family:<18} {limit.requests:<10} {limit.throttled:<9} {int(limit.limit):<7} "
+                  f"{value_range:<9} {changes}")
+
+        with self.lock:
+            waits = dict(self.waits)
+        print(f"  Queue wait by priority:")
+        for priority in PRIORITY_WEIGHTS:
+            if priority in waits:
+                count, total, longest = waits[priority]
+                print(f"    {priority:<12} {count} request(s), avg {total / count:.2f}s, max {longest:.2f}s")
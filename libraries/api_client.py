@@ -1,9 +1,23 @@
 # Copyright (c) 2026 Ming Chiu
 # Licensed under the MIT License - see LICENSE file for details
 
-import requests
+import copy
 import json
-import logging
+import time
+
+from libraries.adaptive_limiter import AdaptiveLimiter, endpoint_family
+from libraries.circuit_breaker import CircuitBreakers
+from libraries.hedging import LatencyStats, print_latency_metrics
+from libraries.priority import current_priority
+from libraries.single_flight import SingleFlight
+
+# (connect, read) timeouts in seconds per endpoint family
+DEFAULT_TIMEOUTS = {
+    'workspaces': (5, 30),
+    'devices': (5, 30),
+    'telephony/config': (5, 60),
+    'other': (5, 30)
+}
 
 class WebexAPI:
     def __init__(self, token, org_id, api_logger):
@@ -11,9 +25,102 @@ class WebexAPI:
         self.org_id = org_id
         self.base_url = "https://webexapis.com/v1"
         self.api_logger = api_logger
+        # ReferenceCache attached once the org is known; None disables caching
+        self.reference_cache = None
+        self.limiter = AdaptiveLimiter(api_logger)
+        self.breakers = CircuitBreakers(api_logger)
+        self.get_flights = SingleFlight()
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.latency = LatencyStats()
+        # Hedger set by enable_hedging(); None sends each GET once
+        self.hedger = None
+    
+    def enable_hedging(self):
+        """Send a second copy of a GET that is still running after its family's p95 latency"""
+        from libraries.hedging import Hedger
+        self.hedger = Hedger(self.latency)
     
+    def set_timeout(self, family, connect, read):
+        if family not in self.timeouts:
+            raise ValueError(f"Unknown endpoint family '{family}' (expected one of: {', '.join(self.timeouts)})")
+        self.timeouts[family] = (connect, read)
+
     def call(self, method, endpoint, data=None, params=None):
+        cache = self.reference_cache
+        if cache and method == "GET":
+            cached = cache.lookup(endpoint, params)
+            if cached is not None:
+                self.api_logger.info(f"Cache Hit: GET {endpoint}")
+                return cached
+
+        result, _ = self.send(method, f"{self.base_url}/{endpoint}", data, params)
+        if cache and method != "GET":
+            cache.invalidate_for(endpoint)
+        return result
+    
+    def list_all(self, endpoint, items_key="items", params=None):
+        """GET every page of a list endpoint, following Link rel="next" headers"""
+        items = []
+        error = self.each_page(endpoint, items.extend, items_key, params)
+        return error or {items_key: items}
+    
+    def each_page(self, endpoint, handle_page, items_key="items", params=None):
+        """Pass each page's items to handle_page as it arrives, returning an error result or None
+        
+        Pages are not kept, so a caller that reduces them (such as the
+        inventory) never holds the whole list of raw items. handle_page
+        returning False stops before the next page is requested.
+        """
         url = f"{self.base_url}/{endpoint}"
+        
+        while url:
+            result, response = self.send("GET", url, params=params)
+            if "error" in result:
+                return result
+            if handle_page(result.get(items_key, [])) is False:
+                return None
+            url = response.links.get("next", {}).get("url")
+            # The next link already carries the query string
+            params = None
+        
+        return None
+    
+    def send(self, method, url, data=None, params=None):
+        """Send one request, returning (result, response); response is None on exceptions
+
+        Identical GETs already in flight on another thread share that call's
+        response instead of sending their own; each of them then gets a
+        deep copy of the result, so no caller sees another's edits.
+        """
+        if method != "GET":
+            return self._send(method, url, data, params)
+        
+        family = endpoint_family(url)
+        send_once = lambda: self._send(method, url, data, params)
+        send_get = (lambda: self.hedger.run(family, send_once)) if self.hedger else send_once
+        
+        key = (url, json.dumps(params or {}, sort_keys=True))
+        started = time.monotonic()
+        result, response = self.get_flights.do(key, send_get,
+                                               lambda value: (copy.deepcopy(value[0]), value[1]))
+        self.latency.record(family, 'observed', time.monotonic() - started)
+        return result, response
+    
+    def print_metrics(self):
+        """Print request coalescing, latency and adaptive concurrency metrics for the session"""
+        flights = self.get_flights
+        total = flights.executed + flights.shared
+        if total:
+            print(f"\nGET requests: {total} | Sent: {flights.executed} | "
+                  f"Coalesced with an identical in-flight GET: {flights.shared}")
+        print_latency_metrics(self.latency, self.hedger)
+        self.limiter.print_metrics()
+        self.breakers.print_metrics()
+    
+    def _send(self, method, url, data=None, params=None):
+        # requests is imported on first call so the menu appears without loading it
+        import requests
+        
         headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
@@ -25,16 +132,34 @@ class WebexAPI:
         if data:
             self.api_logger.info(f"Data: {json.dumps(data)}")
         
+        family = endpoint_family(url)
+        breaker = self.breakers.breaker_for(url)
+        if not breaker.allow():
+            rejection = self.breakers.rejection(breaker)
+            self.api_logger.error(f"API Error: {rejection['error']}")
+            return rejection, None
+        
+        limit = self.limiter.limit_for(url)
+        self.limiter.acquire(limit, current_priority())
+        started = time.monotonic()
+        status_code = None
         try:
-            response = requests.request(method, url, headers=headers, json=data, params=params)
+            response = requests.request(method, url, headers=headers, json=data, params=params,
+                                        timeout=self.timeouts.get(family, self.timeouts['other']))
+            status_code = response.status_code
             self.api_logger.info(f"Response Status: {response.status_code}")
             self.api_logger.info(f"Response: {response.text}")
             
             if response.status_code in [200, 201, 204]:
-                return response.json() if response.text else {}
+                return (response.json() if response.text else {}), response
             else:
                 self.api_logger.error(f"API Error: {response.status_code} - {response.text}")
-                return {"error": response.text, "status_code": response.status_code}
+                return {"error": response.text, "status_code": response.status_code}, response
         except Exception as e:
             self.api_logger.error(f"Exception during API call: {e}")
-            return {"error": str(e)}
+            return {"error": str(e)}, None
+        finally:
+            latency = time.monotonic() - started
+            self.latency.record(family, 'attempt', latency)
+            self.limiter.release(limit, status_code, latency)
+            self.breakers.record(breaker, status_code)
@@ -3,66 +3,81 @@
 
 import os
 import glob
-import openpyxl
-import xlrd
+from libraries import prompts
+from libraries.priority import request_priority
 
-def find_aso_import_file():
-    """Find Excel file with prefix 'aso_import' in bulk directory"""
+# Sheets besides Webex Users that the import phases read, stored in saved plans
+PLAN_SHEETS = ['Webex Side Cars', 'Webex Hunt Groups']
+
+# Returned instead of results when nothing was run for these reasons; None means the operator cancelled
+VALIDATION_FAILED = 'validation_failed'
+NO_VALID_ROWS = 'no_valid_rows'
+
+def find_aso_import_files():
+    """Excel files with prefix 'aso_import' in bulk directory, .xlsx files first, each sorted by name"""
     bulk_dir = 'bulk'
     
     if not os.path.exists(bulk_dir):
-        return None
+        return []
     
     patterns = [os.path.join(bulk_dir, 'aso_import*.xlsx'), 
                 os.path.join(bulk_dir, 'aso_import*.xls')]
     
+    files = []
     for pattern in patterns:
-        files = glob.glob(pattern)
-        if files:
-            return files[0]
+        files.extend(sorted(glob.glob(pattern)))
     
-    return None
+    return files
+
+def parse_excel_sheet(filepath, sheet_name):
+    """Rows of a specific Excel sheet; raises if the file or sheet cannot be read"""
+    if filepath.endswith('.xlsx'):
+        import openpyxl
+        import warnings
+        warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+        wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+        ws = wb[sheet_name]
+        data = []
+        for row in ws.iter_rows(values_only=True):
+            data.append(row)
+        wb.close()
+        return data
+    elif filepath.endswith('.xls'):
+        import xlrd
+        wb = xlrd.open_workbook(filepath, formatting_info=False)
+        ws = wb.sheet_by_name(sheet_name)
+        data = []
+        for row_idx in range(ws.nrows):
+            data.append(ws.row_values(row_idx))
+        return data
 
 def read_excel_sheet(filepath, sheet_name):
     """Read data from specific Excel sheet"""
     try:
-        if filepath.endswith('.xlsx'):
-            import warnings
-            warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
-            wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
-            ws = wb[sheet_name]
-            data = []
-            for row in ws.iter_rows(values_only=True):
-                data.append(row)
-            wb.close()
-            return data
-        elif filepath.endswith('.xls'):
-            wb = xlrd.open_workbook(filepath, formatting_info=False)
-            ws = wb.sheet_by_name(sheet_name)
-            data = []
-            for row_idx in range(ws.nrows):
-                data.append(ws.row_values(row_idx))
-            return data
+        return parse_excel_sheet(filepath, sheet_name)
     except Exception as e:
         print(f"Error reading sheet '{sheet_name}': {str(e)}")
         return None
 
-def process_bulk_import(api, location_data, filepath):
-    """Process bulk import of workspaces from Excel file"""
-    from libraries.workspace_config import (
-        create_workspace_from_row,
-        configure_call_forwarding,
-        configure_outgoing_permission,
-        configure_side_car_speed_dials
-    )
+def process_bulk_import(api, location_data, filepath, resume=None, diff_writes=True, dry_run=False,
+                        read_sheet=read_excel_sheet):
+    """Process bulk import of workspaces from Excel file
+    
+    read_sheet(filepath, sheet name) supplies the sheets, such as a shared Workbook's read_sheet.
+    Returns the results, None if cancelled, or VALIDATION_FAILED or NO_VALID_ROWS when nothing was run.
+    """
+    from libraries.run_journal import RunJournal, open_run_journal
+    from libraries.webex_users import parse_webex_users
     
-    users_data = read_excel_sheet(filepath, 'Webex Users')
+    users_data = read_sheet(filepath, 'Webex Users')
     if not users_data or len(users_data) < 2:
         print("Error: Could not read data")
-        return
+        return NO_VALID_ROWS
+    
+    users = parse_webex_users(users_data)
     
-    headers = users_data[0]
-    data_rows = users_data[1:]
+    with request_priority('validation'):
+        preflight, _ = preflight_rows(api, location_data, users)
     
     print(f"\n{'='*80}")
     print("Import Preview")
@@ -72,33 +87,21 @@ def process_bulk_import(api, location_data, filepath):
     workspaces_count = 0
     preview_items = []
     
-    for row_idx, row in enumerate(data_rows, start=2):
-        user_type = str(row[9]).strip().lower() if len(row) > 9 else ""
-        display_name = str(row[12]).strip() if len(row) > 12 else "Unknown"
-        extension = str(row[4]).strip() if len(row) > 4 else ""
-        phone_number = str(row[3]).strip() if len(row) > 3 and row[3] else ""
-        device_model = str(row[10]).strip() if len(row) > 10 else ""
-        
-        if user_type == 'user':
+    for user in users:
+        if user.is_user:
             users_count += 1
-            preview_items.append({
-                'row': row_idx,
-                'type': 'User',
-                'name': display_name,
-                'ext': extension,
-                'phone': phone_number,
-                'device': device_model
-            })
+            item_type = 'User'
         else:
             workspaces_count += 1
-            preview_items.append({
-                'row': row_idx,
-                'type': 'Workspace',
-                'name': display_name,
-                'ext': extension,
-                'phone': phone_number,
-                'device': device_model
-            })
+            item_type = preflight[user.row_num]['action'].capitalize() if user.row_num in preflight else 'Workspace'
+        preview_items.append({
+            'row': user.row_num,
+            'type': item_type,
+            'name': user.display_name,
+            'ext': user.extension,
+            'phone': user.phone_number,
+            'device': user.device_model
+        })
     
     print(f"{'Row':<5} {'Type':<10} {'Name':<25} {'Ext':<8} {'Phone':<12} {'Device':<20}")
     print(f"{'-'*80}")
@@ -110,59 +113,220 @@ def process_bulk_import(api, location_data, filepath):
     print(f"Note: Users will be skipped (not yet implemented)")
     print(f"{'='*80}")
     
-    confirm = input("\nProceed with import? (Y/n): ").strip().lower()
-    if confirm not in ['', 'y', 'yes']:
+    if not prompts.confirm("aso.proceed_import", "\nProceed with import? (Y/n): "):
         print("Import cancelled.")
-        return
+        return None
+    
+    journal = RunJournal(None) if dry_run else open_run_journal("aso_import", filepath, resume)
+    if journal is None:
+        return VALIDATION_FAILED
+    
+    try:
+        with request_priority('bulk'):
+            results = run_bulk_import_steps(api, location_data, filepath, users, journal, preflight, diff_writes,
+                                            read_sheet)
+    finally:
+        journal.close()
+    
+    if dry_run:
+        api.write_plan("aso_import", filepath)
+    
+    return results
+
+def preflight_rows(api, location_data, users, state=None):
+    """Classify workspace rows against existing org state
+    
+    state may be fetched already for several locations; otherwise it is fetched here.
+    Returns ({row_idx: classification}, org state); the state is None if it could not be fetched.
+    """
+    from libraries.reconcile import fetch_org_state, classify_row, device_missing, print_reconciliation
+    from libraries.workspace_config import supported_devices_for_user
+    
+    state = state or fetch_org_state(api, [location_data['id']])
+    if state is None:
+        print("  Warning: Pre-flight check unavailable; every row will be attempted")
+        return {}, None
+    
+    preflight = {}
+    classified = []
+    for user in users:
+        if user.is_user:
+            continue
+        
+        # The sheet has no workspace type; notSet is only the default for new workspaces
+        action, existing_id, reasons = classify_row(state, user.display_name, location_data['id'],
+                                                    user.extension, user.phone_number, user.mac_address,
+                                                    supported_devices=supported_devices_for_user(user))
+        preflight[user.row_num] = {
+            'action': action,
+            'workspace_id': existing_id,
+            'reasons': reasons,
+            'needs_device': action == 'skip' and user.needs_device and device_missing(state, existing_id, user.mac_address)
+        }
+        classified.append((user.row_num, user.display_name, action, reasons))
+    
+    print_reconciliation(classified)
+    return preflight, state
+
+def run_bulk_import_steps(api, location_data, filepath, users, journal, preflight=None, diff_writes=True,
+                          read_sheet=read_excel_sheet, show_metrics=True):
+    """Run the import phases, skipping steps the journal already records as done
+    
+    users are the sheet's WebexUserRow records; read_sheet(filepath, sheet name)
+    supplies the side car and hunt group sheets. show_metrics False leaves the
+    session's API metrics out of the summary, for runs that print them once for several sites.
+    """
+    from libraries.circuit_breaker import is_circuit_open
+    from libraries.run_journal import row_key
+    from libraries.workspace_config import (
+        create_workspace_from_row,
+        create_device_from_row,
+        build_call_forwarding_payload,
+        build_outgoing_permission_payload,
+        settings_match,
+        fetch_feature_settings,
+        configure_call_forwarding,
+        configure_outgoing_permission,
+        configure_side_car_speed_dials
+    )
     
     print(f"\n{'='*60}")
     print("Starting Bulk Import Process")
     print(f"{'='*60}")
     
-    results = {'users': 0, 'workspaces_created': 0, 'workspaces_failed': 0, 'errors': []}
+    preflight = preflight or {}
+    results = {'users': 0, 'workspaces_created': 0, 'workspaces_resumed': 0, 'workspaces_skipped': 0,
+               'workspaces_failed': 0, 'writes_avoided': 0, 'errors': [], 'parked': []}
     workspace_map = {}
+    # Rows whose workspace existed before this run and may already hold the desired settings
+    preexisting_rows = []
     
-    for row_idx, row in enumerate(data_rows, start=2):
-        user_type = str(row[9]).strip().lower() if len(row) > 9 else ""
-        display_name = str(row[12]).strip() if len(row) > 12 else "Unknown"
+    def parked(row_idx, step, error):
+        """Park a step rejected by an open circuit so a resumed run retries it; False for other errors
         
-        if user_type == 'user':
+        row_idx is None for steps that belong to no single row, such as side cars and hunt groups.
+        """
+        if not is_circuit_open(error):
+            return False
+        results['parked'].append(f"Row {row_idx}: {step}" if row_idx else step)
+        print(f"  Parked {step}: {error}")
+        return True
+    
+    for user in users:
+        row_idx = user.row_num
+        display_name = user.display_name
+        
+        if user.is_user:
             results['users'] += 1
             print(f"Row {row_idx}: Skipping user '{display_name}' (user provisioning not yet implemented)")
             continue
         
+        key = row_key(row_idx, display_name)
+        if journal.is_done(key, 'workspace'):
+            workspace_id = journal.get(key, 'workspace')['workspace_id']
+            workspace_map[row_idx] = workspace_id
+            preexisting_rows.append(row_idx)
+            results['workspaces_resumed'] += 1
+            print(f"\nRow {row_idx}: Workspace '{display_name}' already created (ID: {workspace_id})")
+            
+            if user.needs_device and not journal.is_done(key, 'device'):
+                print(f"  Retrying device provisioning...")
+                device_id, error = create_device_from_row(api, workspace_id, user)
+                if error and not parked(row_idx, 'device', error):
+                    print(f"  Warning: Device failed: {error}")
+                    results['errors'].append(f"Row {row_idx}: Device failed: {error}")
+                elif not error:
+                    journal.record(key, 'device', device_id=device_id)
+                    print(f"  Success: Device created")
+            continue
+        
+        check = preflight.get(row_idx, {'action': 'create'})
+        if check['action'] == 'conflict':
+            results['workspaces_failed'] += 1
+            print(f"\nRow {row_idx}: Conflict for '{display_name}': {'; '.join(check['reasons'])}")
+            results['errors'].append(f"Row {row_idx}: Conflict - {'; '.join(check['reasons'])}")
+            continue
+        
+        if check['action'] == 'skip':
+            workspace_id = check['workspace_id']
+            workspace_map[row_idx] = workspace_id
+            preexisting_rows.append(row_idx)
+            results['workspaces_skipped'] += 1
+            print(f"\nRow {row_idx}: Workspace '{display_name}' already present (ID: {workspace_id})")
+            journal.record(key, 'workspace', workspace_id=workspace_id)
+            
+            if check['needs_device']:
+                print(f"  Creating missing device...")
+                device_id, error = create_device_from_row(api, workspace_id, user)
+                if error:
+                    if not parked(row_idx, 'device', error):
+                        print(f"  Warning: Device failed: {error}")
+                        results['errors'].append(f"Row {row_idx}: Device failed: {error}")
+                    continue
+                print(f"  Success: Device created")
+            journal.record(key, 'device')
+            continue
+        
         print(f"\nRow {row_idx}: Creating workspace '{display_name}'...")
-        workspace_id, error = create_workspace_from_row(api, location_data, row, headers)
+        workspace_id, error = create_workspace_from_row(api, location_data, user)
         
         if workspace_id:
+            journal.record(key, 'workspace', workspace_id=workspace_id)
+            if user.needs_device and not error:
+                journal.record(key, 'device')
             results['workspaces_created'] += 1
             workspace_map[row_idx] = workspace_id
-            if error:
+            if error and not parked(row_idx, 'device', error):
                 print(f"  Warning: {error}")
                 results['errors'].append(f"Row {row_idx}: {error}")
-            else:
+            elif not error:
                 print(f"  Success: Workspace created (ID: {workspace_id})")
+        elif parked(row_idx, 'workspace', error):
+            continue
         else:
             results['workspaces_failed'] += 1
             print(f"  Failed: {error}")
             results['errors'].append(f"Row {row_idx}: {error}")
     
+    current_forwarding = {}
+    current_permissions = {}
+    if diff_writes and preexisting_rows:
+        forwarding_ids = [workspace_map[r] for r in preexisting_rows if build_call_forwarding_payload(users[r - 2])]
+        permission_ids = [workspace_map[r] for r in preexisting_rows if build_outgoing_permission_payload(users[r - 2])]
+        if forwarding_ids or permission_ids:
+            print(f"\nFetching current settings for {len(preexisting_rows)} existing workspace(s) to avoid redundant writes...")
+            current_forwarding = fetch_feature_settings(api, forwarding_ids, 'callForwarding')
+            current_permissions = fetch_feature_settings(api, permission_ids, 'outgoingPermission')
+    
     if workspace_map:
         print(f"\n{'='*60}")
         print("Configuring Call Forwarding & Business Continuity")
         print(f"{'='*60}")
         
         for row_idx, workspace_id in workspace_map.items():
-            row = data_rows[row_idx - 2]
-            display_name = str(row[12]).strip() if len(row) > 12 else "Unknown"
+            user = users[row_idx - 2]
+            display_name = user.display_name
+            
+            key = row_key(row_idx, display_name)
+            if journal.is_done(key, 'forwarding'):
+                print(f"\nRow {row_idx}: Call forwarding already configured for '{display_name}'")
+                continue
+            
+            desired = build_call_forwarding_payload(user)
+            if desired and workspace_id in current_forwarding and settings_match(current_forwarding[workspace_id], desired):
+                results['writes_avoided'] += 1
+                journal.record(key, 'forwarding')
+                print(f"\nRow {row_idx}: Call forwarding for '{display_name}' already matches, no write needed")
+                continue
             
             print(f"\nRow {row_idx}: Configuring '{display_name}'...")
-            error = configure_call_forwarding(api, workspace_id, row)
+            error = configure_call_forwarding(api, workspace_id, user)
             
-            if error:
+            if error and not parked(row_idx, 'call forwarding', error):
                 print(f"  Warning: {error}")
                 results['errors'].append(f"Row {row_idx}: Call forwarding failed - {error}")
-            else:
+            elif not error:
+                journal.record(key, 'forwarding')
                 print(f"  Success: Call forwarding configured")
     
     if workspace_map:
@@ -171,52 +335,102 @@ def process_bulk_import(api, location_data, filepath):
         print(f"{'='*60}")
         
         for row_idx, workspace_id in workspace_map.items():
-            row = data_rows[row_idx - 2]
-            display_name = str(row[12]).strip() if len(row) > 12 else "Unknown"
+            user = users[row_idx - 2]
+            display_name = user.display_name
+            
+            key = row_key(row_idx, display_name)
+            if journal.is_done(key, 'permission'):
+                print(f"\nRow {row_idx}: Outgoing permissions already handled for '{display_name}'")
+                continue
+            
+            desired = build_outgoing_permission_payload(user)
+            if desired and workspace_id in current_permissions and settings_match(current_permissions[workspace_id], desired):
+                results['writes_avoided'] += 1
+                journal.record(key, 'permission', configured=True)
+                print(f"\nRow {row_idx}: Outgoing permissions for '{display_name}' already match, no write needed")
+                continue
             
             print(f"\nRow {row_idx}: Checking '{display_name}'...")
-            error, was_configured = configure_outgoing_permission(api, workspace_id, row)
+            error, was_configured = configure_outgoing_permission(api, workspace_id, user)
+            if not error:
+                journal.record(key, 'permission', configured=was_configured)
             
             if was_configured:
-                if error:
+                if not error:
+                    print(f"  Success: Custom outgoing permissions configured")
+                elif not parked(row_idx, 'outgoing permission', error):
                     print(f"  Warning: {error}")
                     results['errors'].append(f"Row {row_idx}: Outgoing permission failed - {error}")
-                else:
-                    print(f"  Success: Custom outgoing permissions configured")
             else:
                 print(f"  Skipped: No custom permissions required")
     
+    # Side car targets and hunt group agents are matched to workspaces by extension
+    workspace_by_extension = {users[row_idx - 2].extension: workspace_id for row_idx, workspace_id in workspace_map.items()
+                              if users[row_idx - 2].extension}
+    
     if workspace_map:
         print(f"\n{'='*60}")
-        proceed = input("\nProceed with side car speed dial configuration? (Y/n): ").strip().lower()
-        if proceed in ['', 'y', 'yes']:
-            configure_side_car_speed_dials(api, workspace_map, data_rows, filepath, read_excel_sheet)
+        if prompts.confirm("aso.configure_side_cars", "\nProceed with side car speed dial configuration? (Y/n): "):
+            outcomes = configure_side_car_speed_dials(api, workspace_by_extension, filepath, read_sheet, journal)
+            for extension, (status, detail) in outcomes.items():
+                if status == 'failed' and not parked(None, f"side car {extension}", detail):
+                    results['errors'].append(f"Side car {extension}: {detail}")
         else:
             print("\nSide car configuration skipped.")
     
     if workspace_map:
         from libraries.configure_hunt_groups import configure_hunt_groups
-        configure_hunt_groups(api, location_data, workspace_map, data_rows, filepath)
+        _, failures = configure_hunt_groups(api, location_data, workspace_by_extension, filepath, journal, read_sheet)
+        for name, error in failures:
+            if not parked(None, f"hunt group '{name}'", error):
+                results['errors'].append(f"Hunt group '{name}': {error}")
     
     print(f"\n{'='*60}")
     print("Bulk Import Summary")
     print(f"{'='*60}")
     print(f"Users skipped: {results['users']}")
     print(f"Workspaces created: {results['workspaces_created']}")
+    if results['workspaces_resumed']:
+        print(f"Workspaces resumed from journal: {results['workspaces_resumed']}")
+    if results['workspaces_skipped']:
+        print(f"Workspaces already present: {results['workspaces_skipped']}")
+    if diff_writes:
+        print(f"Writes avoided (settings already current): {results['writes_avoided']}")
     print(f"Workspaces failed: {results['workspaces_failed']}")
+    if show_metrics:
+        api.print_metrics()
     
     if results['errors']:
         print(f"\nErrors/Warnings:")
         for error in results['errors']:
             print(f"  - {error}")
     
+    if results['parked']:
+        print(f"\nParked (endpoint circuit open, not attempted):")
+        for step in results['parked']:
+            print(f"  - {step}")
+    
     if results['users'] > 0:
         print(f"\nNote: User provisioning will be implemented in a future update.")
     
+    if results['workspaces_failed'] or results['errors'] or results['parked']:
+        if journal.path:
+            print(f"\nRe-run to resume from journal {journal.path}")
+    else:
+        journal.complete()
+    
     print(f"{'='*60}")
+    
+    return results
 
-def aso_bulk_import_tool(api):
-    """Main function for ASO Bulk Import Tool"""
+def validate_aso_workbook(api, filepath, parallel_parse=False, create_schedules=True):
+    """Run the validation stages on one workbook, returning the validated site or None
+    
+    The site is a dict with the workbook's filepath, its location and the
+    Workbook every stage read its sheets through. With create_schedules
+    False the required schedules are only read from the workbook, under
+    'schedules', so several sites can be provisioned together.
+    """
     from libraries.aso_validation import (
         validate_excel_file,
         validate_location,
@@ -225,19 +439,110 @@ def aso_bulk_import_tool(api):
         validate_translation_pattern,
         validate_call_park_extensions
     )
-    from libraries.schedule_manager import validate_and_create_schedules
+    from libraries.schedule_manager import read_required_schedules, validate_and_create_schedules
+    from libraries.aso_prefetch import PrefetchingAPI, prefetch_location_reads
+    from libraries.workbook import ASO_SHEETS, Workbook
+    
+    workbook = Workbook(filepath)
+    read_sheet = workbook.read_sheet
+    site = {'filepath': filepath, 'workbook': workbook, 'schedules': None}
+    
+    with request_priority('validation'):
+        # Read-only validation GETs run in the background while sheets are parsed and checked locally
+        validation_api = PrefetchingAPI(api)
+        validation_api.prefetch("telephony/config/locations", {"orgId": api.org_id})
+        
+        try:
+            is_valid, additional_tabs = validate_excel_file(filepath)
+            
+            if not is_valid:
+                print("\nValidation failed. Please fix the issues and try again.")
+                return None
+            
+            if additional_tabs:
+                print(f"\nAdditional tabs detected and cached:")
+                for i, tab in enumerate(additional_tabs, 1):
+                    print(f"  {i}. {tab}")
+            
+            if parallel_parse:
+                # The location tab is one of the additional tabs; which one is known only after validation 3
+                workbook.load(ASO_SHEETS + list(additional_tabs or []))
+            
+            prefetch_location_reads(validation_api, filepath, read_sheet, additional_tabs)
+            
+            location = validate_location(validation_api, filepath, read_sheet)
+            
+            if not location:
+                print("\nValidation failed. Returning to previous menu.")
+                return None
+            site['location'] = location
+            
+            if not validate_webex_users_data(filepath, read_sheet):
+                print("\nValidation failed. Returning to previous menu.")
+                return None
+            
+            if not validate_available_numbers(validation_api, location, filepath, read_sheet):
+                print("\nValidation failed. Returning to previous menu.")
+                return None
+            
+            translation_pattern = validate_translation_pattern(validation_api, location, filepath, read_sheet, additional_tabs)
+            
+            call_park_extensions = validate_call_park_extensions(validation_api, location, filepath, read_sheet, additional_tabs)
+            
+            if create_schedules:
+                validate_and_create_schedules(validation_api, location['id'], filepath, read_sheet)
+            else:
+                site['schedules'] = read_required_schedules(filepath, read_sheet)
+        finally:
+            validation_api.close()
     
+    print("\nValidation complete. Ready for next steps.")
+    workbook.print_parse_times()
+    return site
+
+def aso_bulk_import_tool(api, filepath=None, resume=None, diff_writes=True, dry_run=False, save_plan=None,
+                         parallel_parse=False, site_workers=None):
+    """Main function for ASO Bulk Import Tool
+    
+    With save_plan (a path, or True for a default path) the validated import
+    is saved as a plan instead of run, and the plan path is returned.
+    Every stage reads sheets through one Workbook, so each tab is parsed
+    once; with parallel_parse all of them are parsed up front in a process pool.
+    When no file is given and several aso_import workbooks are found, all of
+    them can be imported in one run (see aso_multi_site.import_sites).
+    Otherwise returns as process_bulk_import does.
+    """
     print("\n--- ASO Bulk Import Tool ---")
+    if dry_run:
+        from libraries.dry_run import DryRunAPI
+        print("Dry run: reads are sent, writes are only planned")
+        api = DryRunAPI(api)
     
     if not os.path.exists('bulk'):
         print("Status: FAILED - 'bulk' folder not found")
         print("Creating 'bulk' folder...")
         os.makedirs('bulk')
         print("Please place your 'aso_import' Excel file in the 'bulk' folder and try again.")
-        return
-    
-    print("\nSearching for 'aso_import' Excel file in bulk folder...")
-    filepath = find_aso_import_file()
+        return VALIDATION_FAILED
+    
+    if filepath:
+        if not os.path.exists(filepath):
+            print(f"Status: FAILED - File not found: {filepath}")
+            return VALIDATION_FAILED
+    else:
+        print("\nSearching for 'aso_import' Excel file in bulk folder...")
+        files = find_aso_import_files()
+        filepath = files[0] if files else None
+        
+        if len(files) > 1:
+            print(f"Status: PASS - Found {len(files)} files:")
+            for i, path in enumerate(files, 1):
+                print(f"  {i}. {path}")
+            if save_plan:
+                print("Plans are saved per workbook; the first file is used (pass --file to choose another)")
+            elif prompts.confirm("aso.import_all_sites", f"\nImport all {len(files)} sites in one run? (Y/n): "):
+                from libraries.aso_multi_site import import_sites
+                return import_sites(api, files, resume, diff_writes, dry_run, parallel_parse, site_workers)
     
     if not filepath:
         print("Status: FAILED - No file found with prefix 'aso_import' (.xlsx or .xls)")
@@ -245,41 +550,84 @@ def aso_bulk_import_tool(api):
         print("  1. Has a filename starting with 'aso_import'")
         print("  2. Is in Excel format (.xlsx or .xls)")
         print("  3. Is located in the 'bulk' folder")
-        return
+        return VALIDATION_FAILED
     
     print(f"Status: PASS - Found file: {filepath}")
     
-    is_valid, additional_tabs = validate_excel_file(filepath)
-    
-    if not is_valid:
-        print("\nValidation failed. Please fix the issues and try again.")
-        return
-    
-    if additional_tabs:
-        print(f"\nAdditional tabs detected and cached:")
-        for i, tab in enumerate(additional_tabs, 1):
-            print(f"  {i}. {tab}")
-    
-    location = validate_location(api, filepath, read_excel_sheet)
-    
-    if not location:
-        print("\nValidation failed. Returning to previous menu.")
-        return
+    site = validate_aso_workbook(api, filepath, parallel_parse)
+    if site is None:
+        return VALIDATION_FAILED
+    read_sheet = site['workbook'].read_sheet
     
-    if not validate_webex_users_data(filepath, read_excel_sheet):
-        print("\nValidation failed. Returning to previous menu.")
-        return
+    if save_plan:
+        return save_aso_plan(api, site['location'], filepath, None if save_plan is True else save_plan, read_sheet)
     
-    if not validate_available_numbers(api, location, filepath, read_excel_sheet):
-        print("\nValidation failed. Returning to previous menu.")
-        return
-    
-    translation_pattern = validate_translation_pattern(api, location, filepath, read_excel_sheet, additional_tabs)
+    return process_bulk_import(api, site['location'], filepath, resume, diff_writes, dry_run, read_sheet)
+
+def save_aso_plan(api, location_data, filepath, plan_path=None, read_sheet=read_excel_sheet):
+    """Save a validated import with the sheet data it needs, returning the plan path or None"""
+    from libraries.execution_plan import default_plan_path, save_plan
+    from libraries.webex_users import parse_webex_users
     
-    call_park_extensions = validate_call_park_extensions(api, location, filepath, read_excel_sheet, additional_tabs)
+    users_data = read_sheet(filepath, 'Webex Users')
+    if not users_data or len(users_data) < 2:
+        print("Error: Could not read data")
+        return None
     
-    schedule_ids = validate_and_create_schedules(api, location['id'], filepath)
+    with request_priority('validation'):
+        preflight, state = preflight_rows(api, location_data, parse_webex_users(users_data))
+    if state is None:
+        print("Error: A plan needs the pre-flight organization state; try again when the API is reachable")
+        return None
     
-    print("\nValidation complete. Ready for next steps.")
+    payload = {
+        'location': location_data,
+        'headers': users_data[0],
+        'data_rows': users_data[1:],
+        'preflight': preflight,
+        'sheets': {name: read_sheet(filepath, name) for name in PLAN_SHEETS}
+    }
+    return save_plan(plan_path or default_plan_path("aso_import"), "aso_import", api, filepath, state, payload)
+
+def execute_aso_plan(api, plan, plan_path, resume=None, diff_writes=True):
+    """Run a saved import plan without opening the workbook
+    
+    A fresh run first checks that the org state still matches the plan;
+    resuming a run of the same plan skips that check, since its own writes changed the state.
+    Returns as process_bulk_import does.
+    """
+    from libraries.execution_plan import verify_org_state
+    from libraries.run_journal import open_run_journal
+    from libraries.webex_users import parse_webex_users
+    
+    payload = plan['payload']
+    location_data = payload['location']
+    # JSON object keys are strings
+    preflight = {int(row_idx): check for row_idx, check in payload['preflight'].items()}
+    sheets = payload['sheets']
+    
+    actions = [check['action'] for check in preflight.values()]
+    print(f"\nPlan: {len(payload['data_rows'])} row(s) for location {location_data['name']}: "
+          f"{actions.count('create')} workspace(s) to create, {actions.count('skip')} already present, "
+          f"{actions.count('conflict')} conflict(s)")
+    
+    journal = open_run_journal("aso_import", plan_path, resume)
+    if journal is None:
+        return VALIDATION_FAILED
+    
+    if not journal.step_count() and not verify_org_state(api, plan):
+        journal.close_or_discard()
+        return VALIDATION_FAILED
+    
+    if not prompts.confirm("aso.proceed_import", "\nProceed with import? (Y/n): "):
+        print("Import cancelled.")
+        journal.close_or_discard()
+        return None
     
-    process_bulk_import(api, location, filepath)
+    try:
+        with request_priority('bulk'):
+            users = parse_webex_users([payload['headers']] + payload['data_rows'])
+            return run_bulk_import_steps(api, location_data, plan_path, users, journal, preflight, diff_writes,
+                                         lambda path, name: sheets.get(name))
+    finally:
+        journal.close()
@@ -0,0 +1,249 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import contextvars
+import os
+import sys
+import threading
+
+from libraries import prompts
+from libraries.concurrency import ADAPTIVE_WORKERS, run_concurrently
+from libraries.priority import request_priority
+
+# Result counters summed across sites
+RESULT_COUNTS = ['users', 'workspaces_created', 'workspaces_resumed', 'workspaces_skipped', 'workspaces_failed',
+                 'writes_avoided']
+
+# Phase confirmations asked once for every site, since sites run unattended
+PHASE_PROMPTS = [
+    ("aso.configure_side_cars", "\nConfigure side car speed dials at every site? (Y/n): "),
+    ("aso.configure_hunt_groups", "Configure hunt groups at every site? (Y/n): "),
+    ("aso.create_hunt_group", "Create each site's new hunt groups without asking per site? (Y/n): ")
+]
+
+class SiteOutput:
+    """Stand-in for sys.stdout that starts each line printed for a site with its label
+
+    The label is a context variable, so request workers a site starts
+    (which copy the caller's context) are labelled too. Partial lines are
+    held per thread until their newline arrives.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.label = contextvars.ContextVar('site_label', default=None)
+        self.pending = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, data):
+        label = self.label.get()
+        if label is None:
+            with self.lock:
+                self.stream.write(data)
+            return
+        text = getattr(self.pending, 'text', '') + data
+        *lines, self.pending.text = text.split('\n')
+        if lines:
+            with self.lock:
+                self.stream.write(''.join(f"[{label}] {line}\n" for line in lines))
+
+    def flush(self):
+        self.stream.flush()
+
+def validate_sites(api, filepaths, parallel_parse=False):
+    """Validate each workbook in turn, returning (sites, [(filepath, reason)] for the rest)"""
+    from libraries.aso_bulk_import import validate_aso_workbook
+    from libraries.webex_users import parse_webex_users
+
+    sites = []
+    failed = []
+    locations = {}
+    for number, filepath in enumerate(filepaths, 1):
+        print(f"\n{'#'*60}")
+        print(f"Site {number} of {len(filepaths)}: {filepath}")
+        print(f"{'#'*60}")
+
+        site = validate_aso_workbook(api, filepath, parallel_parse, create_schedules=False)
+        if site is None:
+            failed.append((filepath, "validation failed"))
+            continue
+
+        location = site['location']
+        if location['id'] in locations:
+            # Two concurrent imports into one location would race to create the same workspaces
+            print(f"\nSkipped: {location['name']} is already imported from {locations[location['id']]}")
+            failed.append((filepath, f"same location as {locations[location['id']]}"))
+            continue
+
+        users_data = site['workbook'].read_sheet(filepath, 'Webex Users')
+        if not users_data or len(users_data) < 2:
+            print("Error: Could not read data")
+            failed.append((filepath, "could not read Webex Users"))
+            continue
+
+        locations[location['id']] = filepath
+        site['label'] = location['name']
+        site['users'] = parse_webex_users(users_data)
+        sites.append(site)
+
+    return sites, failed
+
+def print_site_preview(sites, failed):
+    print(f"\n{'='*80}")
+    print("Multi-Site Import Preview")
+    print(f"{'='*80}")
+    print(f"{'Location':<25} {'File':<30} {'Rows':<6} {'Users':<6} {'Create':<7} {'Present':<8} {'Conflict':<8}")
+    print(f"{'-'*80}")
+    for site in sites:
+        actions = [check['action'] for check in site['preflight'].values()]
+        workspaces = sum(1 for user in site['users'] if not user.is_user)
+        users = len(site['users']) - workspaces
+        # Without a pre-flight every workspace row is attempted
+        creates = actions.count('create') if site['preflight'] else workspaces
+        print(f"{site['label'][:25]:<25} {os.path.basename(site['filepath'])[:30]:<30} {len(site['users']):<6} "
+              f"{users:<6} {creates:<7} {actions.count('skip'):<8} {actions.count('conflict'):<8}")
+    for filepath, reason in failed:
+        print(f"{'(not imported)':<25} {os.path.basename(filepath)[:30]:<30} {reason}")
+    print(f"{'='*80}")
+
+def combine_results(sites, failed):
+    """One results dict for the whole run; errors and parked steps are prefixed with their site"""
+    combined = {name: 0 for name in RESULT_COUNTS}
+    combined.update({'errors': [f"{filepath}: {reason}" for filepath, reason in failed], 'parked': [], 'sites': {}})
+    for site in sites:
+        results = site['results']
+        combined['sites'][site['label']] = results
+        for name in RESULT_COUNTS:
+            combined[name] += results[name]
+        combined['errors'].extend(f"{site['label']}: {error}" for error in results['errors'])
+        combined['parked'].extend(f"{site['label']}: {step}" for step in results['parked'])
+    return combined
+
+def print_combined_summary(api, sites, combined):
+    print(f"\n{'='*80}")
+    print("Multi-Site Import Summary")
+    print(f"{'='*80}")
+    print(f"{'Location':<25} {'Created':<8} {'Resumed':<8} {'Present':<8} {'Failed':<7} {'Errors':<7} {'Parked':<7}")
+    print(f"{'-'*80}")
+    for site in sites:
+        results = site['results']
+        print(f"{site['label'][:25]:<25} {results['workspaces_created']:<8} {results['workspaces_resumed']:<8} "
+              f"{results['workspaces_skipped']:<8} {results['workspaces_failed']:<7} {len(results['errors']):<7} "
+              f"{len(results['parked']):<7}")
+    print(f"{'-'*80}")
+    print(f"{'Total':<25} {combined['workspaces_created']:<8} {combined['workspaces_resumed']:<8} "
+          f"{combined['workspaces_skipped']:<8} {combined['workspaces_failed']:<7} {len(combined['errors']):<7} "
+          f"{len(combined['parked']):<7}")
+    api.print_metrics()
+
+    if combined['errors']:
+        print(f"\nErrors/Warnings:")
+        for error in combined['errors']:
+            print(f"  - {error}")
+
+    if combined['parked']:
+        print(f"\nParked (endpoint circuit open, not attempted):")
+        for step in combined['parked']:
+            print(f"  - {step}")
+    print(f"{'='*80}")
+
+def import_sites(api, filepaths, resume=None, diff_writes=True, dry_run=False, parallel_parse=False, workers=None):
+    """Import several ASO workbooks, one site (location) each, in one run
+
+    Every workbook is validated up front, one after another, so any
+    questions come before the import starts. The sites' missing schedules
+    are then created under one confirmation, one pre-flight covers all
+    their locations, and a single confirmation starts the import. Sites run
+    concurrently through the shared API client, whose adaptive limiter keeps
+    the total within the API's limits; each output line is prefixed with
+    its site. Returns the combined results, with each site's under 'sites',
+    None if the import was cancelled, or VALIDATION_FAILED if no site passed validation.
+
+    resume is True, False or None as for open_run_journal, applied to each
+    site's own journal; a journal path belongs to one workbook and is refused.
+    """
+    from libraries.aso_bulk_import import VALIDATION_FAILED, preflight_rows, run_bulk_import_steps
+    from libraries.reconcile import fetch_org_state
+    from libraries.run_journal import RunJournal, open_run_journal
+    from libraries.schedule_manager import provision_schedules
+
+    if isinstance(resume, str):
+        print("Error: A journal path resumes a single workbook; pass --file with it, or --resume alone")
+        return VALIDATION_FAILED
+
+    sites, failed = validate_sites(api, filepaths, parallel_parse)
+    if not sites:
+        print("\nNo site passed validation.")
+        return VALIDATION_FAILED
+
+    with request_priority('validation'):
+        required = {site['location']['id']: site['schedules'] for site in sites if site['schedules']}
+        if required:
+            print(f"\n{'='*60}")
+            print("Schedule Provisioning")
+            print(f"{'='*60}")
+            provision_schedules(api, required, {site['location']['id']: site['label'] for site in sites})
+
+        state = fetch_org_state(api, [site['location']['id'] for site in sites])
+        if state is None:
+            print("  Warning: Pre-flight check unavailable; every row will be attempted")
+        for site in sites:
+            site['preflight'] = {}
+            if state:
+                print(f"\n{site['label']}:")
+                site['preflight'], _ = preflight_rows(api, site['location'], site['users'], state)
+
+    print_site_preview(sites, failed)
+    if not prompts.confirm("aso.proceed_import", f"\nProceed with import of {len(sites)} site(s)? (Y/n): "):
+        print("Import cancelled.")
+        return None
+
+    answers = {}
+    for key, message in PHASE_PROMPTS:
+        # Creating hunt groups is only asked when they are configured at all
+        if key == "aso.create_hunt_group" and not answers["aso.configure_hunt_groups"]:
+            answers[key] = False
+        else:
+            answers[key] = prompts.confirm(key, message)
+
+    for site in list(sites):
+        site['journal'] = RunJournal(None) if dry_run else open_run_journal("aso_import", site['filepath'], resume)
+        if site['journal'] is None:
+            sites.remove(site)
+            failed.append((site['filepath'], "run journal could not be opened"))
+
+    output = SiteOutput(sys.stdout)
+
+    def import_site(site):
+        token = output.label.set(site['label'])
+        try:
+            return run_bulk_import_steps(api, site['location'], site['filepath'], site['users'], site['journal'],
+                                         site['preflight'], diff_writes, site['workbook'].read_sheet,
+                                         show_metrics=False)
+        except Exception as e:
+            # One site's failure must not stop the others; its journal lets a re-run resume it
+            print(f"Stopped: {e}")
+            return dict({name: 0 for name in RESULT_COUNTS}, errors=[f"Stopped: {e}"], parked=[])
+        finally:
+            site['journal'].close()
+            output.label.reset(token)
+
+    print(f"\nImporting {len(sites)} site(s) concurrently...")
+    sys.stdout = output
+    try:
+        with request_priority('bulk'), prompts.answered(answers):
+            for finished, (site, results) in enumerate(run_concurrently(import_site, sites, workers or ADAPTIVE_WORKERS), 1):
+                site['results'] = results
+                print(f"Site {finished} of {len(sites)} finished: {site['label']} - "
+                      f"{results['workspaces_created']} created, {results['workspaces_failed']} failed, "
+                      f"{len(results['errors'])} error(s)")
+    finally:
+        sys.stdout = output.stream
+
+    combined = combine_results(sites, failed)
+    print_combined_summary(api, sites, combined)
+
+    if dry_run:
+        api.write_plan("aso_import", os.path.dirname(filepaths[0]))
+
+    return combined
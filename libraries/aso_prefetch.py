@@ -0,0 +1,101 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from libraries.priority import submit_with_priority
+
+class PrefetchingAPI:
+    """WebexAPI stand-in that serves GETs started ahead of time and passes everything else through
+
+    Each prefetched result is handed out once; a repeated GET goes to the
+    network so later stages never see stale data.
+    """
+
+    def __init__(self, api, workers=6):
+        self.api = api
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = {}
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+    @staticmethod
+    def _key(endpoint, params):
+        return endpoint, json.dumps(params or {}, sort_keys=True)
+
+    def prefetch(self, endpoint, params=None):
+        """Start a GET in the background"""
+        key = self._key(endpoint, params)
+        if key not in self.pending:
+            self.pending[key] = submit_with_priority(self.executor, self.api.call, "GET", endpoint, None, params)
+
+    def peek(self, endpoint, params=None):
+        """Wait for a GET (starting it if needed) without consuming the prefetched result"""
+        self.prefetch(endpoint, params)
+        return self.pending[self._key(endpoint, params)].result()
+
+    def call(self, method, endpoint, data=None, params=None):
+        future = self.pending.pop(self._key(endpoint, params), None) if method == "GET" else None
+        if future:
+            return future.result()
+        return self.api.call(method, endpoint, data, params)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def find_location_tab(location_name, additional_tabs):
+    """Return the additional tab named after the location (case-insensitive), if any"""
+    for tab in additional_tabs or []:
+        if tab.lower() == location_name.lower():
+            return tab
+    return None
+
+def infer_location_name(users_data):
+    """First non-empty value of the 'Location Name' column in the Webex Users sheet"""
+    if not users_data:
+        return None
+
+    location_col_idx = next((idx for idx, header in enumerate(users_data[0])
+                             if header and 'Location Name' in str(header)), None)
+    if location_col_idx is None:
+        return None
+
+    for row in users_data[1:]:
+        if len(row) > location_col_idx and row[location_col_idx]:
+            return str(row[location_col_idx]).strip()
+    return None
+
+def prefetch_location_reads(prefetch_api, filepath, read_excel_sheet, additional_tabs):
+    """Start every read-only GET the validation chain needs once the location is known
+
+    Uses only local sheet data to find the location, so the GETs run while
+    the operator reads the location check and the Webex Users sheet is validated.
+    """
+    api = prefetch_api
+    location_name = infer_location_name(read_excel_sheet(filepath, 'Webex Users'))
+    if not location_name:
+        return
+
+    locations_result = api.peek("telephony/config/locations", {"orgId": api.org_id})
+    if "error" in locations_result:
+        return
+
+    location = next((loc for loc in locations_result.get("locations", [])
+                     if loc.get('name', '').lower() == location_name.lower()), None)
+    if not location:
+        return
+
+    location_id = location['id']
+    api.prefetch(f"telephony/config/locations/{location_id}/outgoingPermission", {"orgId": api.org_id})
+    api.prefetch(f"telephony/config/locations/{location_id}/availableNumbers", {"orgId": api.org_id})
+    api.prefetch("telephony/config/callParkExtensions", {"orgId": api.org_id, "locationId": location_id})
+    api.prefetch(f"telephony/config/locations/{location_id}/schedules", {"orgId": api.org_id})
+
+    location_tab = find_location_tab(location['name'], additional_tabs)
+    location_sheet = read_excel_sheet(filepath, location_tab) if location_tab else None
+    if location_sheet and len(location_sheet) >= 65 and len(location_sheet[62]) > 1 and location_sheet[62][1]:
+        matching_pattern = str(location_sheet[62][1]).strip()
+        api.prefetch("telephony/config/callRouting/translationPatterns",
+                     {"orgId": api.org_id, "matchingPattern": matching_pattern})
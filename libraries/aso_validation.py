@@ -2,12 +2,15 @@
 # Licensed under the MIT License - see LICENSE file for details
 
 import re
+from libraries import prompts
+from libraries.validation_cache import ROW_PLACEHOLDER, RowValidationCache
+from libraries.webex_users import WebexUserRow, column_index, parse_webex_users
+
+# Webex Users columns that may be left empty (A, B, D, F, G, I, N-S)
+WEBEX_USERS_OPTIONAL_COLUMNS = {0, 1, 3, 5, 6, 8, 13, 14, 15, 16, 17, 18}
 
 def validate_excel_file(filepath):
     """Validate Excel file structure and required tabs"""
-    import openpyxl
-    import xlrd
-    
     print(f"\nValidating Excel file: {filepath}")
     print(f"{'='*60}")
     
@@ -15,10 +18,12 @@ def validate_excel_file(filepath):
     
     try:
         if filepath.endswith('.xlsx'):
+            import openpyxl
             wb = openpyxl.load_workbook(filepath, read_only=True)
             sheet_names = wb.sheetnames
             wb.close()
         elif filepath.endswith('.xls'):
+            import xlrd
             wb = xlrd.open_workbook(filepath)
             sheet_names = wb.sheet_names()
         else:
@@ -163,8 +168,8 @@ def validate_location(api, filepath, read_excel_sheet):
         print(f"\n  Status: WARNING - Location permissions do not match expected configuration")
         print(f"  Mismatched call types: {', '.join(mismatches)}")
         
-        modify = input("\n  Modify location outgoing permissions to default? (y/n): ").strip().lower()
-        if modify == 'y':
+        if prompts.confirm("aso.modify_location_permissions",
+                           "\n  Modify location outgoing permissions to default? (y/n): ", default=False):
             print(f"  Updating location outgoing permissions...")
             
             update_data = {
@@ -199,8 +204,71 @@ def validate_location(api, filepath, read_excel_sheet):
         'callingLineId': phone_number
     }
 
+def check_webex_user_row(row, user, headers):
+    """Check one Webex Users row, returning (errors, unique keys)
+
+    row is the raw cells (required columns are checked by position) and
+    user its WebexUserRow. Errors use ROW_PLACEHOLDER for the row number so
+    the result can be cached and reused when the row moves.
+    """
+    row_idx = ROW_PLACEHOLDER
+    for col_idx in range(min(19, len(headers))):
+        if col_idx not in WEBEX_USERS_OPTIONAL_COLUMNS:
+            if col_idx >= len(row) or not row[col_idx] or str(row[col_idx]).strip() == '':
+                col_name = str(headers[col_idx]).replace('\n', ' ').replace('\r', ' ') if col_idx < len(headers) else f"Column {chr(65 + col_idx)}"
+                return [f"Row {row_idx}: Missing required value in '{col_name}'"], {}
+    
+    if not user.mac_address:
+        return [f"Row {row_idx}: Missing MAC address"], {}
+    
+    if not re.match(r'^[0-9A-F]{12}$', user.mac):
+        return [f"Row {row_idx}: Invalid MAC address format: '{user.mac_address}'"], {}
+    
+    if not user.user_type:
+        return [f"Row {row_idx}: Missing user type"], {}
+    
+    if user.user_type not in ['non-user', 'user']:
+        return [f"Row {row_idx}: User type must be 'non-user' or 'user', got '{user.user_type}'"], {}
+    
+    if user.extension:
+        try:
+            float(user.extension)
+        except ValueError:
+            return [f"Row {row_idx}: Extension must be numeric, got '{user.extension}'"], {}
+    
+    if user.phone_number:
+        if not user.phone_number.isdigit() or len(user.phone_number) != 10:
+            return [f"Row {row_idx}: Phone number must be 10 digits, got '{user.phone_number}'"], {}
+    
+    if user.rings:
+        try:
+            if float(user.rings) > 15:
+                return [f"Row {row_idx}: Rings must be <= 15, got '{user.rings}'"], {}
+        except ValueError:
+            return [f"Row {row_idx}: Rings must be numeric, got '{user.rings}'"], {}
+    
+    for col_idx, col_letter in [(15, 'P'), (17, 'R')]:
+        if len(row) > col_idx and row[col_idx] and str(row[col_idx]).strip() != '':
+            col_value = str(row[col_idx]).strip().lower()
+            if col_value not in ['yes', 'no']:
+                return [f"Row {row_idx}: Column {col_letter} must be 'yes', 'no', or empty"], {}
+    
+    for value, col_letter in [(user.forward_no_answer, 'N'), (user.forward_disconnect, 'Q')]:
+        if value:
+            try:
+                float(value)
+            except ValueError:
+                return [f"Row {row_idx}: Column {col_letter} must be numeric"], {}
+    
+    return [], {'mac': user.mac, 'extension': user.extension}
+
 def validate_webex_users_data(filepath, read_excel_sheet):
-    """Validation 4: Validate Webex Users sheet data"""
+    """Validation 4: Validate Webex Users sheet data
+    
+    Row results are cached by row content, so only rows changed since the
+    last run are checked again; duplicate MACs and extensions are found
+    from the cached per-row keys.
+    """
     print(f"\nValidation 4: Validating Webex Users data...")
     
     users_data = read_excel_sheet(filepath, 'Webex Users')
@@ -210,82 +278,32 @@ def validate_webex_users_data(filepath, read_excel_sheet):
     
     headers = users_data[0]
     data_rows = users_data[1:]
-    optional_cols = [0, 1, 3, 5, 6, 8, 13, 14, 15, 16, 17, 18]
-    mac_addresses = []
+    columns = column_index(headers)
+    cache = RowValidationCache('webex_users', filepath, list(headers))
     
     for row_idx, row in enumerate(data_rows, start=2):
-        for col_idx in range(min(19, len(headers))):
-            if col_idx not in optional_cols:
-                if col_idx >= len(row) or not row[col_idx] or str(row[col_idx]).strip() == '':
-                    col_name = str(headers[col_idx]).replace('\n', ' ').replace('\r', ' ') if col_idx < len(headers) else f"Column {chr(65 + col_idx)}"
-                    print(f"  Status: FAILED - Row {row_idx}: Missing required value in '{col_name}'")
-                    return False
-        
-        if len(row) <= 11 or not row[11] or str(row[11]).strip() == '':
-            print(f"  Status: FAILED - Row {row_idx}: Missing MAC address")
+        errors = cache.check(row_idx, list(row),
+                             lambda: check_webex_user_row(row, WebexUserRow(row_idx, row, columns), headers))
+        if errors:
+            cache.save(complete=False)
+            print(f"  Status: FAILED - {errors[0]}")
             return False
-        
-        mac_raw = str(row[11]).strip()
-        mac_clean = re.sub(r'[-:\s]', '', mac_raw).upper()
-        if not re.match(r'^[0-9A-F]{12}$', mac_clean):
-            print(f"  Status: FAILED - Row {row_idx}: Invalid MAC address format: '{mac_raw}'")
-            return False
-        
-        mac_addresses.append(mac_clean)
-        
-        if len(row) <= 9 or not row[9]:
-            print(f"  Status: FAILED - Row {row_idx}: Missing user type")
-            return False
-        
-        col_j_value = str(row[9]).strip().lower()
-        if col_j_value not in ['non-user', 'user']:
-            print(f"  Status: FAILED - Row {row_idx}: User type must be 'non-user' or 'user', got '{row[9]}'")
-            return False
-        
-        if len(row) > 4 and row[4] and str(row[4]).strip() != '':
-            try:
-                float(row[4])
-            except ValueError:
-                print(f"  Status: FAILED - Row {row_idx}: Extension must be numeric, got '{row[4]}'")
-                return False
-        
-        if len(row) > 3 and row[3] and str(row[3]).strip() != '':
-            col_d_value = str(row[3]).strip()
-            if not col_d_value.isdigit() or len(col_d_value) != 10:
-                print(f"  Status: FAILED - Row {row_idx}: Phone number must be 10 digits, got '{row[3]}'")
-                return False
-        
-        if len(row) > 14 and row[14] and str(row[14]).strip() != '':
-            try:
-                col_o_value = float(row[14])
-                if col_o_value > 15:
-                    print(f"  Status: FAILED - Row {row_idx}: Rings must be <= 15, got '{row[14]}'")
-                    return False
-            except ValueError:
-                print(f"  Status: FAILED - Row {row_idx}: Rings must be numeric, got '{row[14]}'")
-                return False
-        
-        for col_idx, col_letter in [(15, 'P'), (17, 'R')]:
-            if len(row) > col_idx and row[col_idx] and str(row[col_idx]).strip() != '':
-                col_value = str(row[col_idx]).strip().lower()
-                if col_value not in ['yes', 'no']:
-                    print(f"  Status: FAILED - Row {row_idx}: Column {col_letter} must be 'yes', 'no', or empty")
-                    return False
-        
-        for col_idx, col_letter in [(13, 'N'), (16, 'Q')]:
-            if len(row) > col_idx and row[col_idx] and str(row[col_idx]).strip() != '':
-                try:
-                    float(row[col_idx])
-                except ValueError:
-                    print(f"  Status: FAILED - Row {row_idx}: Column {col_letter} must be numeric")
-                    return False
-    
-    if len(mac_addresses) != len(set(mac_addresses)):
-        duplicates = [mac for mac in set(mac_addresses) if mac_addresses.count(mac) > 1]
-        print(f"  Status: FAILED - Duplicate MAC addresses found: {', '.join(duplicates)}")
+    
+    cache.finish(len(data_rows) + 2)
+    cache.save()
+    
+    duplicate_macs = cache.duplicates.duplicates('mac')
+    if duplicate_macs:
+        print(f"  Status: FAILED - Duplicate MAC addresses found: {', '.join(mac for mac, rows in duplicate_macs)}")
+        return False
+    
+    duplicate_extensions = cache.duplicates.duplicates('extension')
+    if duplicate_extensions:
+        details = ', '.join(f"{extension} (rows {', '.join(map(str, rows))})" for extension, rows in duplicate_extensions)
+        print(f"  Status: FAILED - Duplicate extensions found: {details}")
         return False
     
-    print(f"  Status: PASS - All {len(data_rows)} rows validated successfully")
+    print(f"  Status: PASS - All {len(data_rows)} rows validated successfully ({cache.summary()})")
     return True
 
 def validate_available_numbers(api, location_data, filepath, read_excel_sheet):
@@ -302,13 +320,13 @@ def validate_available_numbers(api, location_data, filepath, read_excel_sheet):
         return False
     
     phone_numbers = numbers_result.get("phoneNumbers", [])
-    available_location_numbers = []
+    available_location_numbers = set()
     
     for num in phone_numbers:
         if (not num.get('owner') and 
             not num.get('isMainNumber', False) and 
             num.get('state') == 'ACTIVE'):
-            available_location_numbers.append(num['phoneNumber'])
+            available_location_numbers.add(num['phoneNumber'])
     
     print(f"  Found {len(available_location_numbers)} available numbers")
     
@@ -317,16 +335,12 @@ def validate_available_numbers(api, location_data, filepath, read_excel_sheet):
         print(f"  Status: FAILED - Could not read 'Webex Users' sheet")
         return False
     
-    headers = users_data[0]
-    data_rows = users_data[1:]
-    
-    for row_idx, row in enumerate(data_rows, start=2):
-        if len(row) > 3 and row[3] and str(row[3]).strip() != '':
-            phone_10digit = str(row[3]).strip()
-            phone_e164 = f"+1{phone_10digit}"
+    for user in parse_webex_users(users_data):
+        if user.phone_number:
+            phone_e164 = f"+1{user.phone_number}"
             
             if phone_e164 not in available_location_numbers:
-                print(f"  Status: FAILED - Row {row_idx}: Phone number '{phone_10digit}' is not available")
+                print(f"  Status: FAILED - Row {user.row_num}: Phone number '{user.phone_number}' is not available")
                 print(f"  The number {phone_e164} is not found in available PSTN numbers for this location.")
                 return False
     
@@ -351,7 +365,7 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
     if not location_tab:
         print(f"  Status: FAILED - Location tab '{location_name}' not found in additional tabs")
         print(f"  Available tabs: {', '.join(additional_tabs)}")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     print(f"  Found location tab: {location_tab}")
@@ -360,7 +374,7 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
     location_data_sheet = read_excel_sheet(filepath, location_tab)
     if not location_data_sheet or len(location_data_sheet) < 65:
         print(f"  Status: FAILED - Could not read location tab or insufficient rows")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Extract translation pattern data from B62, B63, B64 (column index 1, rows 61-63)
@@ -374,7 +388,7 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
         print(f"    B63 (Matching Pattern): {'[MISSING]' if not matching_pattern else matching_pattern}")
         print(f"    B64 (Replacement Pattern): {'[MISSING]' if not replacement_pattern else replacement_pattern}")
         print(f"  Please fix the translation pattern data in Excel tab '{location_tab}'")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Display translation pattern table
@@ -392,7 +406,7 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
     
     if "error" in result:
         print(f"  Status: FAILED - Error fetching translation patterns: {result['error']}")
-        input("  Press Enter to continue...")
+        prompts.acknowledge("  Press Enter to continue...")
         return {}
     
     translation_patterns = result.get('translationPatterns', [])
@@ -404,23 +418,21 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
             print(f"  Status: PASS - Translation pattern exists")
             print(f"  Pattern ID: {found_pattern.get('id')}")
             print(f"  Pattern Name: {found_pattern.get('name')}")
-            input("\n  Press Enter to proceed to next step...")
+            prompts.acknowledge("\n  Press Enter to proceed to next step...")
             return {'id': found_pattern.get('id'), 'name': found_pattern.get('name')}
         else:
             print(f"  Status: WARNING - Translation pattern found but matching pattern differs")
             print(f"  Expected: {matching_pattern}")
             print(f"  Found: {found_pattern.get('matchingPattern')}")
-            input("  Press Enter to acknowledge and continue...")
+            prompts.acknowledge("  Press Enter to acknowledge and continue...")
             return {}
     
     # Translation pattern does not exist, ask to create
     print(f"  Status: NOT FOUND - Translation pattern does not exist")
-    create = input("  Create translation pattern? (Y/n): ").strip().lower()
-    
-    if create not in ['', 'y', 'yes']:
+    if not prompts.confirm("aso.create_translation_pattern", "  Create translation pattern? (Y/n): "):
         print("\n  Translation pattern creation skipped.")
         print("  Please manually create the translation pattern in Control Hub.")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Clean up replacement pattern (remove dashes, spaces, keep only digits)
@@ -429,10 +441,10 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
         print(f"  Status: WARNING - Replacement pattern should be 10 digits, got {len(replacement_clean)} digits")
         print(f"  Original: {replacement_pattern}")
         print(f"  Cleaned: {replacement_clean}")
-        proceed = input("  Proceed with cleaned value? (y/n): ").strip().lower()
-        if proceed != 'y':
+        if not prompts.confirm("aso.use_cleaned_replacement_pattern",
+                               "  Proceed with cleaned value? (y/n): ", default=False):
             print("  Translation pattern creation cancelled.")
-            input("  Press Enter to continue...")
+            prompts.acknowledge("  Press Enter to continue...")
             return {}
     
     # Create translation pattern
@@ -449,7 +461,7 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
     if "error" in create_result:
         print(f"  Status: FAILED - Error creating translation pattern: {create_result['error']}")
         print(f"  Please manually create the translation pattern in Control Hub.")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     pattern_id = create_result.get('id')
@@ -457,7 +469,7 @@ def validate_translation_pattern(api, location_data, filepath, read_excel_sheet,
     print(f"  Pattern ID: {pattern_id}")
     print(f"  Pattern Name: {translation_name}")
     
-    input("\n  Press Enter to proceed to next step...")
+    prompts.acknowledge("\n  Press Enter to proceed to next step...")
     return {'id': pattern_id, 'name': translation_name}
 
 def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet, additional_tabs):
@@ -477,14 +489,14 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
     
     if not location_tab:
         print(f"  Status: FAILED - Location tab '{location_name}' not found")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Read location tab
     location_data_sheet = read_excel_sheet(filepath, location_tab)
     if not location_data_sheet or len(location_data_sheet) < 46:
         print(f"  Status: FAILED - Could not read location tab or insufficient rows")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Extract call park data from B44, B45, C45 (column indices 1, 1, 2, rows 43, 44, 44)
@@ -497,13 +509,13 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
         print(f"    B44 (Location): {'[MISSING]' if not park_location else park_location}")
         print(f"    B45: {'[MISSING]' if not park_name_b45 else park_name_b45}")
         print(f"    C45: {'[MISSING]' if not park_name_c45 else park_name_c45}")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Verify location matches
     if park_location.lower() != location_name.lower():
         print(f"  Status: WARNING - Call park location '{park_location}' does not match inferred location '{location_name}'")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     # Combine B45 and C45 to get full range
@@ -516,7 +528,7 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
     if not match:
         print(f"  Status: FAILED - Could not parse call park range format")
         print(f"  Expected format: '<Location> Park <ext#> thru <Location> Park <ext#>'")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     start_ext = int(match.group(1))
@@ -543,7 +555,7 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
     if "error" in result:
         print(f"  Status: FAILED - Error fetching call park extensions: {result['error']}")
         print(f"  Please manually check call park extensions in Control Hub.")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {}
     
     existing_parks = result.get('callParkExtensions', [])
@@ -562,7 +574,7 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
     
     if not to_create:
         print(f"\n  Status: PASS - All required call park extensions already exist")
-        input("  Press Enter to proceed to next step...")
+        prompts.acknowledge("  Press Enter to proceed to next step...")
         return {'created': 0}
     
     # Display table of call park extensions to create
@@ -572,12 +584,11 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
     for park in to_create:
         print(f"  {park['name']:<30} {park['extension']:<10}")
     
-    create = input(f"\n  Create {len(to_create)} call park extension(s)? (Y/n): ").strip().lower()
-    
-    if create not in ['', 'y', 'yes']:
+    if not prompts.confirm("aso.create_call_parks",
+                           f"\n  Create {len(to_create)} call park extension(s)? (Y/n): "):
         print("\n  Call park extension creation skipped.")
         print("  Please manually create these call park extensions in Control Hub.")
-        input("  Press Enter to acknowledge and continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
         return {'created': 0}
     
     # Create call park extensions
@@ -611,5 +622,5 @@ def validate_call_park_extensions(api, location_data, filepath, read_excel_sheet
         print(f"  Some call park extensions failed to create.")
         print(f"  Please manually check Control Hub.")
     
-    proceed = input("\n  Press Enter to proceed to next step...")
+    prompts.acknowledge("\n  Press Enter to proceed to next step...")
     return {'created': created_count, 'ids': created_ids}
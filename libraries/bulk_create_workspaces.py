@@ -4,49 +4,78 @@
 import csv
 import os
 import re
+from libraries import prompts
 from libraries.add_device import PHONE_MODELS, COLLAB_MODELS
+from libraries.circuit_breaker import is_circuit_open
+from libraries.priority import request_priority
+from libraries.concurrency import ADAPTIVE_WORKERS, run_concurrently
+from libraries.dry_run import DryRunAPI
+from libraries.execution_plan import default_plan_path, save_plan, verify_org_state
+from libraries.run_journal import RunJournal, open_run_journal, row_key
+from libraries.run_report import RunReport, default_report_path
+from libraries.reconcile import fetch_org_state, classify_row, device_missing, print_reconciliation
+from libraries.validation_cache import ROW_PLACEHOLDER, RowValidationCache
 
-def validate_csv_structure(filepath):
-    """Validate CSV file structure and format"""
-    if not os.path.exists(filepath):
-        return False, f"File not found: {filepath}"
+EXPECTED_HEADERS = ['id', 'location', 'displayName', 'supportedDevices', 'type',
+                    'capacity', 'calling', 'extension', 'phoneNumber', 'phoneModel', 'macaddress']
+
+def read_csv_header(reader):
+    """Read and check the header row from a csv.reader, returning the field names"""
+    fieldnames = next(reader, None)
+    if not fieldnames or not any(name.strip() for name in fieldnames):
+        raise ValueError("CSV file is empty")
     
-    try:
-        with open(filepath, 'r') as f:
-            # Check if file is empty
-            content = f.read()
-            if not content.strip():
-                return False, "CSV file is empty"
-            
-            # Reset file pointer
-            f.seek(0)
-            
-            # Try to parse as CSV
-            reader = csv.DictReader(f)
-            
-            # Validate headers
-            expected_headers = ['id', 'location', 'displayName', 'supportedDevices', 'type', 
-                              'capacity', 'calling', 'extension', 'phoneNumber', 'phoneModel', 'macaddress']
-            
-            if not reader.fieldnames:
-                return False, "CSV file has no headers"
-            
-            missing_headers = set(expected_headers) - set(reader.fieldnames)
-            if missing_headers:
-                return False, f"Missing required columns: {', '.join(missing_headers)}"
-            
-            # Validate each row has correct number of fields
-            f.seek(0)
-            next(f)  # Skip header
-            for i, line in enumerate(f, start=2):
-                field_count = len(line.split(','))
-                if field_count != len(expected_headers):
-                    return False, f"Row {i}: Invalid number of fields (expected {len(expected_headers)}, got {field_count})"
-        
-        return True, "CSV structure is valid"
+    missing_headers = [header for header in EXPECTED_HEADERS if header not in fieldnames]
+    if missing_headers:
+        raise ValueError(f"Missing required columns: {', '.join(missing_headers)}")
+    return fieldnames
+
+def read_csv_rows(reader, fieldnames):
+    """Check each row's structure while streaming rows from a csv.reader
     
-    except Exception as e:
-        return False, f"Error reading CSV: {str(e)}"
+    Yields (row number, cells, row dict) one row at a time, so memory does
+    not grow with the file. Raises ValueError when a row has the wrong
+    number of fields. Blank lines are skipped and not numbered, as
+    csv.DictReader does.
+    """
+    row_num = 1
+    for cells in reader:
+        if not cells:
+            continue
+        row_num += 1
+        # Quoted fields may contain commas, so fields are counted after parsing
+        if len(cells) != len(EXPECTED_HEADERS):
+            raise ValueError(f"Row {row_num}: Invalid number of fields (expected {len(EXPECTED_HEADERS)}, got {len(cells)})")
+        yield row_num, cells, dict(zip(fieldnames, cells))
+
+def workspace_supported_devices(row):
+    return row.get('supportedDevices', '').strip().lower() or 'collaborationdevices'
+
+def workspace_calling(row):
+    return row.get('calling', '').strip().lower() or 'none'
+
+def workspace_unique_keys(row):
+    """Keys of a valid row that must not repeat in the file: device MAC and extension per location"""
+    if workspace_calling(row) != 'webexcalling':
+        return {}
+    location = row.get('location', '').strip()
+    extension = row.get('extension', '').strip()
+    mac_address = ''.join(c for c in row.get('macaddress', '') if c.isalnum()).upper()
+    return {
+        'macaddress': mac_address,
+        'extension': f"{location}/{extension}" if extension else ''
+    }
+
+def duplicate_row_errors(duplicates):
+    """Errors for rows sharing a MAC address or an extension in the same location"""
+    errors = []
+    for mac_address, rows in duplicates.duplicates('macaddress'):
+        errors.append(f"Rows {', '.join(map(str, rows))}: macaddress '{mac_address}' is used more than once")
+    for key, rows in duplicates.duplicates('extension'):
+        location, extension = key.rsplit('/', 1)
+        where = f" in location '{location}'" if location else ""
+        errors.append(f"Rows {', '.join(map(str, rows))}: extension '{extension}' is used more than once{where}")
+    return errors
 
 def validate_workspace_data(row, row_num, available_locations):
     """Validate individual workspace row data"""
@@ -57,17 +86,13 @@ def validate_workspace_data(row, row_num, available_locations):
         errors.append(f"Row {row_num}: displayName is mandatory")
     
     # Validate supportedDevices
-    supported_devices = row.get('supportedDevices', '').strip().lower()
-    if not supported_devices:
-        supported_devices = 'collaborationdevices'
-    elif supported_devices not in ['phones', 'collaborationdevices']:
+    supported_devices = workspace_supported_devices(row)
+    if supported_devices not in ['phones', 'collaborationdevices']:
         errors.append(f"Row {row_num}: supportedDevices must be 'phones' or 'collaborationDevices', got '{row.get('supportedDevices')}'")
     
     # Validate calling
-    calling = row.get('calling', '').strip().lower()
-    if not calling:
-        calling = 'none'
-    elif calling not in ['none', 'webexcalling']:
+    calling = workspace_calling(row)
+    if calling not in ['none', 'webexcalling']:
         errors.append(f"Row {row_num}: calling must be 'none' or 'webexCalling', got '{row.get('calling')}'")
     
     # Validate extension if webexCalling
@@ -112,17 +137,81 @@ def validate_workspace_data(row, row_num, available_locations):
     
     return errors, supported_devices, calling
 
-def parse_workspaces_csv(api):
-    """Parse and validate workspaces.csv file"""
-    filepath = "bulk/workspaces.csv"
-    
-    # Validate CSV structure
-    is_valid, message = validate_csv_structure(filepath)
-    if not is_valid:
-        print(f"CSV Validation Error: {message}")
-        return None
+# Results tables longer than this are left to the report file
+SUMMARY_TABLE_ROWS = 500
+
+# Returned instead of counts when nothing was run for these reasons; None means the operator cancelled
+VALIDATION_FAILED = 'validation_failed'
+NO_VALID_ROWS = 'no_valid_rows'
+
+def workspace_record(row_num, row):
+    """Validated workspace data for a CSV row"""
+    return {
+        'row_num': row_num,
+        'displayName': row['displayName'].strip(),
+        'supportedDevices': workspace_supported_devices(row),
+        'type': row.get('type', '').strip() or 'notSet',
+        'capacity': row.get('capacity', '').strip(),
+        'calling': workspace_calling(row),
+        'location': row.get('location', '').strip(),
+        'extension': row.get('extension', '').strip(),
+        'phoneNumber': row.get('phoneNumber', '').strip(),
+        'phoneModel': row.get('phoneModel', '').strip(),
+        'macaddress': row.get('macaddress', '').strip()
+    }
+
+def file_signature(filepath):
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
+
+class ValidatedWorkspaces:
+    """The rows of a validated workspaces.csv, read again from the file each time they are iterated
     
-    print("CSV structure validated successfully.")
+    Only the row count, the locations of calling rows ('' for a row without
+    one) and the pre-flight outcome of rows that are not plain creates are
+    held, so memory does not grow with the file.
+    """
+    
+    def __init__(self, filepath, count, calling_locations):
+        self.filepath = filepath
+        self.count = count
+        self.calling_locations = calling_locations
+        self.signature = file_signature(filepath)
+        # Row number -> pre-flight fields for rows that will not simply be created
+        self.preflight = {}
+    
+    def __len__(self):
+        return self.count
+    
+    def missing_location(self):
+        """True if a webexCalling row has no location"""
+        return '' in self.calling_locations
+    
+    def __iter__(self):
+        with open(self.filepath, 'r', newline='') as f:
+            reader = csv.reader(f)
+            for row_num, _, row in read_csv_rows(reader, read_csv_header(reader)):
+                ws = workspace_record(row_num, row)
+                ws.update(self.preflight.get(row_num, {}))
+                yield ws
+    
+    def unchanged(self):
+        """True if the file is still the one that was validated"""
+        try:
+            return file_signature(self.filepath) == self.signature
+        except OSError:
+            return False
+
+def parse_workspaces_csv(api, filepath="bulk/workspaces.csv"):
+    """Parse and validate workspaces.csv file
+    
+    Structure checks and row validation happen in one streaming pass over
+    the file. Returns (ValidatedWorkspaces, available locations), or None
+    if the file is not valid.
+    """
+    if not os.path.exists(filepath):
+        print(f"CSV Validation Error: File not found: {filepath}")
+        return None
     
     # Get available locations
     locations_result = api.call("GET", "locations", params={"orgId": api.org_id})
@@ -131,34 +220,46 @@ def parse_workspaces_csv(api):
         return None
     
     available_locations = locations_result.get("items", [])
+    location_names = sorted(loc['name'] for loc in available_locations)
     
-    # Parse and validate each row
-    workspaces = []
+    # Validate each row, keeping only what later stages need
+    valid_count = 0
+    calling_locations = set()
     all_errors = []
     
-    with open(filepath, 'r') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader, start=2):
-            errors, supported_devices, calling = validate_workspace_data(row, i, available_locations)
-            
-            if errors:
-                all_errors.extend(errors)
-            else:
-                # Store validated workspace data
-                workspace_data = {
-                    'row_num': i,
-                    'displayName': row['displayName'].strip(),
-                    'supportedDevices': supported_devices,
-                    'type': row.get('type', '').strip() or 'notSet',
-                    'capacity': row.get('capacity', '').strip(),
-                    'calling': calling,
-                    'location': row.get('location', '').strip(),
-                    'extension': row.get('extension', '').strip(),
-                    'phoneNumber': row.get('phoneNumber', '').strip(),
-                    'phoneModel': row.get('phoneModel', '').strip(),
-                    'macaddress': row.get('macaddress', '').strip()
-                }
-                workspaces.append(workspace_data)
+    def check_row(row):
+        errors = validate_workspace_data(row, ROW_PLACEHOLDER, available_locations)[0]
+        return errors, {} if errors else workspace_unique_keys(row)
+    
+    row_end = 2
+    try:
+        with open(filepath, 'r', newline='') as f:
+            reader = csv.reader(f)
+            fieldnames = read_csv_header(reader)
+            # Cached row results stay valid while the headers and location names are unchanged
+            cache = RowValidationCache('workspaces_csv', filepath, [fieldnames, location_names])
+            for i, cells, row in read_csv_rows(reader, fieldnames):
+                row_end = i + 1
+                errors = cache.check(i, cells, lambda: check_row(row))
+                
+                if errors:
+                    all_errors.extend(errors)
+                else:
+                    valid_count += 1
+                    if workspace_calling(row) == 'webexcalling':
+                        calling_locations.add(row.get('location', '').strip())
+    except ValueError as e:
+        print(f"CSV Validation Error: {e}")
+        return None
+    except Exception as e:
+        print(f"CSV Validation Error: Error reading CSV: {str(e)}")
+        return None
+    
+    print("CSV structure validated successfully.")
+    cache.finish(row_end)
+    all_errors.extend(duplicate_row_errors(cache.duplicates))
+    cache.save()
+    print(f"Rows validated: {cache.summary()}")
     
     if all_errors:
         print("\nValidation Errors Found:")
@@ -167,13 +268,48 @@ def parse_workspaces_csv(api):
         print("\nPlease fix the errors in the CSV file before proceeding.")
         return None
     
-    return workspaces, available_locations
+    return ValidatedWorkspaces(filepath, valid_count, calling_locations), available_locations
+
+def preflight_workspaces(api, workspaces, available_locations):
+    """Classify each row as create, skip or conflict against existing org state before any write
+    
+    Rows that will not simply be created have their pre-flight outcome
+    stored on the ValidatedWorkspaces. Returns (counts per action, org
+    state), or (None, None) if the state could not be fetched.
+    """
+    location_ids = {loc['name']: loc['id'] for loc in available_locations}
+    calling_location_ids = [location_ids[name] for name in sorted(workspaces.calling_locations) if name in location_ids]
+    
+    state = fetch_org_state(api, calling_location_ids)
+    if state is None:
+        print("  Warning: Pre-flight check unavailable; every row will be attempted")
+        return None, None
+    
+    def classify():
+        for ws in workspaces:
+            calling = ws['calling'] == 'webexcalling'
+            action, existing_id, reasons = classify_row(
+                state, ws['displayName'], location_ids.get(ws['location']),
+                ws['extension'] if calling else '', ws['phoneNumber'] if calling else '',
+                ws['macaddress'] if calling else '', ws['type'], ws['supportedDevices']
+            )
+            if action != 'create':
+                workspaces.preflight[ws['row_num']] = {
+                    'action': action,
+                    'existing_id': existing_id,
+                    'conflicts': reasons,
+                    'needs_device': (action == 'skip' and calling and bool(ws['phoneModel'])
+                                     and device_missing(state, existing_id, ws['macaddress']))
+                }
+            yield ws['row_num'], ws['displayName'], action, reasons
+    
+    return print_reconciliation(classify()), state
 
 def display_workspace_summary(workspaces):
     """Display summary table of workspaces to be created"""
-    print(f"\n{'='*160}")
-    print(f"{'Row':<5} {'Location':<25} {'Display Name':<25} {'Devices':<25} {'Calling':<15} {'Extension':<10} {'Phone':<12} {'Model':<20} {'MAC':<20}")
-    print(f"{'='*160}")
+    print(f"\n{'='*170}")
+    print(f"{'Row':<5} {'Action':<9} {'Location':<25} {'Display Name':<25} {'Devices':<25} {'Calling':<15} {'Extension':<10} {'Phone':<12} {'Model':<20} {'MAC':<20}")
+    print(f"{'='*170}")
     
     for ws in workspaces:
         calling_display = ws['calling'] if ws['calling'] != 'none' else 'None'
@@ -182,166 +318,377 @@ def display_workspace_summary(workspaces):
         model_display = ws['phoneModel'] if ws['phoneModel'] else '-'
         mac_display = ws['macaddress'] if ws['macaddress'] else '-'
 
-        print(f"{ws['row_num'] - 1:<5} {ws['location']:<25} {ws['displayName']:<25} {ws['supportedDevices']:<25} {calling_display:<15} {extension_display:<10} {phone_display:<12} {model_display:<20} {mac_display:<20}")
+        print(f"{ws['row_num'] - 1:<5} {ws.get('action', 'create'):<9} {ws['location']:<25} {ws['displayName']:<25} {ws['supportedDevices']:<25} {calling_display:<15} {extension_display:<10} {phone_display:<12} {model_display:<20} {mac_display:<20}")
     
-    print(f"{'='*160}")
+    print(f"{'='*170}")
 
-def execute_bulk_create(api, workspaces, available_locations):
-    """Execute bulk workspace creation"""
-    print(f"\nStarting bulk creation of {len(workspaces)} workspace(s)...")
+def resolve_missing_location(available_locations):
+    """Ask once for the location of webexCalling rows without one, returning (location ID, error)"""
+    if prompts.is_headless():
+        location_name = prompts.ask("bulk_create.location", "Location for rows without one")
+        location = next((loc for loc in available_locations if loc['name'] == location_name), None)
+        if location:
+            return location['id'], None
+        print(f"Error: Location '{location_name}' not found; rows without a location will fail")
+        return None, 'Location not found'
     
-    results = []
+    # Ask user for location
+    print("\nSome webexCalling rows have no location.")
+    print("  Available Locations:")
+    for i, loc in enumerate(available_locations, 1):
+        print(f"  {i}. {loc.get('name', 'N/A')}")
     
-    for ws in workspaces:
-        print(f"\nCreating workspace: {ws['displayName']} (Row {ws['row_num']})")
-        
-        # Prepare workspace data
-        data = {
-            "displayName": ws['displayName'],
-            "orgId": api.org_id,
-            "type": ws['type'],
-            "supportedDevices": ws['supportedDevices']
-        }
-        
-        if ws['capacity']:
-            data['capacity'] = int(ws['capacity'])
-        
-        # Handle location and calling
-        if ws['calling'] == 'webexcalling':
-            # Get location ID
-            if ws['location']:
-                location = next((loc for loc in available_locations if loc['name'] == ws['location']), None)
-                if location:
-                    location_id = location['id']
-                else:
-                    print(f"  Error: Location '{ws['location']}' not found")
-                    results.append({'row': ws['row_num'], 'name': ws['displayName'], 'status': 'failed', 'error': 'Location not found'})
-                    continue
-            else:
-                # Ask user for location
-                print("\n  Available Locations:")
-                for i, loc in enumerate(available_locations, 1):
-                    print(f"  {i}. {loc.get('name', 'N/A')}")
-                
-                loc_choice = input("  Select location number: ").strip()
-                try:
-                    location_id = available_locations[int(loc_choice) - 1]["id"]
-                except (ValueError, IndexError):
-                    print("  Invalid selection. Skipping workspace.")
-                    results.append({'row': ws['row_num'], 'name': ws['displayName'], 'status': 'failed', 'error': 'Invalid location selection'})
-                    continue
-            
-            data['locationId'] = location_id
-            data['calling'] = {
-                "type": "webexCalling",
-                "webexCalling": {
-                    "extension": ws['extension'],
-                    "locationId": location_id
-                }
+    loc_choice = input("  Select location number for these rows: ").strip()
+    try:
+        return available_locations[int(loc_choice) - 1]["id"], None
+    except (ValueError, IndexError):
+        print("  Invalid selection. Rows without a location will be skipped.")
+        return None, 'Invalid location selection'
+
+def resolve_workspace_location(ws, available_locations, missing_location):
+    """Return the location ID for a webexCalling row; rows without one get missing_location (ID, error)"""
+    if ws['location']:
+        location = next((loc for loc in available_locations if loc['name'] == ws['location']), None)
+        if location:
+            return location['id'], None
+        print(f"  Row {ws['row_num']}: Error: Location '{ws['location']}' not found")
+        return None, 'Location not found'
+    return missing_location
+
+def create_workspace_and_device(api, ws, location_id, journal=None):
+    """Create one workspace and its device, returning (result, output lines)"""
+    output = [f"\nCreating workspace: {ws['displayName']} (Row {ws['row_num']})"]
+    key = row_key(ws['row_num'], ws['displayName'])
+    
+    if ws.get('action') == 'conflict':
+        output.append(f"  Conflict: {'; '.join(ws['conflicts'])}")
+        return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'conflict', 'error': '; '.join(ws['conflicts'])}, output
+    
+    if ws.get('action') == 'skip':
+        if ws['needs_device']:
+            output.append(f"  Workspace already exists (ID: {ws['existing_id']}), creating missing device")
+            return create_row_device(api, ws, ws['existing_id'], output, journal)
+        output.append(f"  Already present and identical, skipping (ID: {ws['existing_id']})")
+        return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'skipped', 'workspace_id': ws['existing_id']}, output
+    
+    if journal and journal.is_done(key, 'workspace'):
+        workspace_id = journal.get(key, 'workspace')['workspace_id']
+        output.append(f"  Already created in journal, skipping POST (ID: {workspace_id})")
+        if journal.is_done(key, 'device') or not (ws['phoneModel'] and ws['calling'] == 'webexcalling'):
+            return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'success', 'workspace_id': workspace_id}, output
+        return create_row_device(api, ws, workspace_id, output, journal)
+    
+    # Prepare workspace data
+    data = {
+        "displayName": ws['displayName'],
+        "orgId": api.org_id,
+        "type": ws['type'],
+        "supportedDevices": ws['supportedDevices']
+    }
+    
+    if ws['capacity']:
+        data['capacity'] = int(ws['capacity'])
+    
+    # Handle location and calling
+    if ws['calling'] == 'webexcalling':
+        data['locationId'] = location_id
+        data['calling'] = {
+            "type": "webexCalling",
+            "webexCalling": {
+                "extension": ws['extension'],
+                "locationId": location_id
             }
-            
-            if ws['phoneNumber']:
-                data['calling']['webexCalling']['phoneNumber'] = ws['phoneNumber']
-        
-        # Create workspace
-        result = api.call("POST", "workspaces", data=data)
-        
-        if "error" in result:
-            print(f"  Error creating workspace: {result['error']}")
-            results.append({'row': ws['row_num'], 'name': ws['displayName'], 'status': 'failed', 'error': result['error']})
-            continue
+        }
         
-        workspace_id = result.get("id")
-        print(f"  Workspace created successfully! ID: {workspace_id}")
+        if ws['phoneNumber']:
+            data['calling']['webexCalling']['phoneNumber'] = ws['phoneNumber']
+    
+    # Create workspace
+    result = api.call("POST", "workspaces", data=data)
+    
+    if is_circuit_open(result.get("error")):
+        output.append(f"  Parked: {result['error']}")
+        return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'parked', 'error': result['error']}, output
+    
+    if "error" in result:
+        output.append(f"  Error creating workspace: {result['error']}")
+        return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'failed', 'error': result['error']}, output
+    
+    workspace_id = result.get("id")
+    output.append(f"  Workspace created successfully! ID: {workspace_id}")
+    if journal:
+        journal.record(key, 'workspace', workspace_id=workspace_id)
+    
+    # Create device if phoneModel is specified
+    if ws['phoneModel'] and ws['calling'] == 'webexcalling':
+        return create_row_device(api, ws, workspace_id, output, journal)
+    
+    return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'success', 'workspace_id': workspace_id}, output
+
+def create_row_device(api, ws, workspace_id, output, journal=None):
+    """Create the device for a created workspace row, returning (result, output lines)"""
+    output.append(f"  Creating device: {ws['phoneModel']}")
+    
+    if ws['macaddress']:
+        # Create with MAC address
+        mac_clean = ''.join(c for c in ws['macaddress'].upper() if c.isalnum())
+        mac_formatted = ':'.join(mac_clean[i:i+2] for i in range(0, 12, 2))
         
-        # Create device if phoneModel is specified
-        if ws['phoneModel'] and ws['calling'] == 'webexcalling':
-            print(f"  Creating device: {ws['phoneModel']}")
-            
-            if ws['macaddress']:
-                # Create with MAC address
-                mac_clean = ''.join(c for c in ws['macaddress'].upper() if c.isalnum())
-                mac_formatted = ':'.join(mac_clean[i:i+2] for i in range(0, 12, 2))
-                
-                device_data = {
-                    "mac": mac_formatted,
-                    "model": ws['phoneModel'],
-                    "workspaceId": workspace_id
-                }
-                device_result = api.call("POST", "devices", data=device_data, params={"orgId": api.org_id})
-            else:
-                # Create with activation code
-                device_data = {
-                    "workspaceId": workspace_id,
-                    "model": ws['phoneModel']
-                }
-                device_result = api.call("POST", "devices/activationCode", data=device_data, params={"orgId": api.org_id})
-            
-            if "error" in device_result:
-                print(f"  Warning: Device creation failed: {device_result['error']}")
-                results.append({'row': ws['row_num'], 'name': ws['displayName'], 'status': 'partial', 'workspace_id': workspace_id, 'error': f"Device creation failed: {device_result['error']}"})
-            else:
-                activation_code = device_result.get('code', 'N/A') if not ws['macaddress'] else 'MAC'
-                print(f"  Device created successfully! Activation: {activation_code}")
-                results.append({'row': ws['row_num'], 'name': ws['displayName'], 'status': 'success', 'workspace_id': workspace_id})
-        else:
-            results.append({'row': ws['row_num'], 'name': ws['displayName'], 'status': 'success', 'workspace_id': workspace_id})
+        device_data = {
+            "mac": mac_formatted,
+            "model": ws['phoneModel'],
+            "workspaceId": workspace_id
+        }
+        device_result = api.call("POST", "devices", data=device_data, params={"orgId": api.org_id})
+    else:
+        # Create with activation code
+        device_data = {
+            "workspaceId": workspace_id,
+            "model": ws['phoneModel']
+        }
+        device_result = api.call("POST", "devices/activationCode", data=device_data, params={"orgId": api.org_id})
+    
+    if is_circuit_open(device_result.get("error")):
+        output.append(f"  Parked device: {device_result['error']}")
+        return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'parked', 'workspace_id': workspace_id, 'error': device_result['error']}, output
+    
+    if "error" in device_result:
+        output.append(f"  Warning: Device creation failed: {device_result['error']}")
+        return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'partial', 'workspace_id': workspace_id, 'error': f"Device creation failed: {device_result['error']}"}, output
+
+    activation_code = device_result.get('code', 'N/A') if not ws['macaddress'] else 'MAC'
+    output.append(f"  Device created successfully! Activation: {activation_code}")
+    if journal:
+        journal.record(row_key(ws['row_num'], ws['displayName']), 'device',
+                       device_id=device_result.get('id'), activation_code=device_result.get('code'))
+
+    return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'success', 'workspace_id': workspace_id}, output
+
+def execute_bulk_create(api, workspaces, available_locations, report, workers=ADAPTIVE_WORKERS, journal=None,
+                        missing_location=(None, None)):
+    """Execute bulk workspace creation
+    
+    Rows stream from workspaces through location resolution, creation and
+    the device step with a bounded number in flight, and each result is
+    written to the report as it completes. missing_location is the
+    (location ID, error) already resolved for calling rows without a
+    location. Returns the counts per status.
+    """
+    print(f"\nStarting bulk creation of {len(workspaces)} workspace(s)...")
+    
+    def jobs():
+        for ws in workspaces:
+            location_id, error = None, None
+            already_created = journal and journal.is_done(row_key(ws['row_num'], ws['displayName']), 'workspace')
+            if ws['calling'] == 'webexcalling' and not already_created and ws.get('action', 'create') == 'create':
+                location_id, error = resolve_workspace_location(ws, available_locations, missing_location)
+            yield ws, location_id, error
+    
+    def run(job):
+        ws, location_id, error = job
+        if error:
+            return {'row': ws['row_num'], 'name': ws['displayName'], 'status': 'failed', 'error': error}, []
+        return create_workspace_and_device(api, ws, location_id, journal)
+    
+    if workers > 1:
+        print(f"Using up to {workers} concurrent workers (adaptive)")
+    
+    for _, (result, output) in run_concurrently(run, jobs(), workers):
+        if output:
+            print('\n'.join(output))
+        report.add(result)
     
     # Display results summary
     print(f"\n{'='*100}")
     print("Bulk Creation Results:")
     print(f"{'='*100}")
-    print(f"{'Row':<5} {'Display Name':<30} {'Status':<10} {'Workspace ID / Error':<50}")
-    print(f"{'='*100}")
+    if report.path and report.total <= SUMMARY_TABLE_ROWS:
+        print(f"{'Row':<5} {'Display Name':<30} {'Status':<10} {'Workspace ID / Error':<50}")
+        print(f"{'='*100}")
+        
+        for r in sorted(report.results(), key=lambda r: int(r['row'])):
+            status_display = r['status'].upper()
+            detail = r.get('workspace_id') or r.get('error') or ''
+            print(f"{r['row']:<5} {r['name']:<30} {status_display:<10} {detail:<50}")
+        
+        print(f"{'='*100}")
     
-    for r in results:
-        status_display = r['status'].upper()
-        detail = r.get('workspace_id', r.get('error', ''))
-        print(f"{r['row']:<5} {r['name']:<30} {status_display:<10} {detail:<50}")
+    print(f"\nTotal: {report.total} | Success: {report.count('success')} | Skipped: {report.count('skipped')} | "
+          f"Partial: {report.count('partial')} | Conflict: {report.count('conflict')} | "
+          f"Failed: {report.count('failed')} | Parked: {report.count('parked')}")
+    if report.path:
+        print(f"Per-row results: {report.path}")
+    if report.count('parked'):
+        print("Parked rows were not attempted because their endpoints are failing; they are resumable from the journal.")
+    api.print_metrics()
     
-    print(f"{'='*100}")
+    return dict(report.counts)
+
+def run_with_journal(api, filepath, workspaces, available_locations, workers, resume, dry_run=False, journal=None,
+                     report_path=None, missing_location=(None, None)):
+    """Execute the bulk create under a run journal; the journal is closed as complete only if every row succeeded
     
-    success_count = sum(1 for r in results if r['status'] == 'success')
-    partial_count = sum(1 for r in results if r['status'] == 'partial')
-    failed_count = sum(1 for r in results if r['status'] == 'failed')
+    Dry runs use an in-memory journal, write no report unless report_path is
+    given and save the planned operations instead. Returns the counts per
+    status, or VALIDATION_FAILED if no journal could be opened.
+    """
+    if journal is None:
+        journal = RunJournal(None) if dry_run else open_run_journal("bulk_create", filepath, resume)
+    if journal is None:
+        return VALIDATION_FAILED
     
-    print(f"\nTotal: {len(results)} | Success: {success_count} | Partial: {partial_count} | Failed: {failed_count}")
+    report = RunReport(report_path if dry_run else report_path or default_report_path("bulk_create"))
+    try:
+        with request_priority('bulk'):
+            counts = execute_bulk_create(api, workspaces, available_locations, report, workers, journal,
+                                         missing_location)
+        if dry_run:
+            api.write_plan("bulk_create", filepath, workers)
+        elif set(counts) <= {'success', 'skipped'}:
+            journal.complete()
+        else:
+            print(f"\nSome rows did not complete. Re-run to resume from {journal.path}")
+        return counts
+    finally:
+        report.close()
+        journal.close()
 
-def bulk_create_workspaces(api):
-    """Main function for bulk workspace creation"""
-    print("\n--- Bulk Create Workspaces ---")
+def prepare_bulk_create(api, filepath):
+    """Parse, validate and pre-flight the CSV, returning (workspaces, available_locations, org state)
     
+    The org state is None when the pre-flight check was unavailable. Returns
+    None if the CSV did not validate, or NO_VALID_ROWS if it has no rows.
+    """
     # Check if bulk folder exists
-    if not os.path.exists("bulk"):
-        print("Error: 'bulk' folder not found. Creating it now...")
-        os.makedirs("bulk")
-        print("Please place your 'workspaces.csv' file in the 'bulk' folder and try again.")
-        return
+    bulk_dir = os.path.dirname(filepath) or "."
+    if not os.path.exists(bulk_dir):
+        print(f"Error: '{bulk_dir}' folder not found. Creating it now...")
+        os.makedirs(bulk_dir)
+        print(f"Please place your '{os.path.basename(filepath)}' file in the '{bulk_dir}' folder and try again.")
+        return None
     
     # Parse and validate CSV
-    result = parse_workspaces_csv(api)
+    result = parse_workspaces_csv(api, filepath)
     if result is None:
-        return
+        return None
     
     workspaces, available_locations = result
     
     if not workspaces:
         print("No valid workspaces found in CSV file.")
-        return
+        return NO_VALID_ROWS
+    
+    with request_priority('validation'):
+        counts, state = preflight_workspaces(api, workspaces, available_locations)
     
     # Display summary
-    print(f"\nBulk admin will create {len(workspaces)} workspace(s).")
+    if counts:
+        print(f"\nBulk admin will create {counts['create']} workspace(s) "
+              f"({counts['skip']} already present, {counts['conflict']} conflict(s) will not be applied).")
+    else:
+        print(f"\nBulk admin will create {len(workspaces)} workspace(s).")
+    
+    return workspaces, available_locations, state
+
+def confirm_bulk_create(workspaces):
+    """Ask whether to proceed, offering the row details first in interactive mode"""
+    if prompts.is_headless():
+        if prompts.confirm("bulk_create.proceed", "Proceed with bulk creation?"):
+            return True
+        print("Bulk creation cancelled.")
+        return False
     
     while True:
         choice = input("\nOptions: (p)roceed, (d)etails, (c)ancel: ").strip().lower()
         
         if choice == 'p':
-            execute_bulk_create(api, workspaces, available_locations)
-            break
+            return True
         elif choice == 'd':
             display_workspace_summary(workspaces)
         elif choice == 'c':
             print("Bulk creation cancelled.")
-            break
+            return False
         else:
             print("Invalid choice. Please enter 'p', 'd', or 'c'.")
+
+def bulk_create_workspaces(api, filepath="bulk/workspaces.csv", workers=ADAPTIVE_WORKERS, resume=None, dry_run=False,
+                           report_path=None):
+    """Main function for bulk workspace creation
+    
+    Returns the counts per result status, None if cancelled, or
+    VALIDATION_FAILED or NO_VALID_ROWS when nothing was run.
+    """
+    print("\n--- Bulk Create Workspaces ---")
+    if dry_run:
+        print("Dry run: reads are sent, writes are only planned")
+        api = DryRunAPI(api)
+    
+    prepared = prepare_bulk_create(api, filepath)
+    if prepared is None:
+        return VALIDATION_FAILED
+    if prepared == NO_VALID_ROWS:
+        return NO_VALID_ROWS
+    
+    workspaces, available_locations, _ = prepared
+    if not confirm_bulk_create(workspaces):
+        return None
+    if not workspaces.unchanged():
+        print(f"Error: {filepath} changed after it was validated; run bulk create again")
+        return VALIDATION_FAILED
+    # Asked before any write, so workers never wait on the operator
+    missing_location = resolve_missing_location(available_locations) if workspaces.missing_location() else (None, None)
+    return run_with_journal(api, filepath, workspaces, available_locations, workers, resume, dry_run,
+                            report_path=report_path, missing_location=missing_location)
+
+def save_bulk_create_plan(api, filepath="bulk/workspaces.csv", plan_path=None):
+    """Validate the CSV now and save it as a plan to execute later, returning the plan path or None"""
+    print("\n--- Bulk Create Workspaces: Save Plan ---")
+    
+    prepared = prepare_bulk_create(api, filepath)
+    if prepared is None or prepared == NO_VALID_ROWS:
+        return None
+    
+    workspaces, available_locations, state = prepared
+    if state is None:
+        print("Error: A plan needs the pre-flight organization state; try again when the API is reachable")
+        return None
+    
+    payload = {
+        'workspaces': list(workspaces),
+        'available_locations': [{'id': loc['id'], 'name': loc['name']} for loc in available_locations]
+    }
+    return save_plan(plan_path or default_plan_path("bulk_create"), "bulk_create", api, filepath, state, payload)
+
+def execute_bulk_create_plan(api, plan, plan_path, workers=ADAPTIVE_WORKERS, resume=None, report_path=None):
+    """Run a saved bulk create plan without re-reading the CSV
+    
+    A fresh run first checks that the org state still matches the plan;
+    resuming a run of the same plan skips that check, since its own writes changed the state.
+    Returns what bulk_create_workspaces returns.
+    """
+    workspaces = plan['payload']['workspaces']
+    available_locations = plan['payload']['available_locations']
+    
+    actions = [ws.get('action', 'create') for ws in workspaces]
+    print(f"\nPlan: {actions.count('create')} workspace(s) to create, {actions.count('skip')} already present, "
+          f"{actions.count('conflict')} conflict(s)")
+    if not workspaces:
+        print("The plan has no valid rows.")
+        return NO_VALID_ROWS
+    
+    journal = open_run_journal("bulk_create", plan_path, resume)
+    if journal is None:
+        return VALIDATION_FAILED
+    
+    if not journal.step_count() and not verify_org_state(api, plan):
+        journal.close_or_discard()
+        return VALIDATION_FAILED
+    
+    if not confirm_bulk_create(workspaces):
+        journal.close_or_discard()
+        return None
+    missing_location = (None, None)
+    if any(ws['calling'] == 'webexcalling' and not ws['location'] for ws in workspaces):
+        missing_location = resolve_missing_location(available_locations)
+    return run_with_journal(api, plan_path, workspaces, available_locations, workers, resume, journal=journal,
+                            report_path=report_path, missing_location=missing_location)
@@ -0,0 +1,116 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import threading
+import time
+
+from libraries.adaptive_limiter import endpoint_family
+
+# Errors returned for rejected requests start with this, see is_circuit_open()
+CIRCUIT_OPEN_PREFIX = "Circuit open"
+
+def is_circuit_open(error):
+    """True when an error (possibly wrapped in a longer message) is a rejection by an open circuit"""
+    return isinstance(error, str) and CIRCUIT_OPEN_PREFIX in error
+
+class CircuitBreaker:
+    """Fail fast for one endpoint family after consecutive server failures
+
+    5xx responses and request exceptions count as failures; 429 is left to
+    the adaptive limiter. After threshold consecutive failures the circuit
+    opens and requests are rejected without being sent. Once cooldown has
+    passed a single probe request is let through: success closes the
+    circuit, failure opens it for another cooldown.
+    """
+
+    def __init__(self, family, threshold=5, cooldown=30):
+        self.family = family
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = 'half-open'
+                self.probing = False
+            if self.state == 'closed':
+                return True
+            if self.state == 'half-open' and not self.probing:
+                self.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, status_code):
+        """Record a sent request's outcome; status_code is None when the request raised
+
+        Returns the new state if it changed, otherwise None.
+        """
+        with self.lock:
+            before = self.state
+            if status_code == 429:
+                # Throttled is not broken; let another probe through
+                self.probing = False
+                return None
+
+            if status_code is None or status_code >= 500:
+                self.failures += 1
+                if self.state == 'half-open' or (self.state == 'closed' and self.failures >= self.threshold):
+                    self.state = 'open'
+                    self.opened_at = time.monotonic()
+                    self.trips += 1
+            else:
+                self.failures = 0
+                self.state = 'closed'
+            self.probing = False
+            return self.state if self.state != before else None
+
+    def retry_in(self):
+        with self.lock:
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+class CircuitBreakers:
+    """One CircuitBreaker per endpoint family"""
+
+    def __init__(self, logger=None, **breaker_options):
+        self.logger = logger
+        self.breaker_options = breaker_options
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def breaker_for(self, url):
+        family = endpoint_family(url)
+        with self.lock:
+            if family not in self.breakers:
+                self.breakers[family] = CircuitBreaker(family, **self.breaker_options)
+            return self.breakers[family]
+
+    def record(self, breaker, status_code):
+        changed = breaker.record(status_code)
+        if changed and self.logger:
+            self.logger.warning(f"Circuit {breaker.family}: {changed}")
+
+    def rejection(self, breaker):
+        """Error result for a request rejected by an open circuit"""
+        return {"error": f"{CIRCUIT_OPEN_PREFIX} for {breaker.family} endpoints after {breaker.threshold} "
+                         f"consecutive failures; retry in {breaker.retry_in():.0f}s",
+                "circuit_open": True}
+
+    def print_metrics(self):
+        """Print families whose circuit opened this session"""
+        with self.lock:
+            tripped = [b for b in self.breakers.values() if b.trips]
+        if not tripped:
+            return
+
+        print("\nCircuit breakers (this session):")
+        for breaker in tripped:
+            print(f"  {breaker.family:<18} state {breaker.state:<10} opened {breaker.trips} time(s), "
+                  f"{breaker.rejected} request(s) rejected without sending")
@@ -0,0 +1,41 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from libraries.priority import submit_with_priority
+
+# Pool size for bulk paths; the API client's adaptive limiter decides how
+# many of these workers actually have a request in flight
+ADAPTIVE_WORKERS = 16
+
+def run_concurrently(func, items, workers=1, window=None):
+    """Call func on each item, yielding (item, result) pairs as calls complete
+
+    Items are pulled from the iterable only as calls finish: at most window
+    calls (default twice the workers) are submitted and not yet yielded, so
+    a generator of items is never read far ahead of the work.
+    """
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    window = window or workers * 2
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[submit_with_priority(executor, func, item)] = item
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
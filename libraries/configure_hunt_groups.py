@@ -1,170 +1,300 @@
 # Copyright (c) 2026 Ming Chiu
 # Licensed under the MIT License - see LICENSE file for details
 
-def configure_hunt_groups(api, location_data, workspace_map, data_rows, filepath):
-    """Configure hunt groups from Webex Hunt Groups sheet"""
-    from libraries.aso_bulk_import import read_excel_sheet
-    
-    print(f"\n{'='*60}")
-    proceed = input("\nProceed with hunt group configuration? (Y/n): ").strip().lower()
-    if proceed not in ['', 'y', 'yes']:
-        print("\nHunt group configuration skipped.")
-        return
-    
-    # Read Webex Hunt Groups sheet
-    huntgroup_data = read_excel_sheet(filepath, 'Webex Hunt Groups')
-    if not huntgroup_data or len(huntgroup_data) < 7:
-        print("  Skipped: No hunt group data found")
-        return
-    
-    # Get location timezone
-    location_result = api.call("GET", f"locations/{location_data['id']}", params={"orgId": api.org_id})
-    if "error" in location_result:
-        print(f"  Error fetching location details: {location_result['error']}")
-        return
-    
-    timezone = location_result.get('timeZone', 'America/Chicago')
-    
-    # Build extension to workspace ID map
-    ext_to_workspace = {}
-    for row_idx, workspace_id in workspace_map.items():
-        row = data_rows[row_idx - 2]
-        extension = str(row[4]).strip() if len(row) > 4 else ""
-        if extension:
-            ext_to_workspace[extension] = workspace_id
-    
-    # Parse hunt groups (rows 4-6, 7-9, etc.)
+import re
+
+from libraries import prompts
+from libraries.concurrency import ADAPTIVE_WORKERS, run_concurrently
+from libraries.reconcile import normalize_phone
+from libraries.run_journal import RUN_KEY
+
+def cell_text(row, idx):
+    return str(row[idx]).strip() if len(row) > idx and row[idx] is not None else ""
+
+def sheet_digits(value):
+    """Digits of an extension or phone number cell ('4500', '4500.0', '555-123-4567'), or None if it has other characters"""
+    if value.endswith('.0'):
+        value = value[:-2]
+    digits = re.sub(r'[\s().+-]', '', value)
+    return digits if digits.isdigit() else None
+
+def normalize_hunt_group(hg):
+    """Set the hunt group's extension, phone number and rings from their cells, listing any problems"""
+    problems = []
+    hg['extension'] = sheet_digits(hg['extension_cell'])
+    if not hg['extension_cell']:
+        problems.append("extension is missing")
+    elif hg['extension'] is None:
+        problems.append(f"extension '{hg['extension_cell']}' is not numeric")
+
+    phone = hg['phone_cell']
+    hg['phoneNumber'] = None if not phone or phone.upper() == 'N/A' else sheet_digits(phone)
+    if phone and phone.upper() != 'N/A' and hg['phoneNumber'] is None:
+        problems.append(f"phone number '{phone}' is not valid")
+
+    try:
+        hg['nextAgentRings'] = int(float(hg['rings_cell'])) if hg['rings_cell'] else 3
+    except ValueError:
+        hg['nextAgentRings'] = 3
+        problems.append(f"next agent rings '{hg['rings_cell']}' is not numeric")
+
+    hg['problems'] = problems
+
+def parse_hunt_groups(huntgroup_data):
+    """Hunt groups from the Webex Hunt Groups sheet, in 3-row blocks starting at row 4
+
+    Extensions and phone numbers are normalized to digits; a group whose
+    cells cannot be is kept, with its problems listed, so it can be shown and skipped.
+    """
     hunt_groups = []
     row_idx = 3  # Start at row 4 (0-indexed)
-    
+
     while row_idx < len(huntgroup_data):
+        row = huntgroup_data[row_idx]
         # Check if we have a hunt group (name in column A)
-        if len(huntgroup_data[row_idx]) > 0 and huntgroup_data[row_idx][0]:
-            hg_name = str(huntgroup_data[row_idx][0]).strip()
-            hg_phone_raw = str(huntgroup_data[row_idx][1]).strip() if len(huntgroup_data[row_idx]) > 1 and huntgroup_data[row_idx][1] else ""
-            hg_phone = None if not hg_phone_raw or hg_phone_raw.upper() == 'N/A' else hg_phone_raw
-            hg_ext = str(huntgroup_data[row_idx][2]).strip() if len(huntgroup_data[row_idx]) > 2 else ""
-            
+        if len(row) > 0 and row[0]:
             # Collect agent extensions from 3 rows
             agent_extensions = []
             for i in range(3):
-                if row_idx + i < len(huntgroup_data) and len(huntgroup_data[row_idx + i]) > 3:
-                    ext = str(huntgroup_data[row_idx + i][3]).strip() if huntgroup_data[row_idx + i][3] else None
+                if row_idx + i < len(huntgroup_data):
+                    ext = cell_text(huntgroup_data[row_idx + i], 3)
                     if ext:
                         agent_extensions.append(ext)
-            
-            # Get policy and other settings from first row
-            policy = str(huntgroup_data[row_idx][5]).strip().upper() if len(huntgroup_data[row_idx]) > 5 and huntgroup_data[row_idx][5] else "REGULAR"
-            next_agent_rings = int(float(huntgroup_data[row_idx][6])) if len(huntgroup_data[row_idx]) > 6 and huntgroup_data[row_idx][6] else 3
-            
-            hunt_groups.append({
-                'name': hg_name,
-                'phoneNumber': hg_phone,
-                'extension': hg_ext,
+
+            hg = {
+                'name': str(row[0]).strip(),
+                'extension_cell': cell_text(row, 2),
+                'phone_cell': cell_text(row, 1),
+                'rings_cell': cell_text(row, 6),
                 'agent_extensions': agent_extensions,
-                'policy': policy,
-                'nextAgentRings': next_agent_rings
-            })
-        
+                # Get policy and other settings from first row
+                'policy': cell_text(row, 5).upper() or "REGULAR"
+            }
+            normalize_hunt_group(hg)
+            hunt_groups.append(hg)
+
         row_idx += 3  # Move to next hunt group
-    
+
+    return hunt_groups
+
+def build_hunt_group_payload(hg, agent_ids, timezone):
+    """POST body for a parsed hunt group without problems"""
+    # Remove trailing number from name for customName
+    custom_name = hg['name']
+    if custom_name and custom_name[-1].isdigit():
+        # Remove trailing digits and spaces
+        custom_name = custom_name.rstrip('0123456789').strip()
+
+    hg_data = {
+        "name": hg['name'],
+        "extension": int(hg['extension']),
+        "timeZone": timezone,
+        "callPolicies": {
+            "policy": hg['policy'],
+            "waitingEnabled": False,
+            "noAnswer": {
+                "nextAgentEnabled": True,
+                "nextAgentRings": hg['nextAgentRings']
+            }
+        },
+        "agents": agent_ids,
+        "enabled": True,
+        "huntGroupCallerIdForOutgoingCallsEnabled": True,
+        "directLineCallerIdName": {
+            "selection": "CUSTOM_NAME",
+            "customName": custom_name
+        },
+        "dialByName": custom_name
+    }
+
+    if hg['phoneNumber']:
+        hg_data["phoneNumber"] = int(hg['phoneNumber'])
+
+    return hg_data
+
+def fetch_existing_hunt_groups(api, location_id):
+    """Index the location's hunt groups by lower-case name and by extension, or None if they could not be fetched"""
+    result = api.list_all("telephony/config/huntGroups", "huntGroups",
+                          params={"orgId": api.org_id, "locationId": location_id})
+    if "error" in result:
+        print(f"  Warning: Could not fetch existing hunt groups - {result['error']}")
+        return None
+
+    existing = {'by_name': {}, 'by_extension': {}}
+    for group in result['huntGroups']:
+        existing['by_name'][str(group.get('name', '')).strip().lower()] = group
+        if group.get('extension'):
+            existing['by_extension'][str(group['extension'])] = group
+    return existing
+
+def hunt_group_differences(current, hg):
+    """Listed fields where an existing hunt group differs from the sheet"""
+    differences = []
+    if str(current.get('extension') or '') != hg['extension']:
+        differences.append(f"extension is {current.get('extension') or 'not set'}")
+    desired_phone = normalize_phone(hg['phoneNumber'])
+    if desired_phone and normalize_phone(current.get('phoneNumber')) != desired_phone:
+        differences.append(f"phone number is {current.get('phoneNumber') or 'not set'}")
+    return differences
+
+def classify_hunt_group(entry, existing, journal):
+    """Set the entry's action (create, exists, conflict, done or skip) and notes"""
+    hg = entry['hg']
+    notes = [f"agent {ext} not among imported workspaces" for ext in entry['missing_agents']]
+
+    if entry['excluded']:
+        action, notes = 'skip', ["excluded"]
+    elif journal and journal.is_done(RUN_KEY, entry['journal_step']):
+        action = 'done'
+        notes = [f"created earlier in this run (ID: {journal.get(RUN_KEY, entry['journal_step']).get('id')})"]
+    elif hg['problems']:
+        action, notes = 'skip', hg['problems'] + notes
+    elif not entry['agent_ids']:
+        action, notes = 'skip', notes + ["no valid agents"]
+    elif existing is None:
+        action = 'create'
+    else:
+        current = existing['by_name'].get(hg['name'].strip().lower())
+        owner = existing['by_extension'].get(hg['extension'])
+        if current:
+            action = 'exists'
+            notes = hunt_group_differences(current, hg) or ["matches the sheet"]
+        elif owner:
+            action = 'conflict'
+            notes.append(f"extension {hg['extension']} belongs to hunt group '{owner.get('name')}'")
+        else:
+            action = 'create'
+
+    entry['action'] = action
+    entry['notes'] = notes
+
+def print_hunt_group_table(entries, timezone):
+    print(f"\nHunt groups (time zone {timezone}):")
+    print(f"{'#':<4} {'Name':<25} {'Ext':<7} {'Phone':<12} {'Policy':<12} {'Rings':<6} {'Agents':<7} {'Action':<9} Notes")
+    print(f"{'-'*100}")
+    for number, entry in enumerate(entries, 1):
+        hg = entry['hg']
+        print(f"{number:<4} {hg['name'][:25]:<25} {hg['extension'] or hg['extension_cell']:<7} "
+              f"{hg['phoneNumber'] or hg['phone_cell']:<12} {hg['policy']:<12} {hg['nextAgentRings']:<6} "
+              f"{len(entry['agent_ids']):<7} {entry['action']:<9} {'; '.join(entry['notes'])}")
+
+def edit_hunt_group(entry):
+    """Prompt for new values for one hunt group; Enter keeps a value"""
+    hg = entry['hg']
+    print(f"\nEditing '{hg['name']}' (press Enter to keep a value)")
+    hg['name'] = input(f"  Name [{hg['name']}]: ").strip() or hg['name']
+    hg['extension_cell'] = input(f"  Extension [{hg['extension_cell']}]: ").strip() or hg['extension_cell']
+    hg['phone_cell'] = input(f"  Phone Number [{hg['phone_cell']}]: ").strip() or hg['phone_cell']
+    hg['policy'] = input(f"  Policy [{hg['policy']}]: ").strip().upper() or hg['policy']
+    hg['rings_cell'] = input(f"  Next Agent Rings [{hg['nextAgentRings']}]: ").strip() or hg['rings_cell']
+    exclude_default = 'Y' if entry['excluded'] else 'N'
+    exclude_input = input(f"  Exclude from this run (y/n) [{exclude_default}]: ").strip().lower()
+    if exclude_input:
+        entry['excluded'] = exclude_input in ['y', 'yes']
+    normalize_hunt_group(hg)
+
+def configure_hunt_groups(api, location_data, workspace_by_extension, filepath, journal=None, read_sheet=None,
+                          workers=ADAPTIVE_WORKERS):
+    """Configure hunt groups from Webex Hunt Groups sheet; read_sheet defaults to reading the workbook
+
+    workspace_by_extension maps each imported workspace's extension to its
+    ID. The location's existing hunt groups are fetched once and indexed, so
+    groups already present are skipped (with any listed differences shown)
+    instead of posted again. Every group is shown in one table that can be
+    edited before a single confirmation, then the new groups are created
+    concurrently. Returns ({action or outcome: count}, [(name, error)] for
+    each hunt group that could not be created).
+    """
+    if read_sheet is None:
+        from libraries.aso_bulk_import import read_excel_sheet as read_sheet
+
+    print(f"\n{'='*60}")
+    if not prompts.confirm("aso.configure_hunt_groups", "\nProceed with hunt group configuration? (Y/n): "):
+        print("\nHunt group configuration skipped.")
+        return {}, []
+
+    # Read Webex Hunt Groups sheet
+    huntgroup_data = read_sheet(filepath, 'Webex Hunt Groups')
+    if not huntgroup_data or len(huntgroup_data) < 7:
+        print("  Skipped: No hunt group data found")
+        return {}, []
+
+    hunt_groups = parse_hunt_groups(huntgroup_data)
     if not hunt_groups:
         print("  Skipped: No hunt groups found")
-        return
-    
-    # Process each hunt group
+        return {}, []
+
+    # Get location timezone
+    location_result = api.call("GET", f"locations/{location_data['id']}", params={"orgId": api.org_id})
+    if "error" in location_result:
+        print(f"  Error fetching location details: {location_result['error']}")
+        return {}, []
+
+    timezone = location_result.get('timeZone', 'America/Chicago')
+
+    print(f"  Fetching existing hunt groups for {location_data['name']}...")
+    existing = fetch_existing_hunt_groups(api, location_data['id'])
+    if existing is None:
+        print("  Every hunt group will be attempted; the API rejects duplicates")
+
+    entries = []
     for hg in hunt_groups:
-        print(f"\n{'='*60}")
-        print(f"Hunt Group: {hg['name']}")
-        print(f"{'='*60}")
-        
-        # Map agent extensions to workspace IDs
-        agent_ids = []
-        for ext in hg['agent_extensions']:
-            if ext in ext_to_workspace:
-                agent_ids.append({"id": ext_to_workspace[ext]})
-            else:
-                print(f"  Warning: Extension {ext} not found in created workspaces")
-        
-        if not agent_ids:
-            print(f"  Skipped: No valid agents found")
-            continue
-        
-        # Remove trailing number from name for customName
-        custom_name = hg['name']
-        if custom_name and custom_name[-1].isdigit():
-            # Remove trailing digits and spaces
-            custom_name = custom_name.rstrip('0123456789').strip()
-        
-        # Build hunt group data
-        hg_data = {
-            "name": hg['name'],
-            "extension": int(hg['extension']),
-            "timeZone": timezone,
-            "callPolicies": {
-                "policy": hg['policy'],
-                "waitingEnabled": False,
-                "noAnswer": {
-                    "nextAgentEnabled": True,
-                    "nextAgentRings": hg['nextAgentRings']
-                }
-            },
-            "agents": agent_ids,
-            "enabled": True,
-            "huntGroupCallerIdForOutgoingCallsEnabled": True,
-            "directLineCallerIdName": {
-                "selection": "CUSTOM_NAME",
-                "customName": custom_name
-            },
-            "dialByName": custom_name
+        entry = {
+            'journal_step': f"huntgroup:{hg['name']}",
+            'hg': hg,
+            'agent_ids': [{"id": workspace_by_extension[ext]} for ext in hg['agent_extensions'] if ext in workspace_by_extension],
+            'missing_agents': [ext for ext in hg['agent_extensions'] if ext not in workspace_by_extension],
+            'excluded': False
         }
-        
-        if hg['phoneNumber']:
-            hg_data["phoneNumber"] = int(hg['phoneNumber'])
-        
-        # Display configuration table
-        print(f"\nConfiguration:")
-        print(f"  Name: {hg_data['name']}")
-        print(f"  Extension: {hg_data['extension']}")
-        if hg['phoneNumber']:
-            print(f"  Phone Number: {hg['phoneNumber']}")
-        print(f"  Time Zone: {timezone}")
-        print(f"  Policy: {hg_data['callPolicies']['policy']}")
-        print(f"  Next Agent Rings: {hg_data['callPolicies']['noAnswer']['nextAgentRings']}")
-        print(f"  Agents: {len(agent_ids)}")
-        print(f"  Custom Name: {custom_name}")
-        
-        # Confirm
-        confirm = input("\nProceed with this hunt group? (Y/n): ").strip().lower()
-        if confirm not in ['', 'y', 'yes']:
-            print("  Skipped")
+        classify_hunt_group(entry, existing, journal)
+        entries.append(entry)
+
+    print_hunt_group_table(entries, timezone)
+
+    # Modifications are made up front, interactive sessions only
+    while not prompts.is_headless():
+        choice = input("\nEnter a hunt group number to edit it, or press Enter to continue: ").strip()
+        if not choice:
+            break
+        if not choice.isdigit() or not 1 <= int(choice) <= len(entries):
+            print("Invalid selection.")
             continue
-        
-        # Allow modifications
-        modify = input("Modify any attributes? (y/N): ").strip().lower()
-        if modify == 'y':
-            hg_data['name'] = input(f"  Name [{hg_data['name']}]: ").strip() or hg_data['name']
-            ext_input = input(f"  Extension [{hg_data['extension']}]: ").strip()
-            if ext_input:
-                hg_data['extension'] = int(ext_input)
-            if 'phoneNumber' in hg_data:
-                new_phone = input(f"  Phone Number [{hg_data['phoneNumber']}]: ").strip()
-                if new_phone:
-                    hg_data['phoneNumber'] = int(new_phone)
-            policy_input = input(f"  Policy [{hg_data['callPolicies']['policy']}]: ").strip().upper()
-            if policy_input:
-                hg_data['callPolicies']['policy'] = policy_input
-            rings_input = input(f"  Next Agent Rings [{hg_data['callPolicies']['noAnswer']['nextAgentRings']}]: ").strip()
-            if rings_input:
-                hg_data['callPolicies']['noAnswer']['nextAgentRings'] = int(rings_input)
-        
-        # Create hunt group
-        print(f"\n  Creating hunt group...")
-        result = api.call("POST", f"telephony/config/locations/{location_data['id']}/huntGroups",
-                         data=hg_data, params={"orgId": api.org_id})
-        
+        entry = entries[int(choice) - 1]
+        edit_hunt_group(entry)
+        classify_hunt_group(entry, existing, journal)
+        print_hunt_group_table(entries, timezone)
+
+    counts = {}
+    for entry in entries:
+        counts[entry['action']] = counts.get(entry['action'], 0) + 1
+    to_create = [entry for entry in entries if entry['action'] == 'create']
+
+    if not to_create:
+        print("\n  No hunt groups to create")
+        return counts, []
+
+    if not prompts.confirm("aso.create_hunt_group", f"\nCreate {len(to_create)} hunt group(s)? (Y/n): "):
+        print("  Skipped")
+        return counts, []
+
+    print(f"\n  Creating {len(to_create)} hunt group(s)...")
+    create = lambda entry: api.call("POST", f"telephony/config/locations/{location_data['id']}/huntGroups",
+                                    data=build_hunt_group_payload(entry['hg'], entry['agent_ids'], timezone),
+                                    params={"orgId": api.org_id})
+    counts.pop('create')
+    failures = []
+    for entry, result in run_concurrently(create, to_create, workers):
         if "error" in result:
-            print(f"  Error: {result['error']}")
-            print(f"  Please check manually in Control Hub")
+            counts['failed'] = counts.get('failed', 0) + 1
+            failures.append((entry['hg']['name'], result['error']))
+            print(f"  Error: '{entry['hg']['name']}': {result['error']}")
         else:
-            print(f"  Success: Hunt group created successfully!")
+            counts['created'] = counts.get('created', 0) + 1
+            print(f"  Success: Hunt group '{entry['hg']['name']}' created")
+            if journal:
+                journal.record(RUN_KEY, entry['journal_step'], id=result.get('id'))
+
+    if counts.get('failed'):
+        print(f"  Please check the failed hunt groups manually in Control Hub")
+    print(f"\n  Hunt groups: {', '.join(f'{count} {action}' for action, count in counts.items())}")
+    return counts, failures
@@ -0,0 +1,128 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import itertools
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+from libraries.adaptive_limiter import endpoint_family
+
+PLAN_DIR = "plans"
+
+# Used for families with no measured latency yet
+DEFAULT_LATENCY = 0.5
+
+# (method, endpoint pattern, category) in match order
+OPERATION_CATEGORIES = [
+    ("POST", r"^workspaces$", "workspace"),
+    ("POST", r"^devices(/activationCode)?$", "device"),
+    ("PUT", r"^workspaces/[^/]+/features/callForwarding$", "call forwarding"),
+    ("PUT", r"^workspaces/[^/]+/features/outgoingPermission$", "outgoing permission"),
+    ("PUT", r"^telephony/config/locations/[^/]+/outgoingPermission$", "location permission"),
+    ("PUT", r"^telephony/config/devices/[^/]+/layout$", "device layout"),
+    ("POST", r"/huntGroups$", "hunt group"),
+    ("POST", r"/callParkExtensions$", "call park"),
+    ("POST", r"/schedules$", "schedule"),
+    ("POST", r"/translationPatterns$", "translation pattern")
+]
+
+def operation_category(method, endpoint):
+    for category_method, pattern, category in OPERATION_CATEGORIES:
+        if method == category_method and re.search(pattern, endpoint):
+            return category
+    return f"{method} {endpoint}"
+
+class DryRunAPI:
+    """WebexAPI stand-in that sends reads but only records writes
+
+    Writes return placeholder IDs so later steps plan against them, and
+    reads that mention a placeholder are answered locally.
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self.operations = []
+        self.ids = itertools.count(1)
+        # Placeholder workspace ID -> placeholder device IDs planned for it
+        self.planned_devices = {}
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+    def call(self, method, endpoint, data=None, params=None):
+        if method == "GET":
+            if "dryrun-" in endpoint:
+                return self._planned_read(endpoint)
+            return self.api.call(method, endpoint, data, params)
+
+        planned_id = f"dryrun-{next(self.ids)}"
+        data = data or {}
+        with self.lock:
+            self.operations.append({
+                'method': method,
+                'endpoint': endpoint,
+                'category': operation_category(method, endpoint),
+                'name': data.get('displayName') or data.get('name') or '',
+                'planned_id': planned_id if method == "POST" else None
+            })
+            if data.get('workspaceId'):
+                self.planned_devices.setdefault(data['workspaceId'], []).append(planned_id)
+        return {"id": planned_id, "code": "DRYRUN"} if method == "POST" else {}
+
+    def _planned_read(self, endpoint):
+        workspace = re.search(r"workspaces/(dryrun-\d+)/devices$", endpoint)
+        if workspace:
+            return {"devices": [{"id": device_id} for device_id in self.planned_devices.get(workspace.group(1), [])]}
+        return {}
+
+    def estimate_seconds(self, concurrency=1):
+        """Estimated time for the planned writes at the measured latency and current limits
+
+        Each family runs at the smaller of concurrency and its current
+        adaptive limit; families are assumed to run one after another.
+        """
+        by_family = {}
+        for operation in self.operations:
+            family = endpoint_family(operation['endpoint'])
+            by_family[family] = by_family.get(family, 0) + 1
+
+        total = 0.0
+        for family, count in by_family.items():
+            latency = self.api.latency.percentile(family, 'attempt', 50) or DEFAULT_LATENCY
+            parallel = max(1, min(concurrency, int(self.api.limiter.limit_for(family).limit)))
+            total += count * latency / parallel
+        return total
+
+    def write_plan(self, kind, input_path, concurrency=1):
+        """Print the planned operations per category and save the full ordered plan"""
+        counts = {}
+        for operation in self.operations:
+            counts[operation['category']] = counts.get(operation['category'], 0) + 1
+        estimate = self.estimate_seconds(concurrency)
+
+        print(f"\n{'='*60}")
+        print("Dry Run Plan (no writes were sent)")
+        print(f"{'='*60}")
+        for category, count in counts.items():
+            print(f"  {category:<30} {count}")
+        print(f"  {'Total API writes':<30} {len(self.operations)}")
+        print(f"  {'Estimated duration':<30} {estimate:.0f}s ({estimate / 60:.1f} min)")
+
+        os.makedirs(PLAN_DIR, exist_ok=True)
+        path = os.path.join(PLAN_DIR, f"dryrun_{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump({
+                'kind': kind,
+                'input': os.path.abspath(input_path),
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'counts': counts,
+                'estimated_seconds': round(estimate, 1),
+                'operations': [dict(operation, seq=seq) for seq, operation in enumerate(self.operations, 1)]
+            }, f, indent=2)
+        print(f"  Plan written to {path}")
+        print(f"{'='*60}")
+        return path
@@ -0,0 +1,83 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import json
+import os
+from datetime import datetime
+
+from libraries.dry_run import PLAN_DIR
+from libraries.reconcile import fetch_org_state, org_fingerprint
+from libraries.run_journal import hash_file
+
+PLAN_FORMAT = "webex-cli-plan"
+PLAN_VERSION = 1
+
+def default_plan_path(kind):
+    return os.path.join(PLAN_DIR, f"{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.plan.json")
+
+def save_plan(path, kind, api, input_path, org_state, payload):
+    """Write a validated run to a plan file, returning the path
+
+    The plan records the input's hash and a fingerprint of the org state
+    the pre-flight saw, so execution can refuse to run against a changed org.
+    """
+    plan = {
+        'format': PLAN_FORMAT,
+        'version': PLAN_VERSION,
+        'kind': kind,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'org_id': api.org_id,
+        'input': os.path.abspath(input_path),
+        'input_hash': hash_file(input_path),
+        'location_ids': org_state['location_ids'],
+        'org_fingerprint': org_fingerprint(org_state),
+        'payload': payload
+    }
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        # Spreadsheet cells may hold dates; they are stored as text
+        json.dump(plan, f, separators=(',', ':'), default=str)
+    os.replace(temp_path, path)
+
+    print(f"\nPlan saved to {path}")
+    print(f"Run it later with: python webex.py execute-plan {path}")
+    return path
+
+def load_plan(path, api):
+    """Read a plan file and check it can run against this org, returning the plan or None"""
+    try:
+        with open(path, 'r') as f:
+            plan = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read plan {path}: {e}")
+        return None
+
+    if plan.get('format') != PLAN_FORMAT:
+        print(f"Error: {path} is not a plan file")
+        return None
+    if plan.get('version') != PLAN_VERSION:
+        print(f"Error: Plan version {plan.get('version')} is not supported (expected {PLAN_VERSION}); save the plan again")
+        return None
+    if plan['org_id'] != api.org_id:
+        print(f"Error: Plan was made for organization {plan['org_id']}, not {api.org_id}")
+        return None
+
+    print(f"\nLoaded {plan['kind']} plan created {plan['created']} from {plan['input']}")
+    return plan
+
+def verify_org_state(api, plan):
+    """Re-fetch the org state and compare it with the plan's fingerprint"""
+    state = fetch_org_state(api, plan['location_ids'])
+    if state is None:
+        print("Error: Could not fetch organization state to verify the plan")
+        return False
+
+    if org_fingerprint(state) != plan['org_fingerprint']:
+        print("Error: Organization state changed since the plan was made "
+              "(workspaces, devices or numbers differ). Save a new plan before running.")
+        return False
+
+    print("  Organization state matches the plan")
+    return True
@@ -0,0 +1,100 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from libraries.priority import submit_with_priority
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class LatencyStats:
+    """Sliding windows of request latency per endpoint family
+
+    'attempt' holds the latency of every request sent; 'observed' holds how
+    long GET callers actually waited, which hedging brings below 'attempt'.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, family, kind, latency):
+        with self.lock:
+            self.samples.setdefault((family, kind), deque(maxlen=self.window)).append(latency)
+
+    def percentile(self, family, kind, pct, min_samples=1):
+        with self.lock:
+            values = list(self.samples.get((family, kind), []))
+        return percentile(values, pct) if len(values) >= min_samples else None
+
+    def families(self):
+        with self.lock:
+            return sorted({family for family, _ in self.samples})
+
+class Hedger:
+    """Run an idempotent request, sending a second copy if the first outlives the family's p95
+
+    Hedges are capped at max_ratio of the requests run, and never sent
+    sooner than min_delay so scheduling jitter on fast endpoints does not
+    double the traffic.
+    """
+
+    def __init__(self, stats, workers=32, min_samples=20, min_delay=0.05, max_ratio=0.1):
+        self.stats = stats
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+        self.runs = 0
+        self.sent = {}
+        self.won = {}
+        self.lock = threading.Lock()
+
+    def run(self, family, send):
+        with self.lock:
+            self.runs += 1
+            within_budget = sum(self.sent.values()) < self.runs * self.max_ratio
+        threshold = self.stats.percentile(family, 'attempt', 95, self.min_samples)
+        if threshold is None or not within_budget:
+            return send()
+        threshold = max(threshold, self.min_delay)
+
+        primary = submit_with_priority(self.executor, send)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        # Goes through send like any other request, so it takes a limiter slot
+        hedge = submit_with_priority(self.executor, send)
+        with self.lock:
+            self.sent[family] = self.sent.get(family, 0) + 1
+
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        if primary in done:
+            return primary.result()
+
+        with self.lock:
+            self.won[family] = self.won.get(family, 0) + 1
+        return hedge.result()
+
+def print_latency_metrics(stats, hedger=None):
+    """Print attempt and caller-observed latency percentiles per family, with hedge counts"""
+    families = stats.families()
+    if not families:
+        return
+
+    print("\nRequest latency (seconds, this session):")
+    print(f"  {'Family':<18} {'p50':<7} {'p95':<7} {'p99':<7} {'GET p99 seen':<13} {'Hedges':<7} Hedge wins")
+    for family in families:
+        row = [stats.percentile(family, 'attempt', pct) for pct in [50, 95, 99]]
+        row.append(stats.percentile(family, 'observed', 99))
+        cells = ' '.join(f"{value:<7.2f}" if value is not None else f"{'-':<7}" for value in row[:3])
+        seen = f"{row[3]:.2f}" if row[3] is not None else '-'
+        sent = hedger.sent.get(family, 0) if hedger else 0
+        won = hedger.won.get(family, 0) if hedger else 0
+        print(f"  {family:<18} {cells} {seen:<13} {sent:<7} {won}")
@@ -0,0 +1,168 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import re
+import sys
+import threading
+from array import array
+
+def normalize_mac(mac):
+    """Upper-case MAC address without separators"""
+    return re.sub(r'[^0-9A-Fa-f]', '', mac or '').upper()
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class ValueTable:
+    """Repeated values (location IDs, workspace types, device models) stored once
+
+    Each distinct value gets a small integer code, so a column of them is an
+    array of codes rather than a list of references.
+    """
+
+    def __init__(self):
+        self.values = [None]
+        self.codes = {None: 0}
+
+    def code(self, value):
+        if isinstance(value, list):
+            value = tuple(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(intern_text(value))
+        return code
+
+class WorkspaceRecord:
+    __slots__ = ('id', 'name', 'location_id', 'type', 'supported_devices', 'extension', 'phone_number')
+
+    def __init__(self, id, name, location_id, type, supported_devices, extension, phone_number):
+        self.id = id
+        self.name = name
+        self.location_id = location_id
+        self.type = type
+        self.supported_devices = supported_devices
+        self.extension = extension
+        self.phone_number = phone_number
+
+class DeviceRecord:
+    __slots__ = ('id', 'mac', 'model', 'workspace_id')
+
+    def __init__(self, id, mac, model, workspace_id):
+        self.id = id
+        self.mac = mac
+        self.model = model
+        self.workspace_id = workspace_id
+
+class Inventory:
+    """Workspaces and devices of an org held as columns, with O(1) lookups
+
+    Only the fields search and reconciliation use are kept; the rest of each
+    API item is dropped as its page arrives. Repeated values are coded
+    through a ValueTable into array columns, IDs are interned so a device's
+    workspace ID shares its workspace's string, and the lookups map
+    ID, name, (location, extension) and MAC to a column position.
+    Records returned by lookups are built on demand.
+
+    Pages may be added from several threads at once.
+    """
+
+    def __init__(self):
+        self.values = ValueTable()
+        self.lock = threading.Lock()
+        # Workspace columns; position i in each is the same workspace
+        self.workspace_ids = []
+        self.names = []
+        self.extensions = []
+        self.phone_numbers = []
+        self.locations = array('I')
+        self.types = array('I')
+        self.supported_devices = array('I')
+        # Device columns
+        self.device_ids = []
+        self.macs = []
+        self.models = array('I')
+        self.device_workspaces = []
+        # Lookup key -> column position
+        self.by_id = {}
+        self.by_name = {}
+        self.by_extension = {}
+        self.by_mac = {}
+
+    def add_workspaces(self, items):
+        """Add a page of workspace items from GET workspaces"""
+        with self.lock:
+            for ws in items:
+                position = len(self.workspace_ids)
+                workspace_id = intern_text(ws.get('id'))
+                name = ws.get('displayName') or ''
+                calling = (ws.get('calling') or {}).get('webexCalling') or {}
+                extension = str(calling.get('extension') or '')
+                location = self.values.code(ws.get('locationId'))
+
+                self.workspace_ids.append(workspace_id)
+                self.names.append(name)
+                self.extensions.append(extension)
+                self.phone_numbers.append(calling.get('phoneNumber') or '')
+                self.locations.append(location)
+                self.types.append(self.values.code(ws.get('type')))
+                self.supported_devices.append(self.values.code(ws.get('supportedDevices')))
+
+                self.by_id[workspace_id] = position
+                name_key = name.strip().lower()
+                # Reuse the name itself as the key when it is already normalized
+                self.by_name[name if name_key == name else name_key] = position
+                if extension:
+                    self.by_extension[(location, extension)] = position
+
+    def add_devices(self, items):
+        """Add a page of device items from GET devices"""
+        with self.lock:
+            for device in items:
+                position = len(self.device_ids)
+                mac = normalize_mac(device.get('mac'))
+
+                self.device_ids.append(device.get('id'))
+                self.macs.append(mac)
+                self.models.append(self.values.code(device.get('product')))
+                self.device_workspaces.append(intern_text(device.get('workspaceId')))
+
+                if mac:
+                    self.by_mac[mac] = position
+
+    def workspace(self, position):
+        values = self.values.values
+        return WorkspaceRecord(self.workspace_ids[position], self.names[position],
+                               values[self.locations[position]], values[self.types[position]],
+                               values[self.supported_devices[position]], self.extensions[position],
+                               self.phone_numbers[position])
+
+    def device(self, position):
+        return DeviceRecord(self.device_ids[position], self.macs[position],
+                            self.values.values[self.models[position]], self.device_workspaces[position])
+
+    def workspace_by_id(self, workspace_id):
+        position = self.by_id.get(workspace_id)
+        return None if position is None else self.workspace(position)
+
+    def workspace_by_name(self, name):
+        """Workspace with this display name, ignoring case; the last one listed if several share it"""
+        position = self.by_name.get((name or '').strip().lower())
+        return None if position is None else self.workspace(position)
+
+    def workspace_by_extension(self, location_id, extension):
+        location = self.values.codes.get(location_id)
+        position = self.by_extension.get((location, str(extension).strip())) if location else None
+        return None if position is None else self.workspace(position)
+
+    def device_by_mac(self, mac):
+        position = self.by_mac.get(normalize_mac(mac))
+        return None if position is None else self.device(position)
+
+    def named_workspaces(self):
+        """One workspace per distinct name, as workspace_by_name returns them"""
+        return (self.workspace(position) for position in self.by_name.values())
+
+    def indexed_devices(self):
+        """One device per distinct MAC, as device_by_mac returns them"""
+        return (self.device(position) for position in self.by_mac.values())
@@ -0,0 +1,33 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import contextvars
+from contextlib import contextmanager
+
+# Share of a family's in-flight slots each class gets while all are waiting
+PRIORITY_WEIGHTS = {
+    'interactive': 8,
+    'validation': 4,
+    'bulk': 2,
+    'background': 1
+}
+
+_current = contextvars.ContextVar('request_priority', default='interactive')
+
+@contextmanager
+def request_priority(name):
+    """Send requests made inside the block (and in workers started from it) in the given class"""
+    if name not in PRIORITY_WEIGHTS:
+        raise ValueError(f"Unknown request priority '{name}'")
+    token = _current.set(name)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+def current_priority():
+    return _current.get()
+
+def submit_with_priority(executor, func, *args):
+    """executor.submit that keeps the caller's request priority in the worker thread"""
+    return executor.submit(contextvars.copy_context().run, func, *args)
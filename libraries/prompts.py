@@ -0,0 +1,84 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import json
+from contextlib import contextmanager
+
+# Answers used instead of input() when running headless; None means interactive
+_headless = None
+
+class PromptRequired(Exception):
+    """Raised in headless mode when a prompt has no answer in flags or the policy file"""
+    def __init__(self, key, message):
+        super().__init__(f"No answer provided for prompt '{key}': {message.strip()}")
+        self.key = key
+
+def load_policy_file(filepath):
+    """Load prompt answers from a JSON policy file ({"answers": {...}} or a flat object)"""
+    with open(filepath, 'r') as f:
+        policy = json.load(f)
+
+    if not isinstance(policy, dict):
+        raise ValueError("Policy file must contain a JSON object")
+
+    return policy.get('answers', policy)
+
+def set_headless(answers=None, assume_yes=False):
+    """Switch prompts to headless mode, answering from the given dict"""
+    global _headless
+    _headless = {'answers': dict(answers or {}), 'assume_yes': assume_yes}
+
+def is_headless():
+    return _headless is not None
+
+@contextmanager
+def answered(answers):
+    """Answer prompts from the given dict while the block runs, as in headless mode
+
+    For work that must not stop for input, such as sites imported in worker
+    threads. Answers given earlier in headless mode still apply; the
+    previous mode is restored afterwards.
+    """
+    global _headless
+    previous = _headless
+    merged = dict(previous['answers']) if previous else {}
+    merged.update(answers)
+    _headless = {'answers': merged, 'assume_yes': bool(previous and previous['assume_yes'])}
+    try:
+        yield
+    finally:
+        _headless = previous
+
+def _headless_answer(key, message):
+    if key in _headless['answers']:
+        return _headless['answers'][key]
+    raise PromptRequired(key, message)
+
+def confirm(key, message, default=True):
+    """Ask a yes/no question; Enter selects the default"""
+    if is_headless():
+        if key not in _headless['answers'] and _headless['assume_yes']:
+            return True
+        answer = _headless_answer(key, message)
+        if isinstance(answer, bool):
+            return answer
+        answer = str(answer).strip().lower()
+    else:
+        answer = input(message).strip().lower()
+
+    if answer == '':
+        return default
+    return answer in ['y', 'yes', 'true']
+
+def ask(key, message, default=""):
+    """Ask for a free text answer; Enter selects the default"""
+    if is_headless():
+        answer = _headless_answer(key, message)
+        return str(answer).strip() or default
+    return input(message).strip() or default
+
+def acknowledge(message):
+    """Pause until the operator presses Enter; never blocks in headless mode"""
+    if is_headless():
+        return
+    input(message)
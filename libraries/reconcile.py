@@ -0,0 +1,153 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import hashlib
+import json
+
+from libraries.concurrency import ADAPTIVE_WORKERS, run_concurrently
+from libraries.inventory import Inventory, normalize_mac
+
+PAGE_SIZE = 1000
+
+def normalize_phone(phone):
+    """E.164 form of a 10-digit or +1 number, or '' if empty"""
+    phone = str(phone or '').strip()
+    if not phone:
+        return ''
+    if phone.startswith('+'):
+        return phone
+    return f"+1{phone}" if len(phone) == 10 else phone
+
+def fetch_org_state(api, location_ids, workers=ADAPTIVE_WORKERS):
+    """Fetch existing workspaces, devices and location numbers once and index them in memory
+
+    Workspaces and devices go into a compact Inventory page by page, so the
+    raw API items are never all held at once.
+    """
+    print("\nPre-flight: Fetching existing organization state...")
+
+    inventory = Inventory()
+    numbers = {location_id: [] for location_id in set(location_ids)}
+    fetches = [('workspaces', 'items', {"orgId": api.org_id, "max": PAGE_SIZE}, inventory.add_workspaces),
+               ('devices', 'items', {"orgId": api.org_id, "max": PAGE_SIZE}, inventory.add_devices)]
+    for location_id in sorted(numbers):
+        fetches.append(('telephony/config/numbers', 'phoneNumbers',
+                        {"orgId": api.org_id, "locationId": location_id, "max": PAGE_SIZE}, numbers[location_id].extend))
+
+    for (endpoint, items_key, params, handle_page), error in run_concurrently(
+            lambda f: api.each_page(f[0], f[3], f[1], params=f[2]), fetches, workers):
+        if error:
+            print(f"  Error fetching {endpoint}: {error['error']}")
+            return None
+
+    state = {
+        'location_ids': sorted(numbers),
+        'inventory': inventory,
+        'extensions': {},
+        'phone_numbers': {}
+    }
+
+    for location_id, location_numbers in numbers.items():
+        for number in location_numbers:
+            owner_id = (number.get('owner') or {}).get('id')
+            if number.get('extension'):
+                state['extensions'][(location_id, str(number['extension']))] = owner_id
+            if number.get('phoneNumber') and owner_id:
+                state['phone_numbers'][number['phoneNumber']] = owner_id
+
+    print(f"  Indexed {len(inventory.workspace_ids)} workspace(s), {len(inventory.by_mac)} device MAC(s), "
+          f"{len(state['extensions'])} extension(s)")
+    return state
+
+def org_fingerprint(state):
+    """SHA-256 over the indexed org state, to detect changes between planning and execution"""
+    parts = {
+        'workspaces': sorted(f"{ws.id}|{ws.name}|{ws.location_id}|{ws.type}|{ws.supported_devices}"
+                             for ws in state['inventory'].named_workspaces()),
+        'devices': sorted(f"{device.mac}|{device.workspace_id}" for device in state['inventory'].indexed_devices()),
+        'extensions': sorted(f"{location_id}|{extension}|{owner}"
+                             for (location_id, extension), owner in state['extensions'].items()),
+        'phone_numbers': sorted(f"{number}|{owner}" for number, owner in state['phone_numbers'].items())
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+def classify_row(state, name, location_id=None, extension='', phone_number='', mac='', workspace_type=None,
+                 supported_devices=None):
+    """Classify a desired workspace as create, skip (present and identical) or conflict
+
+    workspace_type and supported_devices are compared (ignoring case) with an
+    existing workspace when given. Returns (action, existing workspace ID or None, list of reasons).
+    """
+    extension = str(extension or '').strip()
+    phone_number = normalize_phone(phone_number)
+    mac = normalize_mac(mac)
+
+    existing = state['inventory'].workspace_by_name(name)
+    existing_id = existing.id if existing else None
+    reasons = []
+
+    if extension and location_id:
+        owner = state['extensions'].get((location_id, extension))
+        if owner and owner != existing_id:
+            reasons.append(f"extension {extension} is assigned to another owner")
+        elif existing and not owner:
+            reasons.append(f"existing workspace does not have extension {extension}")
+
+    if phone_number:
+        owner = state['phone_numbers'].get(phone_number)
+        if owner and owner != existing_id:
+            reasons.append(f"phone number {phone_number} is assigned to another owner")
+        elif existing and not owner:
+            reasons.append(f"existing workspace does not have phone number {phone_number}")
+
+    if mac:
+        device = state['inventory'].device_by_mac(mac)
+        if device and device.workspace_id != existing_id:
+            reasons.append(f"MAC {mac} is registered to another workspace")
+
+    if existing and location_id and existing.location_id and existing.location_id != location_id:
+        reasons.append("existing workspace is in a different location")
+
+    if existing and workspace_type and existing.type and existing.type.lower() != workspace_type.lower():
+        reasons.append(f"existing workspace type is {existing.type}, not {workspace_type}")
+
+    if existing and supported_devices and existing.supported_devices and \
+            existing.supported_devices.lower() != supported_devices.lower():
+        reasons.append(f"existing workspace supports {existing.supported_devices}, not {supported_devices}")
+
+    if reasons:
+        return 'conflict', existing_id, reasons
+    if existing:
+        return 'skip', existing_id, []
+    return 'create', None, []
+
+def device_missing(state, workspace_id, mac):
+    """True when a skipped workspace still lacks the device requested by its row"""
+    if not normalize_mac(mac):
+        return False
+    device = state['inventory'].device_by_mac(mac)
+    return device is None or device.workspace_id != workspace_id
+
+def print_reconciliation(classified):
+    """Print counts per action and the reasons for each conflict
+
+    classified is an iterable of (row number, name, action, reasons) tuples;
+    only the conflicts are kept while it is read.
+    """
+    counts = {'create': 0, 'skip': 0, 'conflict': 0}
+    conflicts = []
+    for entry in classified:
+        counts[entry[2]] += 1
+        if entry[2] == 'conflict':
+            conflicts.append(entry)
+
+    print(f"\n  Pre-flight result: {counts['create']} to create, {counts['skip']} already present, "
+          f"{counts['conflict']} conflict(s)")
+
+    if conflicts:
+        print(f"\n  {'Row':<6} {'Name':<30} {'Conflict'}")
+        print(f"  {'-'*80}")
+        for row_num, name, _, reasons in conflicts:
+            print(f"  {row_num:<6} {name:<30} {'; '.join(reasons)}")
+
+    return counts
@@ -0,0 +1,134 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import copy
+import threading
+import time
+
+from libraries.priority import request_priority
+
+# name: (endpoint, items key, label)
+DATASETS = {
+    'workspaces': ('workspaces', 'items', 'workspaces'),
+    'locations': ('locations', 'items', 'locations'),
+    'telephony_locations': ('telephony/config/locations', 'locations', 'telephony locations')
+}
+
+class ReferenceCache:
+    """Reference data warmed by a background thread while the operator reads the menus
+
+    GETs for a dataset's endpoint with only the orgId parameter are served
+    from the cache while the entry is younger than ttl. Any write to a
+    dataset's endpoint drops the entry so the next read goes to the network.
+    """
+
+    def __init__(self, api, ttl=120, refresh_interval=60, max_items=20000):
+        self.api = api
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        # Datasets larger than this are not held in memory; paging stops once it is passed
+        self.max_items = max_items
+        self.entries = {}
+        self.generations = {name: 0 for name in DATASETS}
+        self.status = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="reference-prefetch", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Cancel the background worker; an in-flight fetch is discarded"""
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+
+    def _run(self):
+        with request_priority('background'):
+            self._refresh_loop()
+
+    def _refresh_loop(self):
+        while not self.stop_event.is_set():
+            for name in DATASETS:
+                if self.stop_event.is_set():
+                    return
+                age = self.age(name)
+                if age is None or age >= self.refresh_interval:
+                    self.refresh(name)
+            self.wake_event.wait(5)
+            self.wake_event.clear()
+
+    def refresh(self, name):
+        endpoint, items_key, _ = DATASETS[name]
+        with self.lock:
+            generation = self.generations[name]
+            self.status[name] = 'loading'
+
+        items = []
+
+        def add_page(page):
+            items.extend(page)
+            return len(items) <= self.max_items and not self.stop_event.is_set()
+
+        error = self.api.each_page(endpoint, add_page, items_key, params={"orgId": self.api.org_id})
+
+        with self.lock:
+            if self.stop_event.is_set() or generation != self.generations[name]:
+                # Cancelled, or a write happened while fetching; the result may be stale
+                self.status.pop(name, None)
+                return
+            if error:
+                self.status[name] = 'error'
+                return
+            if len(items) > self.max_items:
+                self.status[name] = 'too large to cache'
+                return
+            self.entries[name] = {'result': {items_key: items}, 'fetched': time.monotonic()}
+            self.status.pop(name, None)
+
+    def age(self, name):
+        """Seconds since the dataset was fetched, or None if it is not cached"""
+        with self.lock:
+            entry = self.entries.get(name)
+        return time.monotonic() - entry['fetched'] if entry else None
+
+    def lookup(self, endpoint, params):
+        """Return a copy of a cached GET result for endpoint, or None if not cached or stale
+
+        The copy is deep, so a caller that edits the items cannot change the cache.
+        """
+        if params != {"orgId": self.api.org_id}:
+            return None
+
+        for name, (dataset_endpoint, items_key, _) in DATASETS.items():
+            if endpoint != dataset_endpoint:
+                continue
+            with self.lock:
+                entry = self.entries.get(name)
+            if entry and time.monotonic() - entry['fetched'] < self.ttl:
+                return {items_key: copy.deepcopy(entry['result'][items_key])}
+        return None
+
+    def invalidate_for(self, endpoint):
+        """Drop datasets a write to endpoint may have changed and refresh them in the background"""
+        for name, (dataset_endpoint, _, _) in DATASETS.items():
+            if endpoint == dataset_endpoint or endpoint.startswith(dataset_endpoint + '/'):
+                with self.lock:
+                    self.entries.pop(name, None)
+                    self.generations[name] += 1
+                self.wake_event.set()
+
+    def status_line(self):
+        """One-line freshness indicator for the menus"""
+        parts = []
+        for name, (_, _, label) in DATASETS.items():
+            age = self.age(name)
+            if age is not None and age < self.ttl:
+                parts.append(f"{label} {int(age)}s old")
+            else:
+                parts.append(f"{label} {self.status.get(name, 'not loaded')}")
+        return f"Cached data: {', '.join(parts)}"
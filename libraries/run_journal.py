@@ -0,0 +1,166 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from libraries import prompts
+
+JOURNAL_DIR = "journals"
+
+# Journal key for steps that belong to the whole run rather than one row
+RUN_KEY = "_run"
+
+def hash_file(filepath):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def row_key(row_num, name):
+    """Journal key for an input row; includes the name so edited rows are not mistaken for done"""
+    return f"{row_num}:{name}"
+
+class RunJournal:
+    """Append-only, fsync'd record of the steps completed in a bulk run
+
+    With path None the journal is kept in memory only (used by dry runs).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = {}
+        self.steps = {}
+        self.completed = False
+        self.lock = threading.Lock()
+        self.file = None
+
+        if path and os.path.exists(path):
+            self._load()
+        if path:
+            self.file = open(path, 'a')
+
+    def _load(self):
+        with open(self.path, 'r+') as f:
+            content = f.read()
+            if content and not content.endswith('\n'):
+                # Drop a torn final line from a crash so new entries start on a clean line;
+                # the step it described is simply redone
+                content = content[:content.rfind('\n') + 1]
+                f.seek(0)
+                f.truncate(len(content.encode()))
+
+        for line in content.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get('type') == 'run':
+                self.header = entry
+            elif entry.get('type') == 'step':
+                self.steps.setdefault(entry['row'], {})[entry['step']] = entry.get('data', {})
+            elif entry.get('type') == 'complete':
+                self.completed = True
+
+    def _append(self, entry):
+        if self.file is None:
+            return
+        with self.lock:
+            self.file.write(json.dumps(entry) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def start(self, kind, input_path):
+        self.header = {
+            'type': 'run',
+            'kind': kind,
+            'input': os.path.abspath(input_path),
+            'input_hash': hash_file(input_path),
+            'started': datetime.now().isoformat(timespec='seconds')
+        }
+        self._append(self.header)
+
+    def record(self, key, step, **data):
+        """Mark a step as done for a row, with any IDs it created"""
+        with self.lock:
+            self.steps.setdefault(key, {})[step] = data
+        self._append({'type': 'step', 'row': key, 'step': step, 'data': data})
+
+    def is_done(self, key, step):
+        return step in self.steps.get(key, {})
+
+    def get(self, key, step):
+        return self.steps.get(key, {}).get(step)
+
+    def step_count(self):
+        return sum(len(steps) for steps in self.steps.values())
+
+    def complete(self):
+        self._append({'type': 'complete', 'finished': datetime.now().isoformat(timespec='seconds')})
+        self.completed = True
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+    def close_or_discard(self):
+        """Close the journal, deleting it if no step was recorded (the run never started)"""
+        self.close()
+        if self.path and not self.step_count():
+            os.remove(self.path)
+
+def find_incomplete_journal(kind, input_path):
+    """Return the most recent unfinished journal for the same input file, if any"""
+    input_path = os.path.abspath(input_path)
+    for path in sorted(glob.glob(os.path.join(JOURNAL_DIR, f"{kind}_*.jsonl")), reverse=True):
+        journal = RunJournal(path)
+        journal.close()
+        if not journal.completed and journal.header.get('input') == input_path:
+            return path
+    return None
+
+def open_run_journal(kind, input_path, resume=None):
+    """Open the journal for a bulk run, resuming a previous one when requested or confirmed
+
+    resume may be a journal path, True to pick the latest unfinished journal for
+    input_path, False to always start fresh, or None to ask when an unfinished
+    journal exists.
+    """
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+
+    resume_path = None
+    if isinstance(resume, str):
+        resume_path = resume
+    elif resume is not False:
+        previous = find_incomplete_journal(kind, input_path)
+        if previous and (resume or prompts.confirm(
+                "resume_journal", f"\nUnfinished run found in {previous}. Resume it? (Y/n): ")):
+            resume_path = previous
+
+    if resume_path:
+        if not os.path.exists(resume_path):
+            print(f"Error: Journal not found: {resume_path}")
+            return None
+        journal = RunJournal(resume_path)
+        print(f"Resuming from journal {resume_path} ({journal.step_count()} completed step(s))")
+        if journal.header.get('input_hash') != hash_file(input_path):
+            print("  Note: Input file changed since the journal was written; rows whose name changed will be redone")
+        return journal
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(JOURNAL_DIR, f"{kind}_{timestamp}.jsonl")
+    # Runs started in the same second, such as the sites of a multi-site import, each get their own file
+    suffix = 2
+    while os.path.exists(path):
+        path = os.path.join(JOURNAL_DIR, f"{kind}_{timestamp}_{suffix}.jsonl")
+        suffix += 1
+    journal = RunJournal(path)
+    journal.start(kind, input_path)
+    print(f"Run journal: {journal.path}")
+    return journal
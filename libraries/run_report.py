@@ -0,0 +1,65 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import csv
+import json
+import os
+from datetime import datetime
+
+REPORT_DIR = "reports"
+REPORT_FIELDS = ['row', 'name', 'status', 'workspace_id', 'error']
+
+def default_report_path(kind):
+    return os.path.join(REPORT_DIR, f"{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+
+class RunReport:
+    """Per-row results written to a CSV or JSONL file as they complete
+
+    Only the counts per status stay in memory. The format follows the file
+    extension (.jsonl for JSON lines, anything else CSV). With path None
+    nothing is written and only the counts are kept (used by dry runs).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.counts = {}
+        self.total = 0
+        self.file = None
+        self.writer = None
+        self.jsonl = bool(path) and path.endswith('.jsonl')
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.file = open(path, 'w', newline='')
+            if not self.jsonl:
+                self.writer = csv.DictWriter(self.file, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+                self.writer.writeheader()
+
+    def add(self, result):
+        self.counts[result['status']] = self.counts.get(result['status'], 0) + 1
+        self.total += 1
+        if self.file:
+            if self.jsonl:
+                self.file.write(json.dumps(result, default=str) + "\n")
+            else:
+                self.writer.writerow(result)
+            self.file.flush()
+
+    def count(self, status):
+        return self.counts.get(status, 0)
+
+    def results(self):
+        """Read the written results back one at a time"""
+        if not self.path:
+            return
+        with open(self.path, 'r', newline='') as f:
+            if self.jsonl:
+                for line in f:
+                    yield json.loads(line)
+            else:
+                for row in csv.DictReader(f):
+                    yield row
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -2,137 +2,150 @@
 # Licensed under the MIT License - see LICENSE file for details
 
 from datetime import datetime
+from libraries import prompts
+from libraries.concurrency import ADAPTIVE_WORKERS, run_concurrently
 
 VALID_SCHEDULES = ["24-7", "8-5NBD"]
 
-def get_schedule_template(schedule_name):
-    """Get schedule template based on name"""
-    start_date = datetime.now().strftime("%Y-%m-%d")
-    
-    if schedule_name == "24-7":
-        return {
-            "type": "businessHours",
-            "name": "24-7",
-            "events": [
-                {
-                    "name": "Monday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"monday": True}}
-                },
-                {
-                    "name": "Tuesday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"tuesday": True}}
-                },
-                {
-                    "name": "Wednesday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"wednesday": True}}
-                },
-                {
-                    "name": "Thursday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"thursday": True}}
-                },
-                {
-                    "name": "Friday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"friday": True}}
-                },
-                {
-                    "name": "Saturday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"saturday": True}}
-                },
-                {
-                    "name": "Sunday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "allDayEnabled": True,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"sunday": True}}
-                }
-            ]
-        }
-    elif schedule_name == "8-5NBD":
-        return {
-            "type": "businessHours",
-            "name": "8-5NBD",
-            "events": [
-                {
-                    "name": "Monday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "startTime": "08:00",
-                    "endTime": "17:00",
-                    "allDayEnabled": False,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"monday": True}}
-                },
-                {
-                    "name": "Tuesday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "startTime": "08:00",
-                    "endTime": "17:00",
-                    "allDayEnabled": False,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"tuesday": True}}
-                },
-                {
-                    "name": "Wednesday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "startTime": "08:00",
-                    "endTime": "17:00",
-                    "allDayEnabled": False,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"wednesday": True}}
-                },
-                {
-                    "name": "Thursday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "startTime": "08:00",
-                    "endTime": "17:00",
-                    "allDayEnabled": False,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"thursday": True}}
-                },
-                {
-                    "name": "Friday",
-                    "startDate": start_date,
-                    "endDate": start_date,
-                    "startTime": "08:00",
-                    "endTime": "17:00",
-                    "allDayEnabled": False,
-                    "recurrence": {"recurForEver": True, "recurWeekly": {"friday": True}}
-                }
-            ]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday"]
+ALL_DAYS = WEEKDAYS + ["saturday", "sunday"]
+
+# name: (days, start time, end time); no times means all day
+SCHEDULE_SPECS = {
+    "24-7": (ALL_DAYS, None, None),
+    "8-5NBD": (WEEKDAYS, "08:00", "17:00")
+}
+
+# (name, start date) -> compiled template; shared, so callers must not modify it
+_compiled_templates = {}
+
+def compile_schedule_template(schedule_name, start_date):
+    days, start_time, end_time = SCHEDULE_SPECS[schedule_name]
+    events = []
+    for day in days:
+        event = {
+            "name": day.capitalize(),
+            "startDate": start_date,
+            "endDate": start_date
         }
-    return None
+        if start_time:
+            event["startTime"] = start_time
+            event["endTime"] = end_time
+        event["allDayEnabled"] = not start_time
+        event["recurrence"] = {"recurForEver": True, "recurWeekly": {day: True}}
+        events.append(event)
+    return {"type": "businessHours", "name": schedule_name, "events": events}
+
+def get_schedule_template(schedule_name):
+    """Get schedule template based on name, compiled once per day and reused"""
+    if schedule_name not in SCHEDULE_SPECS:
+        return None
+    key = (schedule_name, datetime.now().strftime("%Y-%m-%d"))
+    if key not in _compiled_templates:
+        _compiled_templates[key] = compile_schedule_template(*key)
+    return _compiled_templates[key]
 
-def validate_and_create_schedules(api, location_id, filepath):
-    """Validate and create required schedules from Excel"""
-    from libraries.aso_bulk_import import read_excel_sheet
+class ScheduleIndex:
+    """Existing schedule IDs by location and name, fetched once per location"""
+
+    def __init__(self):
+        self.by_location = {}
+
+    def fetch(self, api, location_ids, workers=ADAPTIVE_WORKERS):
+        """Fetch the locations not yet indexed concurrently, returning {location_id: error} for failures"""
+        pending = [location_id for location_id in dict.fromkeys(location_ids) if location_id not in self.by_location]
+        fetch = lambda location_id: api.call("GET", f"telephony/config/locations/{location_id}/schedules",
+                                             params={"orgId": api.org_id})
+        errors = {}
+        for location_id, result in run_concurrently(fetch, pending, workers):
+            if "error" in result:
+                errors[location_id] = result['error']
+            else:
+                self.by_location[location_id] = {s['name']: s['id'] for s in result.get('schedules', [])}
+        return errors
+
+    def get(self, location_id, schedule_name):
+        return self.by_location.get(location_id, {}).get(schedule_name)
+
+    def add(self, location_id, schedule_name, schedule_id):
+        self.by_location.setdefault(location_id, {})[schedule_name] = schedule_id
+
+def provision_schedules(api, required, location_names=None, index=None, workers=ADAPTIVE_WORKERS):
+    """Make sure each location has its required schedules, returning {location_id: {name: id}}
+
+    required maps location IDs to the schedule names they need. Existing
+    schedules for every location are fetched concurrently into the index;
+    all missing schedules are listed under one confirmation and created
+    concurrently. Locations whose schedules could not be fetched are left out.
+    """
+    index = index or ScheduleIndex()
+    location_names = location_names or {}
+    # Messages name the location only when names are given
+    label = lambda location_id: f"{location_names[location_id]}: " if location_id in location_names else ""
+    
+    print(f"\n  Fetching existing schedules for {len(required)} location(s)...")
+    errors = index.fetch(api, required, workers)
+    for location_id, error in errors.items():
+        print(f"  Error fetching schedules: {label(location_id)}{error}")
+    
+    schedule_ids = {}
+    missing = []
+    for location_id, schedule_names in required.items():
+        if location_id in errors:
+            continue
+        schedule_ids[location_id] = {}
+        for schedule_name in sorted(schedule_names):
+            existing_id = index.get(location_id, schedule_name)
+            if existing_id:
+                schedule_ids[location_id][schedule_name] = existing_id
+                print(f"  [OK] {label(location_id)}Schedule '{schedule_name}' exists (ID: {existing_id})")
+            else:
+                missing.append((location_id, schedule_name))
+                print(f"  [MISSING] {label(location_id)}Schedule '{schedule_name}' does not exist")
+    
+    if not missing:
+        if not errors:
+            print(f"\n  All required schedules exist!")
+        return schedule_ids
+    
+    # Ask permission to create missing schedules
+    print(f"\n  Missing schedules: {', '.join(f'{label(location_id)}{name}' for location_id, name in missing)}")
+    if not prompts.confirm("aso.create_schedules", f"  Create {len(missing)} missing schedule(s)? (Y/n): "):
+        print("\n  Schedule creation skipped.")
+        print("  Please manually create these schedules in Control Hub before Auto Attendant creation.")
+        return schedule_ids
+    
+    create = lambda item: api.call("POST", f"telephony/config/locations/{item[0]}/schedules",
+                                   data=get_schedule_template(item[1]), params={"orgId": api.org_id})
+    failed = 0
+    for (location_id, schedule_name), result in run_concurrently(create, missing, workers):
+        if "error" in result:
+            failed += 1
+            print(f"    Error: {label(location_id)}'{schedule_name}': {result['error']}")
+            print(f"    Please manually create '{schedule_name}' in Control Hub")
+        else:
+            schedule_id = result.get('id')
+            index.add(location_id, schedule_name, schedule_id)
+            schedule_ids[location_id][schedule_name] = schedule_id
+            print(f"    Success: {label(location_id)}Schedule '{schedule_name}' created (ID: {schedule_id})")
     
+    if failed:
+        print("\n  Some schedules failed to create.")
+        print("  Please manually create missing schedules in Control Hub.")
+    return schedule_ids
+
+def read_required_schedules(filepath, read_sheet):
+    """Validate the Auto Attendant schedule names, returning the set of schedules needed or None"""
     print(f"\n{'='*60}")
     print("Schedule Validation")
     print(f"{'='*60}")
     
     # Read Webex Auto Attendant sheet
-    aa_data = read_excel_sheet(filepath, 'Webex Auto Attendant')
+    aa_data = read_sheet(filepath, 'Webex Auto Attendant')
     if not aa_data or len(aa_data) < 30:
         print("  Error: Could not read Auto Attendant data")
-        input("  Press Enter to continue...")
-        return {}
+        prompts.acknowledge("  Press Enter to continue...")
+        return None
     
     # Extract schedule names from J23-J29 (column index 9, rows 22-28)
     days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
@@ -157,8 +170,8 @@ def validate_and_create_schedules(api, location_id, filepath):
         for error in errors:
             print(f"    - {error}")
         print("\n  Please fix schedule names in Excel (cells J23-J29)")
-        input("  Press Enter to acknowledge and continue...")
-        return {}
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
+        return None
     
     # Display schedule table
     print("\n  Required Schedules:")
@@ -170,67 +183,21 @@ def validate_and_create_schedules(api, location_id, filepath):
     # Get unique schedules
     unique_schedules = set(schedule_map.values())
     print(f"\n  Unique schedules needed: {', '.join(unique_schedules)}")
+    return unique_schedules
+
+def validate_and_create_schedules(api, location_id, filepath, read_sheet=None):
+    """Validate and create required schedules from Excel; read_sheet defaults to reading the workbook"""
+    if read_sheet is None:
+        from libraries.aso_bulk_import import read_excel_sheet as read_sheet
     
-    # Fetch existing schedules
-    print(f"\n  Fetching existing schedules from location...")
-    result = api.call("GET", f"telephony/config/locations/{location_id}/schedules", 
-                     params={"orgId": api.org_id})
-    
-    if "error" in result:
-        print(f"  Error fetching schedules: {result['error']}")
-        input("  Press Enter to continue...")
+    unique_schedules = read_required_schedules(filepath, read_sheet)
+    if unique_schedules is None:
         return {}
     
-    existing_schedules = {s['name']: s['id'] for s in result.get('schedules', [])}
-    schedule_ids = {}
-    
-    # Check which schedules exist
-    missing_schedules = []
-    for schedule_name in unique_schedules:
-        if schedule_name in existing_schedules:
-            schedule_ids[schedule_name] = existing_schedules[schedule_name]
-            print(f"  [OK] Schedule '{schedule_name}' exists (ID: {existing_schedules[schedule_name]})")
-        else:
-            missing_schedules.append(schedule_name)
-            print(f"  [MISSING] Schedule '{schedule_name}' does not exist")
-    
-    if not missing_schedules:
-        print(f"\n  All required schedules exist!")
-        return schedule_ids
-    
-    # Ask permission to create missing schedules
-    print(f"\n  Missing schedules: {', '.join(missing_schedules)}")
-    create = input("  Create missing schedules? (Y/n): ").strip().lower()
-    
-    if create not in ['', 'y', 'yes']:
-        print("\n  Schedule creation skipped.")
-        print("  Please manually create these schedules in Control Hub before Auto Attendant creation.")
-        input("  Press Enter to acknowledge and continue...")
-        return schedule_ids
-    
-    # Create missing schedules
-    for schedule_name in missing_schedules:
-        print(f"\n  Creating schedule '{schedule_name}'...")
-        
-        schedule_data = get_schedule_template(schedule_name)
-        if not schedule_data:
-            print(f"    Error: No template for '{schedule_name}'")
-            continue
-        
-        result = api.call("POST", f"telephony/config/locations/{location_id}/schedules",
-                         data=schedule_data, params={"orgId": api.org_id})
-        
-        if "error" in result:
-            print(f"    Error: {result['error']}")
-            print(f"    Please manually create '{schedule_name}' in Control Hub")
-        else:
-            schedule_id = result.get('id')
-            schedule_ids[schedule_name] = schedule_id
-            print(f"    Success: Schedule created (ID: {schedule_id})")
-    
+    schedule_ids = provision_schedules(api, {location_id: unique_schedules}).get(location_id)
+    if schedule_ids is None:
+        prompts.acknowledge("  Press Enter to continue...")
+        return {}
     if len(schedule_ids) < len(unique_schedules):
-        print("\n  Some schedules failed to create.")
-        print("  Please manually create missing schedules in Control Hub.")
-    
-    input("\n  Press Enter to continue...")
+        prompts.acknowledge("  Press Enter to acknowledge and continue...")
     return schedule_ids
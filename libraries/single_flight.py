@@ -0,0 +1,55 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Share one execution among concurrent callers asking for the same key
+
+    Only calls overlapping in time are merged; a call made after the
+    previous one finished runs again, so results are never stale.
+    When a call was shared, copy_value (if given) hands every caller,
+    the one that ran it included, its own copy of the value.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, func, copy_value=None):
+        with self.lock:
+            call = self.in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self.in_flight[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return copy_value(call.value) if copy_value else call.value
+
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            call.done.set()
+        # No caller can join once the key is removed, so waiters is final here
+        return copy_value(call.value) if copy_value and call.waiters else call.value
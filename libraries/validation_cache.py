@@ -0,0 +1,147 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import hashlib
+import json
+import os
+
+CACHE_DIR = "validation_cache"
+
+# Bump when a rule set's checks or messages change so cached results are dropped
+RULES_VERSIONS = {
+    'workspaces_csv': 1,
+    'webex_users': 2
+}
+
+# Row-specific text in cached messages; replaced with the row's current number
+ROW_PLACEHOLDER = "{row}"
+
+def row_hash(cells):
+    # repr keeps cell types apart ('4' vs 4) and is much cheaper than JSON for plain cells
+    return hashlib.sha1(repr(cells).encode()).hexdigest()
+
+def cache_path(rules, source_path):
+    source = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{rules}_{source}.json")
+
+class DuplicateIndex:
+    """Rows per key for cross-row uniqueness rules, updated one row at a time"""
+
+    def __init__(self):
+        # rule -> key -> row numbers using it
+        self.rows_by_key = {}
+        # row number -> ((rule, key), ...) it was indexed under
+        self.keys_by_row = {}
+
+    def set_row(self, row_num, keys):
+        """Index a row's keys ({rule: key}), replacing whatever the row had before"""
+        if row_num in self.keys_by_row:
+            self.remove_row(row_num)
+        indexed = tuple(item for item in keys.items() if item[1])
+        for rule, key in indexed:
+            self.rows_by_key.setdefault(rule, {}).setdefault(key, set()).add(row_num)
+        self.keys_by_row[row_num] = indexed
+
+    def remove_row(self, row_num):
+        for rule, key in self.keys_by_row.pop(row_num, []):
+            rows = self.rows_by_key[rule][key]
+            rows.discard(row_num)
+            if not rows:
+                del self.rows_by_key[rule][key]
+
+    def truncate(self, row_count_end):
+        """Drop rows numbered row_count_end or higher (the sheet got shorter)"""
+        for row_num in [r for r in self.keys_by_row if r >= row_count_end]:
+            self.remove_row(row_num)
+
+    def duplicates(self, rule):
+        """[(key, sorted row numbers)] for keys used by more than one row"""
+        return sorted((key, sorted(rows)) for key, rows in self.rows_by_key.get(rule, {}).items() if len(rows) > 1)
+
+class RowValidationCache:
+    """Per-row validation results keyed by row content hash and rule set version
+
+    A row's result is reused while its cells, the rule set version and the
+    context (headers, location names and so on) are unchanged, so a re-run
+    only re-checks edited rows. Each row also reports the keys its cross-row
+    rules use (MAC, extension), which feed a DuplicateIndex.
+    """
+
+    def __init__(self, rules, source_path, context=None):
+        self.rules = rules
+        self.version = RULES_VERSIONS[rules]
+        self.context = row_hash(context)
+        self.path = cache_path(rules, source_path)
+        self.entries = {}
+        self.used = {}
+        self.duplicates = DuplicateIndex()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get('version') == self.version and cached.get('context') == self.context:
+            self.entries = cached.get('rows', {})
+
+    def reset(self, context=None):
+        """Start a new pass, dropping cached results if the context changed"""
+        context = row_hash(context)
+        if context != self.context:
+            self.context = context
+            self.entries = {}
+            self.duplicates = DuplicateIndex()
+        else:
+            self.entries.update(self.used)
+        self.used = {}
+        self.hits = 0
+        self.misses = 0
+
+    def check(self, row_num, cells, validate):
+        """Errors for a row, running validate() only when the row is not cached
+
+        validate() returns (errors, keys); errors write the row number as
+        ROW_PLACEHOLDER and keys maps each cross-row rule to this row's key.
+        """
+        digest = row_hash(cells)
+        entry = self.used.get(digest) or self.entries.get(digest)
+        if entry is None:
+            errors, keys = validate()
+            entry = {'errors': errors, 'keys': keys}
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.used[digest] = entry
+        self.duplicates.set_row(row_num, entry['keys'])
+        return [error.replace(ROW_PLACEHOLDER, str(row_num)) for error in entry['errors']]
+
+    def finish(self, row_count_end):
+        """Forget rows past the end of the current pass"""
+        self.duplicates.truncate(row_count_end)
+
+    def save(self, complete=True):
+        """Write the cached results
+
+        After a complete pass only the rows it used are kept, so results for
+        edited-away rows do not pile up; after a pass that stopped early the
+        unvisited rows' results are kept as well.
+        """
+        rows = self.used if complete else dict(self.entries, **self.used)
+        if not self.misses and rows.keys() == self.entries.keys():
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(json.dumps({'version': self.version, 'context': self.context, 'rows': rows},
+                                   separators=(',', ':')))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"  Warning: Could not save validation cache {self.path}: {e}")
+
+    def summary(self):
+        return f"{self.misses} row(s) checked, {self.hits} unchanged row(s) reused from cache"
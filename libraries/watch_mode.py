@@ -0,0 +1,250 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import json
+import os
+import select
+import struct
+import threading
+import time
+from datetime import datetime
+
+from libraries.priority import request_priority
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+# Seconds a file must stay quiet before it is validated; spreadsheet apps save in several writes
+DEFAULT_DEBOUNCE = 0.5
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Seconds watch-mode GET results (available numbers and so on) are reused between saves
+READ_TTL = 120
+
+def is_temporary_file(name):
+    """Lock and scratch files spreadsheet apps write next to the real file"""
+    return name.startswith(('~$', '.')) or name.endswith(('#', '~')) or name.lower().endswith('.tmp')
+
+def validator_for(name):
+    """Validation chain for a file in bulk/, or None if the file is not watched"""
+    lower = name.lower()
+    if is_temporary_file(name):
+        return None
+    if lower.startswith('workspaces') and lower.endswith('.csv'):
+        return validate_workspaces_csv
+    if lower.startswith('aso_import') and lower.endswith(('.xlsx', '.xls')):
+        return validate_aso_workbook
+    return None
+
+class InotifyWatcher:
+    """Directory change notifications from inotify, called through ctypes"""
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.directory = directory
+        self.description = "inotify"
+
+    def wait(self, timeout):
+        """Names changed within timeout seconds; every name in the directory on queue overflow"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                names.update(os.listdir(self.directory))
+            elif length:
+                names.add(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Directory change detection by comparing size and modification time"""
+
+    def __init__(self, directory, interval=DEFAULT_POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.description = f"polling every {interval:g}s"
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        changed = {name for name in snapshot.keys() | self.snapshot.keys()
+                   if snapshot.get(name) != self.snapshot.get(name)}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+def open_watcher(directory, polling=False, interval=DEFAULT_POLL_INTERVAL):
+    """inotify where available, otherwise polling"""
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            # Not Linux, or out of inotify watches
+            pass
+    return PollingWatcher(directory, interval)
+
+def debounced_changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """Yield sets of changed names once no further change has arrived for debounce seconds"""
+    pending = set()
+    while True:
+        changed = watcher.wait(debounce if pending else 3600)
+        if changed:
+            pending |= changed
+        elif pending:
+            yield pending
+            pending = set()
+
+class CachedReadsAPI:
+    """WebexAPI stand-in that reuses GET results for READ_TTL seconds
+
+    Watch mode only reads, and the same location lookups repeat on every
+    save; the reference cache covers the workspace and location lists and
+    this covers the rest (available numbers, call parks and so on).
+    """
+
+    def __init__(self, api, ttl=READ_TTL):
+        self.api = api
+        self.ttl = ttl
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+    def call(self, method, endpoint, data=None, params=None):
+        if method != "GET":
+            return self.api.call(method, endpoint, data, params)
+
+        key = (endpoint, json.dumps(params or {}, sort_keys=True))
+        with self.lock:
+            cached = self.results.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        result = self.api.call(method, endpoint, data, params)
+        if "error" not in result:
+            with self.lock:
+                self.results[key] = (time.monotonic(), result)
+        return result
+
+def validate_workspaces_csv(api, filepath):
+    from libraries.bulk_create_workspaces import parse_workspaces_csv
+    return parse_workspaces_csv(api, filepath) is not None
+
+def validate_aso_workbook(api, filepath):
+    """The ASO validations that need no answers from the operator"""
+    from libraries.aso_prefetch import infer_location_name
+    from libraries.aso_validation import validate_excel_file, validate_webex_users_data, validate_available_numbers
+    from libraries.workbook import Workbook
+
+    # Each sheet is read once per save rather than once per validation
+    read_sheet = Workbook(filepath).read_sheet
+
+    is_valid, _ = validate_excel_file(filepath)
+    if not is_valid:
+        return False
+    if not validate_webex_users_data(filepath, read_sheet):
+        return False
+
+    print("\nLocation check:")
+    location_name = infer_location_name(read_sheet(filepath, 'Webex Users'))
+    if not location_name:
+        print("  Status: FAILED - No location name found in the 'Location Name' column")
+        return False
+    locations_result = api.call("GET", "telephony/config/locations", params={"orgId": api.org_id})
+    if "error" in locations_result:
+        print(f"  Status: FAILED - Error fetching locations: {locations_result['error']}")
+        return False
+    location = next((loc for loc in locations_result.get("locations", [])
+                     if loc.get('name', '').lower() == location_name.lower()), None)
+    if not location:
+        print(f"  Status: FAILED - Location '{location_name}' not found")
+        return False
+    print(f"  Status: PASS - {location['name']} ({location['id']})")
+
+    return validate_available_numbers(api, location, filepath, read_sheet)
+
+def validate_file(api, directory, name):
+    validator = validator_for(name)
+    filepath = os.path.join(directory, name)
+    if not validator or not os.path.isfile(filepath):
+        return
+
+    print(f"\n{'='*60}")
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Validating {filepath}")
+    print(f"{'='*60}")
+    start = time.monotonic()
+    try:
+        with request_priority('validation'):
+            passed = validator(api, filepath)
+    except Exception as e:
+        # A half-written file can fail to parse; the next save triggers another run
+        print(f"  Error: Could not validate {filepath}: {e}")
+        passed = False
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] {name}: {'PASS' if passed else 'FAILED'} "
+          f"({time.monotonic() - start:.2f}s)")
+
+def watch_bulk_folder(api, directory="bulk", debounce=DEFAULT_DEBOUNCE, polling=False):
+    """Validate bulk input files now and again each time one is saved, until Ctrl+C"""
+    if not os.path.isdir(directory):
+        print(f"Error: Folder not found: {directory}")
+        return False
+
+    api = CachedReadsAPI(api)
+    watcher = open_watcher(directory, polling)
+    print(f"Watching {directory}/ for changes to workspaces*.csv and aso_import*.xlsx ({watcher.description}); "
+          f"press Ctrl+C to stop")
+
+    try:
+        for name in sorted(os.listdir(directory)):
+            validate_file(api, directory, name)
+        for names in debounced_changes(watcher, debounce):
+            for name in sorted(names):
+                validate_file(api, directory, name)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
+    return True
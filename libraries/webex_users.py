@@ -0,0 +1,68 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import re
+
+# field: (template column, header names that identify it)
+WEBEX_USERS_COLUMNS = {
+    'location': (2, ['location name']),
+    'phone_number': (3, ['phone number']),
+    'extension': (4, ['extension']),
+    'user_type': (9, ['user type']),
+    'device_model': (10, ['device model']),
+    'mac_address': (11, ['mac address']),
+    'display_name': (12, ['display name']),
+    'forward_no_answer': (13, ['forward no answer']),
+    'rings': (14, ['rings before forward', 'rings']),
+    'forward_disconnect': (16, ['business continuity']),
+    'calling_permission': (18, ['calling permission'])
+}
+
+def normalize_header(header):
+    return ' '.join(str(header).split()).lower() if header is not None else ''
+
+def column_index(headers):
+    """Column of each field: the first header with one of its names, otherwise its template column (A-S)"""
+    positions = {}
+    for idx, header in enumerate(headers):
+        positions.setdefault(normalize_header(header), idx)
+    return {field: next((positions[name] for name in names if name in positions), default)
+            for field, (default, names) in WEBEX_USERS_COLUMNS.items()}
+
+def cell_text(cells, idx):
+    value = cells[idx] if idx < len(cells) else None
+    return '' if value is None else str(value).strip()
+
+class WebexUserRow:
+    """One Webex Users row, with every cell the import uses stripped once
+
+    Values are strings ('' for empty cells); user_type and
+    calling_permission are lowercased and mac is the MAC address without
+    separators, uppercased.
+    """
+
+    __slots__ = ('row_num', 'mac') + tuple(WEBEX_USERS_COLUMNS)
+
+    def __init__(self, row_num, cells, columns):
+        self.row_num = row_num
+        for field, idx in columns.items():
+            setattr(self, field, cell_text(cells, idx))
+        self.user_type = self.user_type.lower()
+        self.calling_permission = self.calling_permission.lower()
+        self.mac = re.sub(r'[-:\s]', '', self.mac_address).upper()
+
+    @property
+    def is_user(self):
+        return self.user_type == 'user'
+
+    @property
+    def needs_device(self):
+        """True when the row has both a MAC address and a device model"""
+        return bool(self.mac_address and self.device_model)
+
+def parse_webex_users(users_data):
+    """WebexUserRow records for a Webex Users sheet read as rows, header row first"""
+    if not users_data:
+        return []
+    columns = column_index(users_data[0])
+    return [WebexUserRow(row_num, cells, columns) for row_num, cells in enumerate(users_data[1:], start=2)]
@@ -0,0 +1,101 @@
+# Copyright (c) 2026 Ming Chiu
+# Licensed under the MIT License - see LICENSE file for details
+
+import os
+import threading
+import time
+
+# Tabs the ASO validation and import stages read, besides the location tab
+ASO_SHEETS = ['Webex Users', 'Webex Side Cars', 'Webex Auto Attendant', 'Webex Hunt Groups']
+
+def parse_sheet_timed(filepath, sheet_name):
+    """(rows, seconds, error) for one sheet; runs in a worker process"""
+    from libraries.aso_bulk_import import parse_excel_sheet
+    if filepath.endswith('.xlsx'):
+        # Imported before timing, so a worker's first tab is not charged for it
+        import openpyxl
+
+    start = time.perf_counter()
+    try:
+        rows = parse_excel_sheet(filepath, sheet_name)
+    except Exception as e:
+        return None, time.perf_counter() - start, str(e)
+    return rows, time.perf_counter() - start, None
+
+class Workbook:
+    """Sheets of one workbook, each parsed once and shared by every stage
+
+    read_sheet has the signature of read_excel_sheet, so it is passed to
+    the stages in its place. Sheets are parsed on first use, or all at once
+    by load(), which can spread them over a process pool: openpyxl parsing
+    is CPU-bound, so separate processes parse large tabs side by side.
+    parse_times records the seconds spent on each sheet.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.sheets = {}
+        self.parse_times = {}
+        self.lock = threading.Lock()
+
+    def _store(self, sheet_name, rows, seconds, error):
+        if error:
+            print(f"Error reading sheet '{sheet_name}': {error}")
+        with self.lock:
+            self.sheets[sheet_name] = rows
+            self.parse_times[sheet_name] = seconds
+        return rows
+
+    def read_sheet(self, filepath, sheet_name):
+        """Rows of sheet_name, or None if it could not be read"""
+        if os.path.abspath(filepath) != os.path.abspath(self.filepath):
+            from libraries.aso_bulk_import import read_excel_sheet
+            return read_excel_sheet(filepath, sheet_name)
+        with self.lock:
+            if sheet_name in self.sheets:
+                return self.sheets[sheet_name]
+        return self._store(sheet_name, *parse_sheet_timed(self.filepath, sheet_name))
+
+    def load(self, sheet_names, workers=None):
+        """Parse every sheet not yet read, in a pool of up to workers processes
+
+        Falls back to parsing in this process when only one sheet is left,
+        for .xls files (xlrd reads the whole file for any sheet) or if the
+        pool cannot start.
+        """
+        pending = [name for name in dict.fromkeys(sheet_names) if name not in self.sheets]
+        workers = min(len(pending), workers or os.cpu_count() or 1)
+        start = time.perf_counter()
+
+        parsed = False
+        if workers > 1 and self.filepath.endswith('.xlsx'):
+            parsed = self._load_in_pool(pending, workers)
+        if not parsed:
+            workers = 1
+            for sheet_name in pending:
+                self.read_sheet(self.filepath, sheet_name)
+
+        if pending:
+            print(f"Parsed {len(pending)} tab(s) in {time.perf_counter() - start:.2f}s "
+                  f"using {workers} process(es)")
+
+    def _load_in_pool(self, sheet_names, workers):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            # Spawned, not forked: the parent already runs request and keep-alive threads
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {name: pool.submit(parse_sheet_timed, self.filepath, name) for name in sheet_names}
+                for name, future in futures.items():
+                    self._store(name, *future.result())
+        except (OSError, BrokenProcessPool) as e:
+            print(f"  Warning: Parallel parsing unavailable ({e}); parsing tabs one at a time")
+            return False
+        return True
+
+    def print_parse_times(self):
+        if self.parse_times:
+            print("Tab parse times: " + ", ".join(f"{name} {seconds:.2f}s"
+                                                 for name, seconds in self.parse_times.items()))
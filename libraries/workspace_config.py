@@ -1,41 +1,33 @@
 # Copyright (c) 2026 Ming Chiu
 # Licensed under the MIT License - see LICENSE file for details
 
-import re
-from libraries.add_device import PHONE_MODELS, COLLAB_MODELS
-
-def create_workspace_from_row(api, location_data, row, headers):
-    """Create workspace from Excel row data"""
-    display_name = str(row[12]).strip() if len(row) > 12 else ""
-    phone_number = str(row[3]).strip() if len(row) > 3 and row[3] else None
-    extension = str(row[4]).strip() if len(row) > 4 else ""
-    device_model = str(row[10]).strip() if len(row) > 10 else ""
-    mac_address = str(row[11]).strip() if len(row) > 11 else ""
-    
-    if device_model in PHONE_MODELS:
-        supported_devices = "phones"
-    elif device_model in COLLAB_MODELS:
-        supported_devices = "collaborationDevices"
-    else:
-        supported_devices = "collaborationDevices"
-    
+from libraries.add_device import PHONE_MODELS
+from libraries.concurrency import ADAPTIVE_WORKERS, run_concurrently
+from libraries.run_journal import RUN_KEY
+
+def supported_devices_for_user(user):
+    """supportedDevices for a WebexUserRow's workspace, from its device model"""
+    return "phones" if user.device_model in PHONE_MODELS else "collaborationDevices"
+
+def create_workspace_from_row(api, location_data, user):
+    """Create workspace from a WebexUserRow"""
     data = {
-        "displayName": display_name,
+        "displayName": user.display_name,
         "orgId": api.org_id,
         "type": "notSet",
-        "supportedDevices": supported_devices,
+        "supportedDevices": supported_devices_for_user(user),
         "locationId": location_data['id'],
         "calling": {
             "type": "webexCalling",
             "webexCalling": {
-                "extension": extension,
+                "extension": user.extension,
                 "locationId": location_data['id']
             }
         }
     }
     
-    if phone_number and phone_number.isdigit() and len(phone_number) == 10:
-        data["calling"]["webexCalling"]["phoneNumber"] = f"+1{phone_number}"
+    if user.phone_number.isdigit() and len(user.phone_number) == 10:
+        data["calling"]["webexCalling"]["phoneNumber"] = f"+1{user.phone_number}"
     
     result = api.call("POST", "workspaces", data=data)
     
@@ -44,28 +36,52 @@ def create_workspace_from_row(api, location_data, row, headers):
     
     workspace_id = result.get("id")
     
-    if workspace_id and mac_address and device_model:
-        mac_clean = re.sub(r'[-:\s]', '', mac_address).upper()
-        mac_formatted = ':'.join(mac_clean[i:i+2] for i in range(0, 12, 2))
-        
-        device_data = {
-            "mac": mac_formatted,
-            "model": device_model,
-            "workspaceId": workspace_id
-        }
-        
-        device_result = api.call("POST", "devices", data=device_data, params={"orgId": api.org_id})
-        
-        if "error" in device_result:
-            return workspace_id, f"Workspace created but device failed: {device_result['error']}"
+    if workspace_id and user.needs_device:
+        device_id, error = create_device_from_row(api, workspace_id, user)
+        if error:
+            return workspace_id, f"Workspace created but device failed: {error}"
     
     return workspace_id, None
 
-def configure_call_forwarding(api, workspace_id, row):
-    """Configure call forwarding and business continuity for workspace"""
-    forward_no_answer = str(row[13]).strip() if len(row) > 13 and row[13] else None
-    num_rings = str(row[14]).strip() if len(row) > 14 and row[14] else "3"
-    forward_disconnect = str(row[16]).strip() if len(row) > 16 and row[16] else None
+def create_device_from_row(api, workspace_id, user):
+    """Provision the row's device by MAC address, returning (device_id, error)"""
+    mac_formatted = ':'.join(user.mac[i:i+2] for i in range(0, 12, 2))
+    
+    device_data = {
+        "mac": mac_formatted,
+        "model": user.device_model,
+        "workspaceId": workspace_id
+    }
+    
+    device_result = api.call("POST", "devices", data=device_data, params={"orgId": api.org_id})
+    
+    if "error" in device_result:
+        return None, device_result['error']
+    
+    return device_result.get("id"), None
+
+CUSTOM_OUTGOING_PERMISSIONS = {
+    "useCustomEnabled": True,
+    "useCustomPermissions": True,
+    "callingPermissions": [
+        {"callType": "INTERNAL_CALL", "action": "ALLOW", "transferEnabled": True},
+        {"callType": "TOLL_FREE", "action": "ALLOW", "transferEnabled": True},
+        {"callType": "NATIONAL", "action": "ALLOW", "transferEnabled": True},
+        {"callType": "INTERNATIONAL", "action": "BLOCK", "transferEnabled": False},
+        {"callType": "OPERATOR_ASSISTED", "action": "BLOCK", "transferEnabled": False},
+        {"callType": "CHARGEABLE_DIRECTORY_ASSISTED", "action": "BLOCK", "transferEnabled": False},
+        {"callType": "SPECIAL_SERVICES_I", "action": "BLOCK", "transferEnabled": False},
+        {"callType": "SPECIAL_SERVICES_II", "action": "BLOCK", "transferEnabled": False},
+        {"callType": "PREMIUM_SERVICES_I", "action": "BLOCK", "transferEnabled": False},
+        {"callType": "PREMIUM_SERVICES_II", "action": "BLOCK", "transferEnabled": False}
+    ]
+}
+
+def build_call_forwarding_payload(user):
+    """Desired call forwarding settings for a row, or None if the row configures none"""
+    forward_no_answer = user.forward_no_answer
+    num_rings = user.rings or "3"
+    forward_disconnect = user.forward_disconnect
     
     if not forward_no_answer and not forward_disconnect:
         return None
@@ -88,6 +104,58 @@ def configure_call_forwarding(api, workspace_id, row):
             "destination": forward_disconnect
         }
     
+    return data
+
+def build_outgoing_permission_payload(user):
+    """Desired outgoing permissions for a row, or None unless column S is 'custom'"""
+    if user.calling_permission != 'custom':
+        return None
+    
+    return CUSTOM_OUTGOING_PERMISSIONS
+
+def settings_match(current, desired):
+    """True when every value in desired is already present in current
+
+    Lists of permission entries are matched by callType, and an empty
+    desired string matches a missing current value.
+    """
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        return all(settings_match(current.get(key), value) for key, value in desired.items())
+    
+    if isinstance(desired, list):
+        if not isinstance(current, list):
+            return False
+        if all(isinstance(item, dict) and 'callType' in item for item in desired):
+            current_by_type = {item.get('callType'): item for item in current if isinstance(item, dict)}
+            return all(settings_match(current_by_type.get(item['callType']), item) for item in desired)
+        return len(current) == len(desired) and all(settings_match(c, d) for c, d in zip(current, desired))
+    
+    if desired == "" and current is None:
+        return True
+    return current == desired
+
+def fetch_feature_settings(api, workspace_ids, feature, workers=ADAPTIVE_WORKERS):
+    """GET a feature's current settings for many workspaces concurrently, returning {workspace_id: settings}
+
+    Workspaces whose settings could not be fetched are left out, so they are always written.
+    """
+    settings = {}
+    fetch = lambda workspace_id: api.call("GET", f"workspaces/{workspace_id}/features/{feature}",
+                                          params={"orgId": api.org_id})
+    for workspace_id, result in run_concurrently(fetch, workspace_ids, workers):
+        if "error" not in result:
+            settings[workspace_id] = result
+    return settings
+
+def configure_call_forwarding(api, workspace_id, user):
+    """Configure call forwarding and business continuity for workspace"""
+    data = build_call_forwarding_payload(user)
+    
+    if not data:
+        return None
+    
     result = api.call("PUT", f"workspaces/{workspace_id}/features/callForwarding", 
                      data=data, params={"orgId": api.org_id})
     
@@ -96,30 +164,13 @@ def configure_call_forwarding(api, workspace_id, row):
     
     return None
 
-def configure_outgoing_permission(api, workspace_id, row):
+def configure_outgoing_permission(api, workspace_id, user):
     """Configure outgoing calling permissions for workspace"""
-    calling_permission = str(row[18]).strip().lower() if len(row) > 18 and row[18] else None
+    data = build_outgoing_permission_payload(user)
     
-    if calling_permission != 'custom':
+    if not data:
         return None, False
     
-    data = {
-        "useCustomEnabled": True,
-        "useCustomPermissions": True,
-        "callingPermissions": [
-            {"callType": "INTERNAL_CALL", "action": "ALLOW", "transferEnabled": True},
-            {"callType": "TOLL_FREE", "action": "ALLOW", "transferEnabled": True},
-            {"callType": "NATIONAL", "action": "ALLOW", "transferEnabled": True},
-            {"callType": "INTERNATIONAL", "action": "BLOCK", "transferEnabled": False},
-            {"callType": "OPERATOR_ASSISTED", "action": "BLOCK", "transferEnabled": False},
-            {"callType": "CHARGEABLE_DIRECTORY_ASSISTED", "action": "BLOCK", "transferEnabled": False},
-            {"callType": "SPECIAL_SERVICES_I", "action": "BLOCK", "transferEnabled": False},
-            {"callType": "SPECIAL_SERVICES_II", "action": "BLOCK", "transferEnabled": False},
-            {"callType": "PREMIUM_SERVICES_I", "action": "BLOCK", "transferEnabled": False},
-            {"callType": "PREMIUM_SERVICES_II", "action": "BLOCK", "transferEnabled": False}
-        ]
-    }
-    
     result = api.call("PUT", f"workspaces/{workspace_id}/features/outgoingPermission", 
                      data=data, params={"orgId": api.org_id})
     
@@ -128,8 +179,76 @@ def configure_outgoing_permission(api, workspace_id, row):
     
     return None, True
 
-def configure_side_car_speed_dials(api, workspace_map, data_rows, filepath, read_excel_sheet):
-    """Configure side car speed dials for devices"""
+SIDE_CAR_LINE_KEYS = [
+    {"lineKeyIndex": 1, "lineKeyType": "PRIMARY_LINE"},
+    {"lineKeyIndex": 2, "lineKeyType": "OPEN"},
+    {"lineKeyIndex": 3, "lineKeyType": "OPEN"},
+    {"lineKeyIndex": 4, "lineKeyType": "OPEN"},
+    {"lineKeyIndex": 5, "lineKeyType": "OPEN"},
+    {"lineKeyIndex": 6, "lineKeyType": "OPEN"}
+]
+
+def side_car_targets(sidecar_data):
+    """(target extensions, ignored values) from rows 4-5, column D up to the first empty cell
+
+    A cell may list several extensions separated by commas; values that are
+    not all digits (notes, formula results) are ignored rather than targeted.
+    """
+    targets = []
+    ignored = []
+    for row in sidecar_data[3:5]:
+        for cell in row[3:]:
+            if cell is None or not str(cell).strip():
+                break
+            for extension in str(cell).split(','):
+                extension = extension.strip()
+                if extension.endswith('.0'):
+                    # Numeric cells read as floats
+                    extension = extension[:-2]
+                if not extension.isdigit():
+                    if extension:
+                        ignored.append(extension)
+                elif extension not in targets:
+                    targets.append(extension)
+    return targets, ignored
+
+def build_side_car_layout(sidecar_data):
+    """Device layout with the speed dials in rows 7-34, or None if there are none"""
+    kem_keys = []
+    for row in sidecar_data[6:34]:
+        label = str(row[2]).strip() if len(row) > 2 and row[2] else None
+        value = str(row[3]).strip() if len(row) > 3 and row[3] else None
+        
+        if label and value:
+            kem_keys.append({
+                "kemModuleIndex": 1,
+                "kemKeyIndex": len(kem_keys) + 1,
+                "kemKeyType": "SPEED_DIAL",
+                "kemKeyLabel": label,
+                "kemKeyValue": value
+            })
+    
+    if not kem_keys:
+        return None
+    
+    return {
+        "layoutMode": "CUSTOM",
+        "userReorderEnabled": False,
+        "lineKeys": SIDE_CAR_LINE_KEYS,
+        "kemModuleType": "KEM_20_KEYS",
+        "kemKeys": kem_keys
+    }
+
+def configure_side_car_speed_dials(api, workspace_by_extension, filepath, read_excel_sheet, journal=None,
+                                   workers=ADAPTIVE_WORKERS):
+    """Configure side car speed dials for devices
+    
+    workspace_by_extension maps each imported workspace's extension to its
+    ID. Any number of target extensions may be listed. Their devices are looked
+    up concurrently, then the one layout is pushed to all of them
+    concurrently; returns {extension: (status, detail)} with status
+    'configured', 'skipped' or 'failed'.
+    """
     print(f"\n{'='*60}")
     print("Configuring Side Car Speed Dials")
     print(f"{'='*60}")
@@ -137,94 +256,68 @@ def configure_side_car_speed_dials(api, workspace_map, data_rows, filepath, read
     sidecar_data = read_excel_sheet(filepath, 'Webex Side Cars')
     if not sidecar_data or len(sidecar_data) < 7:
         print("  Skipped: No side car data found")
-        return
-    
-    target_extensions = []
-    for row_idx in [3, 4]:
-        if len(sidecar_data) > row_idx and len(sidecar_data[row_idx]) > 3:
-            ext = str(sidecar_data[row_idx][3]).strip() if sidecar_data[row_idx][3] else None
-            if ext:
-                target_extensions.append(ext)
+        return {}
     
+    target_extensions, ignored = side_car_targets(sidecar_data)
+    for value in ignored:
+        print(f"  Ignored: '{value}' in rows 4-5 is not an extension")
     if not target_extensions:
         print("  Skipped: No target extensions found in rows 4-5")
-        return
+        return {}
+    
+    layout_data = build_side_car_layout(sidecar_data)
+    if not layout_data:
+        print("\n  Skipped: No speed dials found in rows 7-34")
+        return {}
     
-    ext_to_workspace = {}
-    for row_idx, workspace_id in workspace_map.items():
-        row = data_rows[row_idx - 2]
-        extension = str(row[4]).strip() if len(row) > 4 else ""
-        if extension in target_extensions:
-            ext_to_workspace[extension] = workspace_id
+    print(f"\n  Found {len(layout_data['kemKeys'])} speed dial entries for {len(target_extensions)} target extension(s)")
+    
+    outcomes = {}
+    lookups = []
+    for extension in target_extensions:
+        if journal and journal.is_done(RUN_KEY, f"sidecar:{extension}"):
+            outcomes[extension] = ('skipped', "already configured in journal")
+        elif extension not in workspace_by_extension:
+            outcomes[extension] = ('skipped', "no workspace with this extension in the import")
+        else:
+            lookups.append(extension)
     
+    if lookups:
+        print(f"\n  Fetching devices for {len(lookups)} extension(s)...")
+    fetch_devices = lambda extension: api.call("GET", f"telephony/config/workspaces/{workspace_by_extension[extension]}/devices",
+                                               params={"orgId": api.org_id})
     device_map = {}
-    for extension, workspace_id in ext_to_workspace.items():
-        print(f"\n  Fetching device for extension {extension}...")
-        devices_result = api.call("GET", f"telephony/config/workspaces/{workspace_id}/devices",
-                                 params={"orgId": api.org_id})
-        
+    for extension, devices_result in run_concurrently(fetch_devices, lookups, workers):
         if "error" in devices_result:
-            print(f"    Warning: Failed to fetch devices - {devices_result['error']}")
+            outcomes[extension] = ('failed', f"could not fetch devices - {devices_result['error']}")
             continue
         
         devices = devices_result.get('devices', [])
         if devices:
-            device_id = devices[0].get('id')
-            device_map[extension] = device_id
-            print(f"    Found device ID: {device_id}")
+            device_map[extension] = devices[0].get('id')
         else:
-            print(f"    Warning: No devices found")
-    
-    if not device_map:
-        print("\n  Skipped: No devices found for configuration")
-        return
-    
-    kem_keys = []
-    for row_idx in range(6, 34):
-        if len(sidecar_data) <= row_idx:
-            break
-        
-        row = sidecar_data[row_idx]
-        label = str(row[2]).strip() if len(row) > 2 and row[2] else None
-        value = str(row[3]).strip() if len(row) > 3 and row[3] else None
-        
-        if label and value:
-            kem_keys.append({
-                "kemModuleIndex": 1,
-                "kemKeyIndex": len(kem_keys) + 1,
-                "kemKeyType": "SPEED_DIAL",
-                "kemKeyLabel": label,
-                "kemKeyValue": value
-            })
+            outcomes[extension] = ('failed', "no devices found")
     
-    if not kem_keys:
-        print("\n  Skipped: No speed dials found in rows 7-34")
-        return
-    
-    print(f"\n  Found {len(kem_keys)} speed dial entries")
-    
-    for extension, device_id in device_map.items():
-        print(f"\n  Configuring device for extension {extension}...")
-        
-        layout_data = {
-            "layoutMode": "CUSTOM",
-            "userReorderEnabled": False,
-            "lineKeys": [
-                {"lineKeyIndex": 1, "lineKeyType": "PRIMARY_LINE"},
-                {"lineKeyIndex": 2, "lineKeyType": "OPEN"},
-                {"lineKeyIndex": 3, "lineKeyType": "OPEN"},
-                {"lineKeyIndex": 4, "lineKeyType": "OPEN"},
-                {"lineKeyIndex": 5, "lineKeyType": "OPEN"},
-                {"lineKeyIndex": 6, "lineKeyType": "OPEN"}
-            ],
-            "kemModuleType": "KEM_20_KEYS",
-            "kemKeys": kem_keys
-        }
-        
-        result = api.call("PUT", f"telephony/config/devices/{device_id}/layout",
-                         data=layout_data, params={"orgId": api.org_id})
-        
+    push_layout = lambda extension: api.call("PUT", f"telephony/config/devices/{device_map[extension]}/layout",
+                                             data=layout_data, params={"orgId": api.org_id})
+    if device_map:
+        print(f"  Pushing layout to {len(device_map)} device(s)...")
+    for extension, result in run_concurrently(push_layout, list(device_map), workers):
         if "error" in result:
-            print(f"    Warning: Failed to configure - {result['error']}")
+            outcomes[extension] = ('failed', f"could not push layout - {result['error']}")
         else:
-            print(f"    Success: Side car speed dials configured")
+            outcomes[extension] = ('configured', device_map[extension])
+            if journal:
+                journal.record(RUN_KEY, f"sidecar:{extension}", device_id=device_map[extension])
+    
+    labels = {'configured': "Success: Side car speed dials configured on device", 'skipped': "Skipped:",
+              'failed': "Warning:"}
+    print()
+    for extension in target_extensions:
+        status, detail = outcomes[extension]
+        print(f"  Extension {extension}: {labels[status]} {detail}")
+    
+    statuses = [status for status, _ in outcomes.values()]
+    print(f"\n  Side cars: {statuses.count('configured')} configured, {statuses.count('skipped')} skipped, "
+          f"{statuses.count('failed')} failed")
+    return outcomes
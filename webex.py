@@ -4,18 +4,24 @@
 
 import os
 import sys
+import argparse
 import logging
 from datetime import datetime
 from typing import List
 
-from libraries.api_client import WebexAPI
-from libraries.list_workspaces import list_workspaces
-from libraries.view_workspace import view_workspace_details
-from libraries.create_workspace import create_workspace
-from libraries.update_workspace import update_workspace
-from libraries.delete_workspace import delete_workspace
-from libraries.bulk_create_workspaces import bulk_create_workspaces
-from libraries.aso_bulk_import import aso_bulk_import_tool
+from libraries import prompts
+from libraries.api_client import WebexAPI, DEFAULT_TIMEOUTS
+
+# Exit codes for headless commands
+EXIT_OK = 0
+EXIT_FAILURES = 1           # Run completed but some rows failed
+EXIT_USAGE = 2              # Invalid command line (argparse)
+EXIT_VALIDATION = 3         # Input failed validation, nothing was executed
+EXIT_PROMPT_REQUIRED = 4    # A prompt had no answer in flags or the policy file
+EXIT_CREDENTIALS = 5        # Token or organization could not be determined
+EXIT_CANCELLED = 6          # Cancelled by an answer in the policy file
+EXIT_PARKED = 7             # Steps parked by an open circuit; re-run later to resume them
+EXIT_INTERRUPTED = 130
 
 class TeeOutput:
     def __init__(self, *files):
@@ -31,12 +37,12 @@ class TeeOutput:
             f.flush()
 
 class WebexCLI:
-    def __init__(self):
+    def __init__(self, credentials_file="credentials.priv"):
         self.token = None
         self.org_id = None
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.setup_logging()
-        self.load_credentials()
+        self.load_credentials(credentials_file)
         self.api = WebexAPI(self.token, self.org_id, self.api_logger)
         
     def setup_logging(self):
@@ -52,27 +58,35 @@ class WebexCLI:
         api_log = f"logs/api_calls_{self.session_id}.log"
         self.api_logger = logging.getLogger("webex_api")
         self.api_logger.setLevel(logging.INFO)
-        api_handler = logging.FileHandler(api_log)
+        # delay=True defers opening the file until the first API call is logged
+        api_handler = logging.FileHandler(api_log, delay=True)
         api_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
         self.api_logger.addHandler(api_handler)
         self.api_logger.propagate = False
         
         print(f"Session started: {self.session_id}")
         
-    def load_credentials(self):
-        if os.path.exists("credentials.priv"):
+    def load_credentials(self, credentials_file="credentials.priv"):
+        if os.path.exists(credentials_file):
             try:
-                with open("credentials.priv", "r") as f:
+                with open(credentials_file, "r") as f:
                     for line in f:
                         line = line.strip()
                         if line.startswith("token="):
                             self.token = line.split("=", 1)[1]
                         elif line.startswith("orgid="):
                             self.org_id = line.split("=", 1)[1]
-                print("Credentials loaded from credentials.priv")
+                print(f"Credentials loaded from {credentials_file}")
             except Exception as e:
                 print(f"Error loading credentials: {e}")
         
+        self.token = self.token or os.environ.get("WEBEX_TOKEN")
+        self.org_id = self.org_id or os.environ.get("WEBEX_ORG_ID")
+        
+        if prompts.is_headless():
+            self.resolve_credentials_headless()
+            return
+        
         if not self.token:
             self.token = input("Enter Webex API Token: ").strip()
         
@@ -102,9 +116,25 @@ class WebexCLI:
                         print("Invalid selection.")
                         self.org_id = input("Enter Organization ID: ").strip()
     
+    def resolve_credentials_headless(self):
+        """Resolve token and organization without prompting"""
+        if not self.token:
+            raise prompts.PromptRequired("token", "Provide a token in the credentials file or WEBEX_TOKEN")
+        
+        if not self.org_id:
+            temp_api = WebexAPI(self.token, None, self.api_logger)
+            orgs_result = temp_api.call("GET", "organizations")
+            orgs = orgs_result.get("items", []) if "error" not in orgs_result else []
+            if len(orgs) != 1:
+                raise prompts.PromptRequired("orgid", "Provide orgid in the credentials file or WEBEX_ORG_ID")
+            self.org_id = orgs[0]["id"]
+            print(f"Using organization: {orgs[0].get('displayName', 'N/A')}")
+    
     def display_menu(self, title: str, options: List[str], show_back: bool = True) -> str:
         print(f"\n{'='*60}")
         print(f"{title}")
+        if self.api.reference_cache:
+            print(self.api.reference_cache.status_line())
         print(f"{'='*60}")
         for i, option in enumerate(options, 1):
             print(f"{i}. {option}")
@@ -129,34 +159,50 @@ class WebexCLI:
                 ]
             )
             
+            # Feature modules are imported on first use to keep startup fast
             if choice == "/b":
                 break
             elif choice == "1":
+                from libraries.list_workspaces import list_workspaces
                 list_workspaces(self.api)
                 input("\nPress Enter to continue...")
             elif choice == "2":
+                from libraries.view_workspace import view_workspace_details
                 view_workspace_details(self.api)
                 input("\nPress Enter to continue...")
             elif choice == "3":
+                from libraries.create_workspace import create_workspace
                 create_workspace(self.api)
                 input("\nPress Enter to continue...")
             elif choice == "4":
+                from libraries.update_workspace import update_workspace
                 update_workspace(self.api)
                 input("\nPress Enter to continue...")
             elif choice == "5":
+                from libraries.delete_workspace import delete_workspace
                 delete_workspace(self.api)
                 input("\nPress Enter to continue...")
             elif choice == "6":
+                from libraries.bulk_create_workspaces import bulk_create_workspaces
                 bulk_create_workspaces(self.api)
                 input("\nPress Enter to continue...")
             else:
                 print("Invalid choice. Please try again.")
     
-    def main_menu(self):
+    def start_reference_cache(self):
+        """Warm workspace and location lists in the background while the menus are read"""
+        from libraries.reference_cache import ReferenceCache
+        self.api.reference_cache = ReferenceCache(self.api)
+        self.api.reference_cache.start()
+    
+    def main_menu(self, prefetch=True):
         print(f"\nWelcome to Webex Control Hub CLI")
         print(f"Organization ID: {self.org_id}")
         print(f"Session ID: {self.session_id}")
         
+        if prefetch:
+            self.start_reference_cache()
+        
         while True:
             choice = self.display_menu(
                 "Main Menu",
@@ -176,12 +222,15 @@ class WebexCLI:
             elif choice == "1":
                 self.workspace_menu()
             elif choice == "2":
+                from libraries.aso_bulk_import import aso_bulk_import_tool
                 aso_bulk_import_tool(self.api)
                 input("\nPress Enter to continue...")
             else:
                 print("Invalid choice. Please try again.")
     
     def cleanup(self):
+        if self.api.reference_cache:
+            self.api.reference_cache.stop()
         try:
             self.cli_log_file.close()
             sys.stdout = sys.__stdout__
@@ -189,11 +238,211 @@ class WebexCLI:
         except:
             pass
 
+def parse_timeout(value):
+    """Parse FAMILY=CONNECT,READ into (family, connect, read)"""
+    try:
+        family, seconds = value.split("=", 1)
+        connect, read = (float(part) for part in seconds.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FAMILY=CONNECT,READ, got '{value}'")
+    if family not in DEFAULT_TIMEOUTS:
+        raise argparse.ArgumentTypeError(f"unknown endpoint family '{family}' "
+                                         f"(expected one of: {', '.join(DEFAULT_TIMEOUTS)})")
+    return family, connect, read
+
+def configure_api(api, args):
+    """Apply request options from the command line to the API client"""
+    for family, connect, read in args.timeout:
+        api.set_timeout(family, connect, read)
+    if args.hedge:
+        api.enable_hedging()
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Webex Control Hub CLI. Run without a command for the interactive menu."
+    )
+    parser.add_argument("--credentials", default="credentials.priv",
+                        help="Credentials file (default: credentials.priv)")
+    parser.add_argument("--no-prefetch", dest="prefetch", action="store_false",
+                        help="Do not load workspace and location lists in the background in the menu")
+    parser.add_argument("--timeout", type=parse_timeout, action="append", default=[], metavar="FAMILY=CONNECT,READ",
+                        help="Connect and read timeouts in seconds for an endpoint family "
+                             "(workspaces, devices, telephony/config, other); may be repeated")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Send a second copy of GETs that run longer than their family's p95 latency")
+    
+    subparsers = parser.add_subparsers(dest="command")
+    
+    def add_headless_options(subparser):
+        subparser.add_argument("--yes", action="store_true",
+                               help="Answer yes to every confirmation without an answer in the policy file")
+        subparser.add_argument("--policy", help="JSON file with answers to prompts, keyed by prompt name")
+        resume = subparser.add_mutually_exclusive_group()
+        resume.add_argument("--resume", nargs="?", const=True, default=None, metavar="JOURNAL",
+                            help="Resume the latest unfinished run for this input, or the given journal")
+        resume.add_argument("--no-resume", dest="resume", action="store_false",
+                            help="Start a fresh run even if an unfinished journal exists")
+    
+    def add_planning_options(subparser):
+        planning = subparser.add_mutually_exclusive_group()
+        planning.add_argument("--dry-run", action="store_true",
+                              help="Validate and plan without sending writes; saves the plan and a duration estimate")
+        planning.add_argument("--save-plan", nargs="?", const=True, default=None, metavar="PLAN",
+                              help="Validate now and save an execution plan (default: plans/<kind>_<timestamp>.plan.json) "
+                                   "to run later with execute-plan")
+    
+    bulk = subparsers.add_parser("bulk-create", help="Bulk create workspaces from a CSV file")
+    bulk.add_argument("--csv", default="bulk/workspaces.csv", help="CSV file (default: bulk/workspaces.csv)")
+    bulk.add_argument("--workers", type=int, default=16,
+                      help="Maximum concurrent workspace creations; the adaptive limiter picks the actual "
+                           "concurrency (default: 16, use 1 for sequential)")
+    bulk.add_argument("--location", help="Location name for rows without one")
+    bulk.add_argument("--report", metavar="PATH",
+                      help="Per-row results file, CSV or .jsonl (default: reports/bulk_create_<timestamp>.csv)")
+    add_headless_options(bulk)
+    add_planning_options(bulk)
+    
+    aso = subparsers.add_parser("aso-import", help="Run the ASO Bulk Import Tool on an Excel workbook")
+    aso.add_argument("--file", help="Workbook to import (default: every bulk/aso_import* file, one site each)")
+    aso.add_argument("--no-diff-writes", dest="diff_writes", action="store_false",
+                     help="Always PUT feature settings instead of comparing with current settings first")
+    aso.add_argument("--parallel-parse", action="store_true",
+                     help="Parse all workbook tabs up front in a process pool (helps with large .xlsx files)")
+    aso.add_argument("--site-workers", type=int, default=16,
+                     help="Maximum sites imported at once when several workbooks are found; the adaptive limiter "
+                          "bounds the requests they send together (default: 16)")
+    add_headless_options(aso)
+    add_planning_options(aso)
+    
+    execute = subparsers.add_parser("execute-plan", help="Run a plan saved with --save-plan")
+    execute.add_argument("plan", help="Plan file")
+    execute.add_argument("--workers", type=int, default=16,
+                         help="Maximum concurrent workspace creations for bulk-create plans (default: 16)")
+    execute.add_argument("--location", help="Location name for bulk-create rows without one")
+    execute.add_argument("--report", metavar="PATH",
+                         help="Per-row results file for bulk-create plans, CSV or .jsonl")
+    execute.add_argument("--no-diff-writes", dest="diff_writes", action="store_false",
+                         help="Always PUT feature settings for aso-import plans")
+    add_headless_options(execute)
+    
+    watch = subparsers.add_parser("watch", help="Re-validate bulk input files each time one is saved")
+    watch.add_argument("--dir", default="bulk", help="Folder to watch (default: bulk)")
+    watch.add_argument("--debounce", type=float, default=0.5,
+                       help="Seconds a file must stay unchanged before it is validated (default: 0.5)")
+    watch.add_argument("--poll", action="store_true",
+                       help="Detect changes by polling instead of inotify")
+    watch.set_defaults(yes=False, policy=None)
+    
+    return parser
+
+def bulk_create_exit_code(results):
+    from libraries.bulk_create_workspaces import VALIDATION_FAILED, NO_VALID_ROWS
+    if results is None:
+        return EXIT_CANCELLED
+    if results in (VALIDATION_FAILED, NO_VALID_ROWS):
+        return EXIT_VALIDATION
+    if set(results) - {'success', 'skipped', 'parked'}:
+        return EXIT_FAILURES
+    if 'parked' in results:
+        return EXIT_PARKED
+    return EXIT_OK
+
+def aso_import_exit_code(results):
+    from libraries.aso_bulk_import import VALIDATION_FAILED, NO_VALID_ROWS
+    if results is None:
+        return EXIT_CANCELLED
+    if results in (VALIDATION_FAILED, NO_VALID_ROWS):
+        return EXIT_VALIDATION
+    if results['workspaces_failed'] or results['errors']:
+        return EXIT_FAILURES
+    if results['parked']:
+        return EXIT_PARKED
+    return EXIT_OK
+
+def execute_plan(api, args):
+    """Load a saved plan and run it with the engine for its kind"""
+    from libraries.execution_plan import load_plan
+    plan = load_plan(args.plan, api)
+    if plan is None:
+        return EXIT_VALIDATION
+    
+    if plan['kind'] == "bulk_create":
+        from libraries.bulk_create_workspaces import execute_bulk_create_plan
+        return bulk_create_exit_code(execute_bulk_create_plan(api, plan, args.plan, args.workers, args.resume,
+                                                              args.report))
+    
+    from libraries.aso_bulk_import import execute_aso_plan
+    return aso_import_exit_code(execute_aso_plan(api, plan, args.plan, args.resume, args.diff_writes))
+
+def run_command(args):
+    """Run a headless subcommand and return its exit code"""
+    try:
+        answers = prompts.load_policy_file(args.policy) if args.policy else {}
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError is a ValueError
+        print(f"Error: Could not read policy file {args.policy}: {e}")
+        return EXIT_USAGE
+    if getattr(args, "location", None):
+        answers["bulk_create.location"] = args.location
+    prompts.set_headless(answers, assume_yes=args.yes)
+    
+    # Any prompt that slips through gets EOF instead of blocking
+    sys.stdin = open(os.devnull, "r")
+    
+    cli = None
+    try:
+        cli = WebexCLI(args.credentials)
+        configure_api(cli.api, args)
+        if args.command == "bulk-create" and args.save_plan:
+            from libraries.bulk_create_workspaces import save_bulk_create_plan
+            plan_path = None if args.save_plan is True else args.save_plan
+            return EXIT_OK if save_bulk_create_plan(cli.api, args.csv, plan_path) else EXIT_VALIDATION
+        elif args.command == "bulk-create":
+            from libraries.bulk_create_workspaces import bulk_create_workspaces
+            return bulk_create_exit_code(bulk_create_workspaces(cli.api, args.csv, args.workers, args.resume,
+                                                                args.dry_run, args.report))
+        elif args.command == "aso-import" and args.save_plan:
+            from libraries.aso_bulk_import import aso_bulk_import_tool, VALIDATION_FAILED
+            saved = aso_bulk_import_tool(cli.api, args.file, save_plan=args.save_plan,
+                                         parallel_parse=args.parallel_parse)
+            return EXIT_OK if saved and saved != VALIDATION_FAILED else EXIT_VALIDATION
+        elif args.command == "aso-import":
+            from libraries.aso_bulk_import import aso_bulk_import_tool, find_aso_import_files
+            if isinstance(args.resume, str) and not args.file and len(find_aso_import_files()) > 1:
+                # Each workbook has its own journal, so one path cannot resume them all
+                print("\nError: --resume JOURNAL needs --file when several aso_import workbooks are found; "
+                      "use --resume without a path to resume every site")
+                return EXIT_USAGE
+            return aso_import_exit_code(aso_bulk_import_tool(cli.api, args.file, args.resume, args.diff_writes,
+                                                             args.dry_run, parallel_parse=args.parallel_parse,
+                                                             site_workers=args.site_workers))
+        elif args.command == "execute-plan":
+            return execute_plan(cli.api, args)
+        elif args.command == "watch":
+            from libraries.watch_mode import watch_bulk_folder
+            cli.start_reference_cache()
+            return EXIT_OK if watch_bulk_folder(cli.api, args.dir, args.debounce, args.poll) else EXIT_VALIDATION
+    except prompts.PromptRequired as e:
+        print(f"\nError: {e}")
+        return EXIT_CREDENTIALS if e.key in ["token", "orgid"] else EXIT_PROMPT_REQUIRED
+    finally:
+        if cli:
+            cli.cleanup()
+
 def main():
+    args = build_parser().parse_args()
+    if args.command:
+        try:
+            sys.exit(run_command(args))
+        except KeyboardInterrupt:
+            print("\n\nInterrupted by user. Exiting...")
+            sys.exit(EXIT_INTERRUPTED)
+    
     cli = None
     try:
-        cli = WebexCLI()
-        cli.main_menu()
+        cli = WebexCLI(args.credentials)
+        configure_api(cli.api, args)
+        cli.main_menu(args.prefetch)
     except KeyboardInterrupt:
         print("\n\nInterrupted by user. Exiting...")
     except Exception as e: